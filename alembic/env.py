@@ -1,5 +1,6 @@
 # alembic/env.py
 import os
+import re
 import sys
 from logging.config import fileConfig
 
@@ -8,8 +9,14 @@ from sqlalchemy import engine_from_config, pool
 from alembic import context
 
 sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), "..")))
+import app.models.refresh_token_family as _refresh_token_family  # noqa: F401,E402
+import app.models.stats_counter as _stats_counter  # noqa: F401,E402
 import app.models.task as _task  # noqa: F401,E402
+import app.models.task_archive as _task_archive  # noqa: F401,E402
+import app.models.task_counter as _task_counter  # noqa: F401,E402
+import app.models.task_list_version as _task_list_version  # noqa: F401,E402
 import app.models.user as _user  # noqa: F401,E402
+import app.models.user_archive as _user_archive  # noqa: F401,E402
 from app.core.config import settings  # noqa: E402
 from app.db.database import Base  # noqa: E402
 
@@ -22,12 +29,34 @@ config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 
 target_metadata = Base.metadata
 
+# Estruturas criadas por SQL nas migrações, fora do `Base.metadata`; sem
+# isto o autogenerate propõe removê-las:
+# - a9c4e2f7b318: partições `tasks_pNNN` de `tasks` (Postgres);
+# - e5b19c3a7d42: coluna gerada `search_vector` e seu índice GIN
+#   (Postgres), tabela FTS5 `tasks_fts` e suas tabelas-sombra (SQLite).
+TASK_PARTITION = re.compile(r"^tasks_p\d+$")
+SEARCH_TABLE = re.compile(r"^tasks_fts(_\w+)?$")
+SEARCH_INDEXES = frozenset({"ix_tasks_owner_id_search_vector"})
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    if not reflected or compare_to is not None:
+        return True
+    if type_ == "table":
+        return not (TASK_PARTITION.match(name) or SEARCH_TABLE.match(name))
+    if type_ == "column":
+        return not (object.table.name == "tasks" and name == "search_vector")
+    if type_ == "index":
+        return name not in SEARCH_INDEXES
+    return True
+
 
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -42,7 +71,11 @@ def run_migrations_online() -> None:
         poolclass=pool.NullPool,
     )
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
         with context.begin_transaction():
             context.run_migrations()
 
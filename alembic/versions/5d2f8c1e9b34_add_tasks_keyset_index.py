@@ -0,0 +1,47 @@
+"""Add tasks keyset pagination index
+
+Revision ID: 5d2f8c1e9b34
+Revises: a77a48da9b6f
+Create Date: 2026-01-12 10:00:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5d2f8c1e9b34"
+down_revision = "a77a48da9b6f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY não bloqueia escritas em `tasks`, mas não roda em transação
+    with op.get_context().autocommit_block():
+        # Índice composto para ORDER BY created_at DESC, id DESC por dono
+        op.create_index(
+            "ix_tasks_owner_id_created_at_id",
+            "tasks",
+            ["owner_id", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        # O prefixo `owner_id` do índice novo torna este redundante
+        op.drop_index(
+            "ix_tasks_owner_id",
+            table_name="tasks",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_owner_id",
+            "tasks",
+            ["owner_id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_tasks_owner_id_created_at_id",
+            table_name="tasks",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,128 @@
+"""Hash-partition tasks by owner_id (Postgres)
+
+Revision ID: a9c4e2f7b318
+Revises: f3c8a1d6b925
+Create Date: 2026-03-02 10:00:00.000000
+
+Recria `tasks` como tabela particionada por HASH (owner_id). O número de
+partições vem de `-x task_partitions=N` (padrão 16) e só muda com uma nova
+migração de reparticionamento:
+
+    alembic -x task_partitions=32 upgrade head
+
+A PK física passa a ser (id, owner_id), exigência do Postgres para tabelas
+particionadas; o `id` continua vindo da mesma sequence. A cópia roda com
+`tasks` bloqueada para escrita (leituras seguem), então planeje uma janela
+proporcional ao volume: a cópia é um único INSERT ... SELECT. No SQLite
+a migração não faz nada.
+"""
+
+from alembic import context, op
+
+# revision identifiers, used by Alembic.
+revision = "a9c4e2f7b318"
+down_revision = "f3c8a1d6b925"
+branch_labels = None
+depends_on = None
+
+DEFAULT_PARTITIONS = 16
+
+COLUMNS = "id, owner_id, title, description, status, created_at, updated_at, deleted_at"
+
+COLUMN_DEFINITIONS = """
+    id integer NOT NULL DEFAULT nextval('tasks_id_seq'),
+    owner_id integer NOT NULL REFERENCES users (id),
+    title varchar(255) NOT NULL,
+    description text,
+    status varchar(50) NOT NULL,
+    created_at timestamp without time zone NOT NULL DEFAULT now(),
+    updated_at timestamp without time zone NOT NULL DEFAULT now(),
+    deleted_at timestamp without time zone,
+    search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED"""
+
+# Mesmos índices da tabela original; em tabela particionada cada um vira um
+# índice por partição
+INDEXES = [
+    "CREATE INDEX ix_tasks_id ON tasks (id)",
+    "CREATE INDEX ix_tasks_deleted_at ON tasks (deleted_at)",
+    """
+    CREATE INDEX ix_tasks_live_owner_created
+    ON tasks (owner_id, created_at DESC, id DESC) WHERE deleted_at IS NULL
+    """,
+    """
+    CREATE INDEX ix_tasks_live_owner_status_created
+    ON tasks (owner_id, status, created_at DESC, id DESC) WHERE deleted_at IS NULL
+    """,
+    """
+    CREATE INDEX ix_tasks_owner_id_search_vector
+    ON tasks USING gin (owner_id, search_vector) WHERE deleted_at IS NULL
+    """,
+]
+
+
+def _partition_count() -> int:
+    partitions = int(
+        context.get_x_argument(as_dictionary=True).get(
+            "task_partitions", DEFAULT_PARTITIONS
+        )
+    )
+    if partitions < 1:
+        raise ValueError("task_partitions must be at least 1")
+    return partitions
+
+
+def _swap_in(new_table: str) -> None:
+    """Troca `tasks` por `new_table`, preservando a sequence dos ids."""
+    op.execute("ALTER SEQUENCE tasks_id_seq OWNED BY NONE")
+    op.execute("DROP TABLE tasks")
+    op.execute(f"ALTER TABLE {new_table} RENAME TO tasks")
+    op.execute(f"ALTER TABLE tasks RENAME CONSTRAINT {new_table}_pkey TO tasks_pkey")
+    op.execute(
+        f"ALTER TABLE tasks RENAME CONSTRAINT {new_table}_owner_id_fkey "
+        "TO tasks_owner_id_fkey"
+    )
+    op.execute("ALTER SEQUENCE tasks_id_seq OWNED BY tasks.id")
+    for statement in INDEXES:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    partitions = _partition_count()
+    op.execute("LOCK TABLE tasks IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(
+        f"CREATE TABLE tasks_partitioned ({COLUMN_DEFINITIONS},\n"
+        "    PRIMARY KEY (id, owner_id)\n"
+        ") PARTITION BY HASH (owner_id)"
+    )
+    for remainder in range(partitions):
+        op.execute(
+            f"CREATE TABLE tasks_p{remainder:03d} PARTITION OF tasks_partitioned "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+        )
+    op.execute(f"INSERT INTO tasks_partitioned ({COLUMNS}) SELECT {COLUMNS} FROM tasks")
+    _swap_in("tasks_partitioned")
+    op.execute("ANALYZE tasks")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("LOCK TABLE tasks IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(
+        f"CREATE TABLE tasks_unpartitioned ({COLUMN_DEFINITIONS},\n"
+        "    PRIMARY KEY (id)\n"
+        ")"
+    )
+    op.execute(
+        f"INSERT INTO tasks_unpartitioned ({COLUMNS}) SELECT {COLUMNS} FROM tasks"
+    )
+    # DROP TABLE no pai particionado remove as partições junto
+    _swap_in("tasks_unpartitioned")
+    op.execute("ANALYZE tasks")
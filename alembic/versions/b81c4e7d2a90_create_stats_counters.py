@@ -0,0 +1,43 @@
+"""Create stats_counters table
+
+Revision ID: b81c4e7d2a90
+Revises: 5d2f8c1e9b34
+Create Date: 2026-01-20 09:30:00.000000
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b81c4e7d2a90"
+down_revision = "5d2f8c1e9b34"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stats_counters",
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("shard", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("value", sa.BigInteger(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("name", "shard"),
+    )
+
+    # Popula os contadores com o estado atual (shard 0)
+    op.execute(
+        """
+        INSERT INTO stats_counters (name, shard, value)
+        SELECT 'users_active', 0, COUNT(*) FROM users WHERE deleted_at IS NULL
+        UNION ALL
+        SELECT 'tasks_active', 0, COUNT(*) FROM tasks WHERE deleted_at IS NULL
+        UNION ALL
+        SELECT 'tasks_' || status, 0, COUNT(*) FROM tasks
+        WHERE deleted_at IS NULL GROUP BY status
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("stats_counters")
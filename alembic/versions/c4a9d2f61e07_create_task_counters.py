@@ -0,0 +1,41 @@
+"""Create task_counters table
+
+Revision ID: c4a9d2f61e07
+Revises: b81c4e7d2a90
+Create Date: 2026-01-27 14:10:00.000000
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c4a9d2f61e07"
+down_revision = "b81c4e7d2a90"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_counters",
+        sa.Column("owner_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("total", sa.BigInteger(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("owner_id", "status"),
+    )
+
+    # Popula a partir das tarefas ativas existentes
+    op.execute(
+        """
+        INSERT INTO task_counters (owner_id, status, total)
+        SELECT owner_id, status, COUNT(*) FROM tasks
+        WHERE deleted_at IS NULL
+        GROUP BY owner_id, status
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("task_counters")
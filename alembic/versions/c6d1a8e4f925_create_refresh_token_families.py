@@ -0,0 +1,48 @@
+"""Create refresh_token_families table
+
+Revision ID: c6d1a8e4f925
+Revises: b2e6f9c41d83
+Create Date: 2026-03-16 15:00:00.000000
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c6d1a8e4f925"
+down_revision = "b2e6f9c41d83"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "refresh_token_families",
+        sa.Column("id", sa.String(length=32), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("generation", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "rotated_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("revoked_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_refresh_token_families_user_id"),
+        "refresh_token_families",
+        ["user_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_refresh_token_families_user_id"),
+        table_name="refresh_token_families",
+    )
+    op.drop_table("refresh_token_families")
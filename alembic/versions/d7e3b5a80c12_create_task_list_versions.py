@@ -0,0 +1,30 @@
+"""Create task_list_versions table
+
+Revision ID: d7e3b5a80c12
+Revises: c4a9d2f61e07
+Create Date: 2026-02-03 11:20:00.000000
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d7e3b5a80c12"
+down_revision = "c4a9d2f61e07"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_list_versions",
+        sa.Column("owner_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("version", sa.BigInteger(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("owner_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("task_list_versions")
@@ -0,0 +1,36 @@
+"""Add token_version and tokens_revoked_at to users
+
+Revision ID: e1f7b3c95a26
+Revises: c6d1a8e4f925
+Create Date: 2026-03-23 10:40:00.000000
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e1f7b3c95a26"
+down_revision = "c6d1a8e4f925"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("token_version", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "users",
+        sa.Column("tokens_revoked_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        op.f("ix_users_tokens_revoked_at"), "users", ["tokens_revoked_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_users_tokens_revoked_at"), table_name="users")
+    op.drop_column("users", "tokens_revoked_at")
+    op.drop_column("users", "token_version")
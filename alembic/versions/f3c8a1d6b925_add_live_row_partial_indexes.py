@@ -0,0 +1,75 @@
+"""Add partial indexes over live tasks
+
+Revision ID: f3c8a1d6b925
+Revises: e5b19c3a7d42
+Create Date: 2026-02-16 09:30:00.000000
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f3c8a1d6b925"
+down_revision = "e5b19c3a7d42"
+branch_labels = None
+depends_on = None
+
+LIVE = sa.text("deleted_at IS NULL")
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_live_owner_created",
+            "tasks",
+            ["owner_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_where=LIVE,
+            sqlite_where=LIVE,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_live_owner_status_created",
+            "tasks",
+            ["owner_id", "status", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_where=LIVE,
+            sqlite_where=LIVE,
+            postgresql_concurrently=True,
+        )
+        # Substituídos pelos índices parciais acima
+        op.drop_index(
+            "ix_tasks_owner_id_created_at_id",
+            table_name="tasks",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_tasks_status",
+            table_name="tasks",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_status",
+            "tasks",
+            ["status"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_owner_id_created_at_id",
+            "tasks",
+            ["owner_id", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_tasks_live_owner_status_created",
+            table_name="tasks",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_tasks_live_owner_created",
+            table_name="tasks",
+            postgresql_concurrently=True,
+        )
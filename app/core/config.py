@@ -1,7 +1,22 @@
 import os
+from typing import List, Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+ASYNC_DRIVERS = {
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_url(url: str) -> str:
+    """Mesmo banco de `url`, trocando o driver pelo equivalente async."""
+    for sync_driver, async_driver in ASYNC_DRIVERS.items():
+        if url.startswith(sync_driver + ":"):
+            return async_driver + url[len(sync_driver) :]
+    return url
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
@@ -18,6 +33,123 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int
 
+    # Usa AsyncEngine/AsyncSession nas rotas (asyncpg/aiosqlite)
+    DB_ASYNC: bool = False
+
+    # Pool de conexões por worker. DB_NULL_POOL=true abre e fecha uma conexão
+    # por uso, para quando há um pooler externo (PgBouncer) na frente do banco.
+    # DB_POOL_RECYCLE=-1 não recicla conexões por idade.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = -1
+    DB_NULL_POOL: bool = False
+
+    # Teto de conexões somando os workers de `app.server`, por banco (o
+    # primário e cada réplica); reduz pool e overflow de cada worker para
+    # caber. 0 mantém DB_POOL_SIZE + DB_MAX_OVERFLOW por worker
+    DB_MAX_CONNECTIONS: int = 0
+
+    # Teste de conexão no checkout: "always" (SELECT 1 a cada checkout),
+    # "idle" (só se a conexão ficou parada mais que DB_PRE_PING_IDLE_SECONDS)
+    # ou "never"
+    DB_PRE_PING: Literal["always", "idle", "never"] = "idle"
+    DB_PRE_PING_IDLE_SECONDS: float = 30.0
+
+    # Checkouts que esperam mais que isso por uma conexão geram um warning
+    DB_POOL_SLOW_CHECKOUT_SECONDS: float = 0.1
+
+    # Réplicas de leitura (URLs separadas por vírgula) para GET/HEAD. Depois
+    # de uma escrita, o usuário lê do primário por DB_READ_YOUR_WRITES_SECONDS
+    DB_REPLICA_URLS: str = ""
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+    DB_READ_YOUR_WRITES_MAX_USERS: int = 100_000
+
+    # Validação de token sem banco (opt-in): o token de acesso traz e-mail,
+    # role e `ver` (users.token_version), conferida contra um mapa em memória
+    # das revogações recentes, recarregado a cada
+    # TOKEN_VERSION_REFRESH_SECONDS. Troca de senha ou de role e exclusão da
+    # conta derrubam os tokens antigos nesse prazo
+    STATELESS_AUTH: bool = False
+    TOKEN_VERSION_REFRESH_SECONDS: float = 5.0
+
+    # Rate limit de login/registro, antes do banco e do bcrypt: token bucket
+    # por IP e por e-mail, no formato "N/S" (N requisições a cada S
+    # segundos; vazio desliga). Atrás de proxies, RATE_LIMIT_FORWARDED_HOPS
+    # diz quantos são confiáveis para ler o IP do X-Forwarded-For
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_LOGIN_PER_IP: str = "30/60"
+    RATE_LIMIT_LOGIN_PER_EMAIL: str = "10/60"
+    RATE_LIMIT_REGISTER_PER_IP: str = "10/60"
+    RATE_LIMIT_REGISTER_PER_EMAIL: str = "3/60"
+    RATE_LIMIT_FORWARDED_HOPS: int = 0
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+
+    # Servidor de produção (python -m app.server): SERVER_WORKERS processos
+    # criados por fork depois de importar a app. Um worker é reciclado após
+    # SERVER_MAX_REQUESTS requisições (mais até SERVER_MAX_REQUESTS_JITTER)
+    # ou acima de SERVER_MAX_MEMORY_MB de RSS; 0 desliga. No SIGTERM, cada
+    # worker para de aceitar conexões e tem SERVER_GRACEFUL_TIMEOUT_SECONDS
+    # para concluir as requisições em andamento. Padrão de um worker: o
+    # estado em memória (métricas, rate limit, read-your-writes, caches de
+    # usuário) ainda não é compartilhado entre processos
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 1
+    SERVER_MAX_REQUESTS: int = 0
+    SERVER_MAX_REQUESTS_JITTER: int = 0
+    SERVER_MAX_MEMORY_MB: int = 0
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: float = 30.0
+
+    # Cache de usuários autenticados (get_current_user)
+    PRINCIPAL_CACHE_ENABLED: bool = True
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10_000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+
+    # Pool dedicado ao bcrypt; acima de workers + fila responde 503
+    PASSWORD_HASH_WORKERS: int = max(os.cpu_count() or 1, 1)
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+
+    # Shards de cada contador em stats_counters
+    STATS_COUNTER_SHARDS: int = 16
+
+    # Máximo de operações em POST /api/tasks/batch
+    TASK_BATCH_MAX_OPERATIONS: int = 500
+
+    # Cache por worker das páginas de GET /api/tasks/ já serializadas,
+    # invalidado pela versão das tarefas do dono; LRU acima do limite
+    TASK_LIST_CACHE_ENABLED: bool = True
+    TASK_LIST_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+    # Linhas buscadas por vez no cursor do servidor em /api/tasks/export
+    TASK_EXPORT_BATCH_SIZE: int = 1000
+
+    # Importação em POST /api/tasks/import: linhas por INSERT executemany
+    # e máximo de erros por linha devolvidos na resposta. Corpos acima de
+    # TASK_IMPORT_MAX_BYTES levam 413; linhas (ou registros CSV) acima de
+    # TASK_IMPORT_MAX_LINE_LENGTH caracteres viram erro da linha
+    TASK_IMPORT_BATCH_SIZE: int = 1000
+    TASK_IMPORT_MAX_ERRORS: int = 100
+    TASK_IMPORT_MAX_BYTES: int = 256 * 1024 * 1024
+    TASK_IMPORT_MAX_LINE_LENGTH: int = 64 * 1024
+
+    # Job de expurgo (app.jobs.purge_deleted): linhas excluídas há mais de
+    # PURGE_RETENTION_DAYS vão para as tabelas de arquivo, PURGE_CHUNK_SIZE
+    # por transação, com PURGE_PAUSE_SECONDS de pausa entre os lotes
+    PURGE_RETENTION_DAYS: int = 30
+    PURGE_CHUNK_SIZE: int = 500
+    PURGE_PAUSE_SECONDS: float = 0.1
+
+    # Métricas Prometheus em /metrics. O modo de baixo overhead dispensa os
+    # eventos por statement SQL (ficam as métricas por rota e as de scrape)
+    METRICS_ENABLED: bool = True
+    METRICS_LOW_OVERHEAD: bool = False
+
+    # Orçamento de SQL por requisição (`@sql_budget`) e detecção de N+1:
+    # o mesmo formato de statement mais de SQL_BUDGET_MAX_REPEATS vezes
+    SQL_BUDGET_ENABLED: bool = True
+    SQL_BUDGET_MAX_REPEATS: int = 3
+
     @property
     def DATABASE_URL(self) -> str:
         # Em testes, usa o DB de teste (ex: postgresql+psycopg2://.../todo_test)
@@ -29,5 +161,13 @@ class Settings(BaseSettings):
             f"@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
         )
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return async_url(self.DATABASE_URL)
+
+    @property
+    def REPLICA_URLS(self) -> List[str]:
+        return [url.strip() for url in self.DB_REPLICA_URLS.split(",") if url.strip()]
+
 
 settings = Settings()
@@ -0,0 +1,47 @@
+import hashlib
+from typing import Iterable, Optional, Tuple
+
+from app.models.task import Task
+
+
+def _make_etag(*parts: object) -> str:
+    digest = hashlib.blake2b(
+        "|".join(str(part) for part in parts).encode(),
+        digest_size=12,
+    )
+    return f'"{digest.hexdigest()}"'
+
+
+def task_etag(task: Task) -> str:
+    """ETag forte de uma tarefa, derivado de `id` e `updated_at`."""
+    return _make_etag("task", task.id, task.updated_at.isoformat())
+
+
+def task_list_etag(
+    owner_id: int,
+    version: int,
+    query_params: Iterable[Tuple[str, str]],
+) -> str:
+    """ETag de uma página: versão do dono + parâmetros da consulta."""
+    return _make_etag("tasks", owner_id, version, sorted(query_params))
+
+
+def etag_matches(header: Optional[str], etag: str, weak: bool = False) -> bool:
+    """
+    Verifica `If-None-Match` (comparação fraca, `weak=True`) ou `If-Match`
+    (comparação forte) contra o ETag atual. `*` casa com qualquer recurso.
+    """
+    if not header:
+        return False
+
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 
 from app.db.database import SessionLocal
 from app.models.user import User
+from app.repositories.stats_repository import USERS_ACTIVE, StatsRepository
 from app.security.auth import hash_password
 
 logger = logging.getLogger(__name__)
@@ -35,6 +36,8 @@ def create_default_admin() -> None:
 
         db.add(admin_user)
         try:
+            db.flush()
+            StatsRepository(db).increment({USERS_ACTIVE: 1}, shard_key=admin_user.id)
             db.commit()
             logger.info("Default admin created: %s", ADMIN_EMAIL)
         except IntegrityError:
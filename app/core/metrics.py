@@ -0,0 +1,324 @@
+"""
+Métricas Prometheus da API, expostas em `/metrics`.
+
+- HTTP: latência e contagem de respostas por rota (template, não o path
+  concreto, para não explodir a cardinalidade) e status.
+- Banco: statements e tempo por engine e por requisição (eventos de cursor),
+  conexões em uso/overflow do pool e espera por checkout.
+- bcrypt: duração de hash/verify e profundidade da fila do pool de hashing.
+- Threadpool do Starlette: threads ocupadas e tarefas aguardando.
+- Cache da listagem de tarefas: consultas (hit/miss), taxa de acerto e
+  bytes ocupados.
+
+Com `METRICS_LOW_OVERHEAD=true` os eventos por statement não são
+registrados; ficam só as métricas por requisição e as lidas no scrape.
+"""
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Tuple
+
+import anyio.to_thread
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+registry = CollectorRegistry()
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Latência das requisições HTTP por rota.",
+    ["method", "route"],
+    registry=registry,
+)
+HTTP_REQUESTS = Counter(
+    "http_requests",
+    "Requisições HTTP por rota e status.",
+    ["method", "route", "status"],
+    registry=registry,
+)
+HTTP_REQUEST_DB_STATEMENTS = Histogram(
+    "http_request_db_statements",
+    "Statements SQL executados por requisição.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 4, 5, 8, 13, 21, 34, 55, 100),
+    registry=registry,
+)
+HTTP_REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Tempo gasto em statements SQL por requisição.",
+    ["route"],
+    registry=registry,
+)
+DB_STATEMENTS = Counter(
+    "db_statements",
+    "Statements SQL executados.",
+    ["engine"],
+    registry=registry,
+)
+DB_STATEMENT_SECONDS = Histogram(
+    "db_statement_duration_seconds",
+    "Duração dos statements SQL.",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+    registry=registry,
+)
+DB_POOL_WAITING = Gauge(
+    "db_pool_waiting",
+    "Threads/tarefas aguardando uma conexão do pool.",
+    ["pool"],
+    registry=registry,
+)
+DB_POOL_CHECKOUT_WAIT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Tempo de espera para obter uma conexão do pool.",
+    ["pool"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+    registry=registry,
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_duration_seconds",
+    "Duração do bcrypt (hash/verify), sem contar a fila.",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 2, 5),
+    registry=registry,
+)
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth",
+    "Hashes em execução ou aguardando no pool de hashing.",
+    registry=registry,
+)
+RATE_LIMITED_REQUESTS = Counter(
+    "rate_limited_requests_total",
+    "Requisições rejeitadas com 429 pelo rate limiter.",
+    ["route", "key"],
+    registry=registry,
+)
+TASK_LIST_CACHE_LOOKUPS = Counter(
+    "task_list_cache_lookups_total",
+    "Consultas ao cache de páginas de GET /api/tasks/, por resultado.",
+    ["result"],
+    registry=registry,
+)
+TASK_LIST_CACHE_HIT_RATIO = Gauge(
+    "task_list_cache_hit_ratio",
+    "Fração das consultas ao cache de listagem que foram hits.",
+    registry=registry,
+)
+TASK_LIST_CACHE_BYTES = Gauge(
+    "task_list_cache_bytes",
+    "Bytes das respostas guardadas no cache de listagem.",
+    registry=registry,
+)
+THREADPOOL_BUSY = Gauge(
+    "threadpool_busy_threads",
+    "Threads do threadpool do Starlette em uso.",
+    registry=registry,
+)
+THREADPOOL_WAITING = Gauge(
+    "threadpool_waiting_tasks",
+    "Tarefas aguardando uma thread do threadpool do Starlette.",
+    registry=registry,
+)
+THREADPOOL_LIMIT = Gauge(
+    "threadpool_limit_threads",
+    "Limite de threads do threadpool do Starlette.",
+    registry=registry,
+)
+
+
+@dataclass
+class RequestDbStats:
+    statements: int = 0
+    seconds: float = 0.0
+
+
+# Estatísticas de banco da requisição corrente. O objeto é mutável, então as
+# cópias de contexto feitas pelo threadpool e pelo greenlet enxergam o mesmo.
+_request_db_stats: ContextVar[Optional[RequestDbStats]] = ContextVar(
+    "request_db_stats",
+    default=None,
+)
+
+_engines: Dict[str, Engine] = {}
+_listeners: Dict[Engine, Tuple] = {}
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """
+    Registra o engine para as métricas de pool e, fora do modo de baixo
+    overhead, conta e cronometra cada statement.
+    """
+    _engines[name] = engine
+    if settings.METRICS_LOW_OVERHEAD or engine in _listeners:
+        return
+
+    statements = DB_STATEMENTS.labels(name)
+    durations = DB_STATEMENT_SECONDS.labels(name)
+
+    # O início fica no contexto de execução, descartado com ele: um
+    # statement que falha (sem `after_cursor_execute`) não deixa resto na
+    # conexão
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if context is not None:
+            context.metrics_started = time.perf_counter()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        started = getattr(context, "metrics_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        statements.inc()
+        durations.observe(elapsed)
+        stats = _request_db_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.seconds += elapsed
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    _listeners[engine] = (before_cursor_execute, after_cursor_execute)
+
+
+def uninstrument_engine(engine: Engine) -> None:
+    for name, registered in list(_engines.items()):
+        if registered is engine:
+            del _engines[name]
+    listeners = _listeners.pop(engine, None)
+    if listeners is not None:
+        event.remove(engine, "before_cursor_execute", listeners[0])
+        event.remove(engine, "after_cursor_execute", listeners[1])
+
+
+class _PoolCollector:
+    """Lê o estado dos pools no momento do scrape, sem custo por requisição."""
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        checked_out = GaugeMetricFamily(
+            "db_pool_checked_out",
+            "Conexões do pool em uso.",
+            labels=["pool"],
+        )
+        overflow = GaugeMetricFamily(
+            "db_pool_overflow",
+            "Conexões abertas além de pool_size.",
+            labels=["pool"],
+        )
+        size = GaugeMetricFamily(
+            "db_pool_size",
+            "Tamanho configurado do pool.",
+            labels=["pool"],
+        )
+        for name, engine in _engines.items():
+            pool = engine.pool
+            if hasattr(pool, "checkedout"):
+                checked_out.add_metric([name], pool.checkedout())
+            if hasattr(pool, "overflow"):
+                overflow.add_metric([name], pool.overflow())
+            if hasattr(pool, "size"):
+                size.add_metric([name], pool.size())
+        yield checked_out
+        yield overflow
+        yield size
+
+
+registry.register(_PoolCollector())
+
+
+def observe_pool_checkout(pool_name: str, started: float) -> float:
+    """Registra a espera por uma conexão e a devolve, em segundos."""
+    waited = time.perf_counter() - started
+    DB_POOL_CHECKOUT_WAIT_SECONDS.labels(pool_name).observe(waited)
+    return waited
+
+
+def render_metrics() -> bytes:
+    """Atualiza os gauges do threadpool e serializa o registry."""
+    statistics = anyio.to_thread.current_default_thread_limiter().statistics()
+    THREADPOOL_BUSY.set(statistics.borrowed_tokens)
+    THREADPOOL_WAITING.set(statistics.tasks_waiting)
+    THREADPOOL_LIMIT.set(statistics.total_tokens)
+    return generate_latest(registry)
+
+
+def route_label(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+# `.labels()` custa um lock e a montagem da chave a cada chamada; as séries
+# por rota são poucas, então ficam em cache.
+_route_series: Dict[Tuple[str, str], Tuple] = {}
+_status_series: Dict[Tuple[str, str, int], Counter] = {}
+
+
+def _series_for(method: str, route: str) -> Tuple:
+    key = (method, route)
+    series = _route_series.get(key)
+    if series is None:
+        series = _route_series[key] = (
+            HTTP_REQUEST_SECONDS.labels(method, route),
+            HTTP_REQUEST_DB_STATEMENTS.labels(route),
+            HTTP_REQUEST_DB_SECONDS.labels(route),
+        )
+    return series
+
+
+def _status_counter(method: str, route: str, status_code: int) -> Counter:
+    key = (method, route, status_code)
+    counter = _status_series.get(key)
+    if counter is None:
+        counter = _status_series[key] = HTTP_REQUESTS.labels(
+            method, route, str(status_code)
+        )
+    return counter
+
+
+class MetricsMiddleware:
+    """Middleware ASGI puro: mede cada requisição sem envolver o corpo."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = None if settings.METRICS_LOW_OVERHEAD else RequestDbStats()
+        token = _request_db_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_db_stats.reset(token)
+            method = scope["method"]
+            route = route_label(scope)
+            latency, db_statements, db_seconds = _series_for(method, route)
+            latency.observe(elapsed)
+            _status_counter(method, route, status_code).inc()
+            if stats is not None:
+                db_statements.observe(stats.statements)
+                db_seconds.observe(stats.seconds)
@@ -0,0 +1,104 @@
+"""
+Cache das páginas de `GET /api/tasks/` já serializadas, em memória por
+worker.
+
+Cada entrada guarda a versão das tarefas do dono (`task_list_versions`) com
+que foi gerada. A rota já lê essa versão para o ETag, e toda escrita a
+incrementa, então uma entrada de versão anterior nunca é servida: as
+páginas do dono ficam todas inválidas de uma vez, em qualquer worker. O
+total de bytes dos corpos é limitado a `max_bytes`, com descarte LRU.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import (
+    TASK_LIST_CACHE_BYTES,
+    TASK_LIST_CACHE_HIT_RATIO,
+    TASK_LIST_CACHE_LOOKUPS,
+)
+from app.schemas.admin import CacheStats
+
+CacheKey = Tuple[int, Hashable]
+
+
+class VersionedResponseCache:
+    """LRU de `(owner_id, parâmetros) -> (versão, corpo)`, limitado em bytes."""
+
+    def __init__(self, max_bytes: int, enabled: bool = True):
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[CacheKey, Tuple[int, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, owner_id: int, version: int, params: Hashable) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+
+        key = (owner_id, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                body = entry[1]
+            else:
+                self.misses += 1
+                body = None
+            hit_ratio = self.hits / (self.hits + self.misses)
+
+        TASK_LIST_CACHE_LOOKUPS.labels("hit" if body is not None else "miss").inc()
+        TASK_LIST_CACHE_HIT_RATIO.set(hit_ratio)
+        return body
+
+    def set(self, owner_id: int, version: int, params: Hashable, body: bytes) -> None:
+        if not self.enabled or len(body) > self.max_bytes:
+            return
+
+        key = (owner_id, params)
+        with self._lock:
+            current = self._entries.get(key)
+            # Uma requisição mais lenta não sobrescreve uma versão mais nova
+            if current is not None and current[0] > version:
+                return
+            if current is not None:
+                self._bytes -= len(current[1])
+            self._entries[key] = (version, body)
+            self._entries.move_to_end(key)
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+            size = self._bytes
+
+        TASK_LIST_CACHE_BYTES.set(size)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+        TASK_LIST_CACHE_BYTES.set(0)
+
+    def stats(self) -> CacheStats:
+        """`size` e `max_size` em bytes."""
+        lookups = self.hits + self.misses
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            size=self._bytes,
+            max_size=self.max_bytes,
+            hit_ratio=self.hits / lookups if lookups else 0.0,
+        )
+
+
+task_list_cache = VersionedResponseCache(
+    max_bytes=settings.TASK_LIST_CACHE_MAX_BYTES,
+    enabled=settings.TASK_LIST_CACHE_ENABLED,
+)
@@ -0,0 +1,50 @@
+"""
+Respostas JSON serializadas direto pelo pydantic-core.
+
+Quando o endpoint devolve um objeto, o FastAPI o converte em dict, valida
+de novo contra o `response_model` e só então gera o JSON. As rotas quentes
+validam uma única vez e devolvem `ModelResponse`, que o FastAPI repassa
+como está; o `response_model` continua documentando o schema no OpenAPI.
+"""
+
+from typing import Any, Mapping, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class ModelResponse(Response):
+    """Serializa um modelo pydantic em bytes, sem passar por dict."""
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: BaseModel,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        background: Optional[BackgroundTask] = None,
+    ):
+        super().__init__(content, status_code, headers, background=background)
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(content)
+
+
+def model_response(
+    model: Type[M],
+    obj: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> ModelResponse:
+    """
+    Valida `obj` (modelo, dict ou objeto ORM com `from_attributes`) contra
+    `model` e devolve a resposta já serializada. Uma instância de `model`
+    passa direto, sem revalidar.
+    """
+    if not isinstance(obj, model):
+        obj = model.model_validate(obj)
+    return ModelResponse(obj, status_code=status_code, headers=headers)
@@ -0,0 +1,206 @@
+"""
+Orçamento de SQL por requisição e detecção de N+1.
+
+Cada rota pode declarar quantos statements executa com `@sql_budget(...)`.
+O middleware conta os statements da requisição e os agrupa por formato
+(SQL sem parâmetros, listas de IN colapsadas). Estourar o orçamento ou
+repetir o mesmo formato mais de `max_repeats` vezes gera uma violação.
+Em produção a violação vira um warning no log; nos testes, a fixture
+`sql_budget_violations` faz o teste falhar.
+"""
+
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+_PLACEHOLDER = r"(?:\?|%\(\w+\)s|%s|\$\d+)"
+_IN_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Formato do statement: IN (?, ?, ...) vira IN (?) e espaços colapsam."""
+    return _WHITESPACE.sub(" ", _IN_LIST.sub("(?)", statement)).strip()
+
+
+@dataclass(frozen=True)
+class SqlBudget:
+    max_statements: Optional[int] = None
+    max_repeats: Optional[int] = None
+    check_repeats: bool = True
+
+
+def sql_budget(
+    max_statements: Optional[int] = None,
+    max_repeats: Optional[int] = None,
+    check_repeats: bool = True,
+) -> Callable[[F], F]:
+    """
+    Declara o orçamento de SQL da rota. Vai abaixo do decorator do router:
+
+        @router.get("/{task_id}")
+        @sql_budget(max_statements=2)
+        async def get_task(...): ...
+
+    `check_repeats=False` desliga a detecção de N+1 em rotas que repetem o
+    mesmo statement por lote de propósito.
+    """
+
+    def decorator(endpoint: F) -> F:
+        endpoint.__sql_budget__ = SqlBudget(max_statements, max_repeats, check_repeats)
+        return endpoint
+
+    return decorator
+
+
+@dataclass
+class QueryLog:
+    statements: List[str] = field(default_factory=list)
+    _last_context: Optional[object] = field(default=None, repr=False)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def record(self, statement: str, context: Optional[object] = None) -> None:
+        # Um INSERT em lote que o dialeto quebra em vários (insertmanyvalues,
+        # p.ex. RETURNING ordenado no SQLite) chega com o mesmo contexto e
+        # conta como um statement só.
+        if context is not None and context is self._last_context:
+            return
+        self._last_context = context
+        self.statements.append(statement)
+
+    def repeated(self, max_repeats: int) -> Dict[str, int]:
+        """Formatos executados mais de `max_repeats` vezes."""
+        shapes = Counter(statement_shape(s) for s in self.statements)
+        return {shape: n for shape, n in shapes.items() if n > max_repeats}
+
+
+@dataclass
+class SqlBudgetViolation:
+    method: str
+    route: str
+    statements: int
+    max_statements: Optional[int]
+    repeated: Dict[str, int]
+
+    def __str__(self) -> str:
+        parts = []
+        if self.max_statements is not None and self.statements > self.max_statements:
+            parts.append(f"{self.statements} statements (budget {self.max_statements})")
+        for shape, count in self.repeated.items():
+            parts.append(f"{count}x {shape[:200]}")
+        return f"SQL budget exceeded on {self.method} {self.route}: " + "; ".join(parts)
+
+
+def _log_violation(violation: SqlBudgetViolation) -> None:
+    logger.warning("%s", violation)
+
+
+# Chamados a cada violação; os testes acrescentam um coletor
+violation_handlers: List[Callable[[SqlBudgetViolation], None]] = [_log_violation]
+
+_current_log: ContextVar[Optional[QueryLog]] = ContextVar(
+    "sql_budget_log",
+    default=None,
+)
+_tracked: Dict[Engine, Callable] = {}
+
+
+def track_engine(engine: Engine) -> None:
+    """Passa a registrar os statements do engine na requisição corrente."""
+    if engine in _tracked:
+        return
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        log = _current_log.get()
+        if log is not None:
+            log.record(statement, context)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    _tracked[engine] = before_cursor_execute
+
+
+@contextmanager
+def capture_queries(engine: Engine) -> Iterator[QueryLog]:
+    """Registra todos os statements do engine no bloco, de qualquer thread."""
+    log = QueryLog()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        log.record(statement, context)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield log
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def check_budget(
+    log: QueryLog,
+    budget: SqlBudget,
+    method: str,
+    route: str,
+) -> Optional[SqlBudgetViolation]:
+    max_repeats = (
+        budget.max_repeats
+        if budget.max_repeats is not None
+        else settings.SQL_BUDGET_MAX_REPEATS
+    )
+    repeated = log.repeated(max_repeats) if budget.check_repeats else {}
+    over_budget = (
+        budget.max_statements is not None and log.count > budget.max_statements
+    )
+    if not over_budget and not repeated:
+        return None
+    return SqlBudgetViolation(
+        method=method,
+        route=route,
+        statements=log.count,
+        max_statements=budget.max_statements,
+        repeated=repeated,
+    )
+
+
+class SqlBudgetMiddleware:
+    """
+    Conta os statements de cada requisição e confere o orçamento da rota.
+    Rotas sem `@sql_budget` só passam pela detecção de N+1.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        log = QueryLog()
+        token = _current_log.set(log)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_log.reset(token)
+            route = scope.get("route")
+            if route is not None and log.statements:
+                budget = getattr(route.endpoint, "__sql_budget__", SqlBudget())
+                violation = check_budget(log, budget, scope["method"], route.path)
+                if violation is not None:
+                    for handler in violation_handlers:
+                        handler(violation)
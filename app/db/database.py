@@ -1,22 +1,146 @@
+from typing import Any, Callable, List, Optional, TypeVar, Union
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+
+from app.core import metrics, sql_budget
+from app.core.config import async_url, settings
+from app.db.pool import configure_engine_pool, pool_options
+from app.db.routing import InMemoryRecentWritesBackend, SessionRouter
+
+T = TypeVar("T")
+
+DbSession = Union[Session, AsyncSession]
+
+
+def _observe_engine(sync_engine: Engine, name: str) -> None:
+    """Pre-ping por ociosidade, orçamento de SQL e métricas do engine."""
+    configure_engine_pool(sync_engine)
+    if settings.SQL_BUDGET_ENABLED:
+        sql_budget.track_engine(sync_engine)
+    if settings.METRICS_ENABLED:
+        metrics.instrument_engine(sync_engine, name)
+
+
+def _create_engine(url: str, name: str) -> Engine:
+    created = create_engine(url, **pool_options(url, name))
+    _observe_engine(created, name)
+    return created
+
+
+def _create_async_engine(url: str, name: str) -> AsyncEngine:
+    created = create_async_engine(url, **pool_options(url, name, is_async=True))
+    _observe_engine(created.sync_engine, name)
+    return created
+
+
+def _session_factory(bind: Engine) -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, bind=bind)
+
 
-from app.core.config import settings
+def _async_session_factory(bind: Optional[AsyncEngine]) -> async_sessionmaker:
+    # `expire_on_commit=False`: os objetos retornados pelas rotas são
+    # serializados fora do contexto async, onde um lazy load não é permitido.
+    return async_sessionmaker(bind=bind, autoflush=False, expire_on_commit=False)
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
 
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine,
+engine = _create_engine(settings.DATABASE_URL, "primary")
+SessionLocal = _session_factory(engine)
+
+replica_engines: List[Engine] = [
+    _create_engine(url, f"replica_{n}") for n, url in enumerate(settings.REPLICA_URLS)
+]
+
+# Só cria os engines async quando habilitado, para não exigir
+# asyncpg/aiosqlite em quem roda no modo síncrono.
+async_engine: Optional[AsyncEngine] = None
+async_replica_engines: List[AsyncEngine] = []
+if settings.DB_ASYNC:
+    async_engine = _create_async_engine(settings.ASYNC_DATABASE_URL, "primary_async")
+    async_replica_engines = [
+        _create_async_engine(async_url(url), f"replica_{n}_async")
+        for n, url in enumerate(settings.REPLICA_URLS)
+    ]
+
+AsyncSessionLocal = _async_session_factory(async_engine)
+
+recent_writes = InMemoryRecentWritesBackend(settings.DB_READ_YOUR_WRITES_MAX_USERS)
+session_router: SessionRouter[Session] = SessionRouter(
+    SessionLocal,
+    [_session_factory(replica) for replica in replica_engines],
+    window_seconds=settings.DB_READ_YOUR_WRITES_SECONDS,
+    recent_writes=recent_writes,
+)
+async_session_router: SessionRouter[AsyncSession] = SessionRouter(
+    AsyncSessionLocal,
+    [_async_session_factory(replica) for replica in async_replica_engines],
+    window_seconds=settings.DB_READ_YOUR_WRITES_SECONDS,
+    recent_writes=recent_writes,
 )
 
 Base = declarative_base()
 
 
-def get_db_session():
-    db = SessionLocal()
+def reset_engines_after_fork() -> None:
+    """
+    No processo filho de um fork (`app.server`), esquece as conexões
+    herdadas do pai sem fechá-las: os sockets ainda pertencem a ele.
+    """
+    engines = [engine, *replica_engines]
+    engines += [created.sync_engine for created in async_replica_engines]
+    if async_engine is not None:
+        engines.append(async_engine.sync_engine)
+    for created in engines:
+        created.dispose(close=False)
+
+
+async def get_db_session(request: Request):
+    """
+    Entrega a sessão do request: `AsyncSession` com `DB_ASYNC=true`, senão a
+    `Session` síncrona de sempre. Com réplicas configuradas, leituras vão
+    para uma réplica (veja `app.db.routing`).
+    """
+    if settings.DB_ASYNC:
+        router = async_session_router
+        try:
+            async with router.session_factory(request)() as db:
+                yield db
+        finally:
+            router.request_finished(request)
+        return
+
+    db = session_router.session_factory(request)()
     try:
         yield db
     finally:
-        db.close()
+        session_router.request_finished(request)
+        await run_in_threadpool(db.close)
+
+
+def sync_session(db: DbSession) -> Session:
+    """Retorna a `Session` usada pelos repositórios para qualquer modo."""
+    if isinstance(db, AsyncSession):
+        return db.sync_session
+    return db
+
+
+async def run_db(db: DbSession, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Executa código de repositório/serviço sem bloquear o event loop.
+
+    - `AsyncSession`: roda via `run_sync`, em greenlet no próprio loop; cada
+      I/O do banco é aguardado pelo driver async, sem ocupar o threadpool.
+    - `Session`: roda no threadpool, como as rotas `def` faziam antes.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(lambda _session: fn(*args, **kwargs))
+    return await run_in_threadpool(fn, *args, **kwargs)
@@ -0,0 +1,27 @@
+"""Funções SQL com compilação própria por dialeto."""
+
+from sqlalchemy import DateTime
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class seconds_ago(FunctionElement):
+    """
+    `now()` do banco menos `seconds`. Cortes por idade comparados com
+    colunas gravadas por `func.now()` usam o mesmo relógio e o mesmo fuso
+    da sessão, em vez de um `datetime` calculado no Python.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(seconds_ago)
+def _compile_seconds_ago(element, compiler, **kw):
+    return f"now() - make_interval(secs => {compiler.process(element.clauses, **kw)})"
+
+
+@compiles(seconds_ago, "sqlite")
+def _compile_seconds_ago_sqlite(element, compiler, **kw):
+    seconds = compiler.process(element.clauses, **kw)
+    return f"datetime('now', '-' || {seconds} || ' seconds')"
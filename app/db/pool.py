@@ -0,0 +1,137 @@
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple, Type
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+
+from app.core.config import settings
+from app.core.metrics import DB_POOL_WAITING, observe_pool_checkout
+
+logger = logging.getLogger(__name__)
+
+
+class _CheckoutTimingMixin:
+    """
+    Mede quanto cada checkout espera por uma conexão. `_do_get` bloqueia
+    quando o pool e o overflow estão cheios; fora disso o custo é só o de
+    dois `perf_counter`.
+    """
+
+    def _do_get(self):
+        name = self.logging_name or "default"
+        waiting = DB_POOL_WAITING.labels(name)
+        started = time.perf_counter()
+        waiting.inc()
+        try:
+            return super()._do_get()
+        finally:
+            waiting.dec()
+            waited = observe_pool_checkout(name, started)
+            if waited > settings.DB_POOL_SLOW_CHECKOUT_SECONDS:
+                logger.warning(
+                    "Pool %s: checkout waited %.3fs (checked out %d, size %d, "
+                    "overflow %d)",
+                    name,
+                    waited,
+                    self.checkedout(),
+                    self.size(),
+                    self.overflow(),
+                )
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrumented_pool_class(url: str, is_async: bool = False) -> Optional[Type[Pool]]:
+    """
+    Versão instrumentada do pool padrão do dialeto, ou None quando o padrão
+    não é uma fila (ex.: SQLite em memória).
+    """
+    parsed = make_url(url)
+    default = parsed.get_dialect(_is_async=is_async).get_pool_class(parsed)
+    if default is AsyncAdaptedQueuePool:
+        return InstrumentedAsyncAdaptedQueuePool
+    if default is QueuePool:
+        return InstrumentedQueuePool
+    return None
+
+
+def pool_options(url: str, name: str, is_async: bool = False) -> Dict[str, Any]:
+    """Argumentos de pool para `create_engine`, a partir de `settings`."""
+    options: Dict[str, Any] = {
+        "pool_logging_name": name,
+        "pool_pre_ping": settings.DB_PRE_PING == "always",
+    }
+    if settings.DB_NULL_POOL:
+        options["poolclass"] = NullPool
+        return options
+
+    pool_class = instrumented_pool_class(url, is_async=is_async)
+    if pool_class is not None:
+        options.update(
+            poolclass=pool_class,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    return options
+
+
+def worker_pool_limits(
+    max_connections: int, workers: int, engines_per_database: int = 1
+) -> Tuple[int, int]:
+    """
+    `(pool_size, max_overflow)` de cada engine para que `workers` processos,
+    cada um com `engines_per_database` engines no mesmo banco, não passem
+    de `max_connections`. Os valores configurados só são reduzidos.
+    """
+    per_engine = max_connections // (workers * engines_per_database)
+    if per_engine < 1:
+        raise ValueError(
+            f"DB_MAX_CONNECTIONS={max_connections} leaves no connection per "
+            f"engine for {workers} workers"
+        )
+    pool_size = min(settings.DB_POOL_SIZE, per_engine)
+    max_overflow = min(settings.DB_MAX_OVERFLOW, per_engine - pool_size)
+    return pool_size, max_overflow
+
+
+def ping_idle_connections(engine: Engine, idle_seconds: float) -> None:
+    """
+    Testa no checkout só as conexões paradas há mais de `idle_seconds`.
+    Conexões recém-devolvidas seguem sem o round trip extra; uma conexão
+    morta é descartada e o pool tenta outra (`DisconnectionError`).
+    """
+
+    @event.listens_for(engine, "checkin")
+    def checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            alive = engine.dialect.do_ping(dbapi_connection)
+        except Exception as exc:
+            if not engine.dialect.is_disconnect(exc, dbapi_connection, None):
+                raise
+            alive = False
+        if not alive:
+            raise DisconnectionError("Idle connection failed the liveness check")
+
+
+def configure_engine_pool(engine: Engine) -> None:
+    """Liga o teste de conexões ociosas quando `DB_PRE_PING=idle`."""
+    if settings.DB_PRE_PING == "idle" and not settings.DB_NULL_POOL:
+        ping_idle_connections(engine, settings.DB_PRE_PING_IDLE_SECONDS)
@@ -0,0 +1,122 @@
+"""
+Roteamento das sessões entre o primário e as réplicas de leitura.
+
+Requisições GET/HEAD/OPTIONS vão para uma réplica (round-robin); as demais,
+para o primário. Depois de uma escrita, as leituras do mesmo usuário ficam
+no primário por `DB_READ_YOUR_WRITES_SECONDS`, tempo que deve cobrir o
+atraso de replicação. O usuário é identificado pelo `sub` do token Bearer,
+lido sem validar a assinatura: a autenticação continua em
+`get_current_user`; aqui o `sub` só escolhe o banco.
+"""
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Optional, Protocol, Sequence, TypeVar
+
+from jose import JWTError, jwt
+from starlette.requests import Request
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+S = TypeVar("S")
+
+
+class RecentWritesBackend(Protocol):
+    """
+    Registro de quem escreveu recentemente. A versão em memória vale por
+    worker; com vários workers sem afinidade, um backend compartilhado
+    (ex.: Redis) só precisa implementar estes métodos. `mark` recebe um TTL
+    em segundos, e não um instante: cada backend expira com o próprio
+    relógio (ex.: `SET ... EX` no Redis).
+    """
+
+    def mark(self, subject: str, ttl_seconds: float) -> None: ...
+
+    def is_recent(self, subject: str) -> bool: ...
+
+    def clear(self) -> None: ...
+
+
+class InMemoryRecentWritesBackend:
+    """Marcas com expiração (`time.monotonic`), limitadas a `max_size`."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._until: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark(self, subject: str, ttl_seconds: float) -> None:
+        until = time.monotonic() + ttl_seconds
+        with self._lock:
+            self._until[subject] = until
+            self._until.move_to_end(subject)
+            while len(self._until) > self.max_size:
+                self._until.popitem(last=False)
+
+    def is_recent(self, subject: str) -> bool:
+        with self._lock:
+            until = self._until.get(subject)
+            if until is None:
+                return False
+            if until <= time.monotonic():
+                del self._until[subject]
+                return False
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._until.clear()
+
+
+def request_subject(request: Request) -> Optional[str]:
+    """`sub` do token Bearer da requisição, sem verificar a assinatura."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        subject = jwt.get_unverified_claims(token).get("sub")
+    except JWTError:
+        return None
+    return str(subject) if subject is not None else None
+
+
+class SessionRouter(Generic[S]):
+    """Escolhe a fábrica de sessões (primário ou réplica) de cada requisição."""
+
+    def __init__(
+        self,
+        primary: Callable[[], S],
+        replicas: Sequence[Callable[[], S]],
+        window_seconds: float,
+        recent_writes: RecentWritesBackend,
+    ):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.window_seconds = window_seconds
+        self.recent_writes = recent_writes
+        self._next_replica = itertools.cycle(self.replicas)
+
+    def session_factory(self, request: Request) -> Callable[[], S]:
+        if not self.replicas:
+            return self.primary
+
+        subject = request_subject(request)
+        if request.method not in SAFE_METHODS:
+            # Marca já no início: a resposta da escrita pode chegar ao
+            # cliente antes do fim da dependência
+            self.mark_write(subject)
+            return self.primary
+        if subject is not None and self.recent_writes.is_recent(subject):
+            return self.primary
+        return next(self._next_replica)
+
+    def request_finished(self, request: Request) -> None:
+        """Renova a janela a partir do fim da escrita (ex.: importações longas)."""
+        if self.replicas and request.method not in SAFE_METHODS:
+            self.mark_write(request_subject(request))
+
+    def mark_write(self, subject: Optional[str]) -> None:
+        if subject is not None:
+            self.recent_writes.mark(subject, self.window_seconds)
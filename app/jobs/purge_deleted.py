@@ -0,0 +1,176 @@
+"""
+Move tarefas e usuários excluídos há mais de PURGE_RETENTION_DAYS para
+`tasks_archive` e `users_archive`, em lotes curtos (uma transação por lote)
+com pausa entre eles para não disputar locks com a API.
+
+    python -m app.jobs.purge_deleted [--retention-days N] [--chunk-size N]
+                                     [--pause SECONDS]
+
+Usuários só são arquivados quando não têm mais nenhuma tarefa em `tasks`.
+A exclusão da conta já exclui as tarefas; usuários expirados que ainda
+tenham tarefas ativas (excluídos antes dessa cascata) têm as tarefas
+excluídas aqui, com o mesmo `deleted_at` do dono, e saem na mesma execução.
+Os cortes por idade usam o `now()` do banco. Também remove as famílias de refresh token sem rotação há mais de
+REFRESH_TOKEN_EXPIRE_DAYS, cujos tokens já expiraram todos.
+"""
+
+import argparse
+import logging
+import time
+from typing import Callable, List, Optional
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.user import User
+from app.repositories.archive_repository import ArchiveRepository
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.services.task_service import TaskService
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def _move_in_chunks(
+    name: str,
+    select_ids: Callable[[ArchiveRepository, int], List[int]],
+    archive: Callable[[ArchiveRepository, List[int]], int],
+    pause_seconds: float,
+) -> dict:
+    moved = 0
+    after_id = 0
+    started = time.perf_counter()
+    while True:
+        db = SessionLocal()
+        try:
+            repo = ArchiveRepository(db)
+            ids = select_ids(repo, after_id)
+            if not ids:
+                break
+            moved += archive(repo, ids)
+            db.commit()
+        finally:
+            db.close()
+
+        after_id = ids[-1]
+        elapsed = time.perf_counter() - started
+        logger.info("Moved %s %s so far (%.0f rows/s)", moved, name, moved / elapsed)
+        time.sleep(pause_seconds)
+
+    return _summary(moved, started)
+
+
+def _delete_owner_tasks(repo: ArchiveRepository, owner_ids: List[int]) -> int:
+    """Soft delete das tarefas ativas de cada dono, com o `deleted_at` dele."""
+    task_service = TaskService(repo.db)
+    return sum(
+        task_service.delete_all_for_owner(
+            owner_id,
+            deleted_at=select(User.deleted_at)
+            .where(User.id == owner_id)
+            .scalar_subquery(),
+        )
+        for owner_id in owner_ids
+    )
+
+
+def _delete_stale_refresh_families(chunk_size: int, pause_seconds: float) -> dict:
+    max_age_seconds = settings.REFRESH_TOKEN_EXPIRE_DAYS * SECONDS_PER_DAY
+    deleted = 0
+    started = time.perf_counter()
+    while True:
+        db = SessionLocal()
+        try:
+            chunk = RefreshTokenRepository(db).delete_stale(max_age_seconds, chunk_size)
+            db.commit()
+        finally:
+            db.close()
+
+        deleted += chunk
+        if chunk < chunk_size:
+            break
+        time.sleep(pause_seconds)
+
+    return _summary(deleted, started)
+
+
+def _summary(rows: int, started: float) -> dict:
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def purge_deleted(
+    retention_days: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    pause_seconds: Optional[float] = None,
+) -> dict:
+    retention_days = (
+        settings.PURGE_RETENTION_DAYS if retention_days is None else retention_days
+    )
+    chunk_size = chunk_size or settings.PURGE_CHUNK_SIZE
+    pause_seconds = (
+        settings.PURGE_PAUSE_SECONDS if pause_seconds is None else pause_seconds
+    )
+    retention_seconds = retention_days * SECONDS_PER_DAY
+
+    # Tarefas antes dos usuários: libera os donos que só tinham tarefas excluídas
+    return {
+        "owner_tasks": _move_in_chunks(
+            "tasks of deleted users",
+            lambda repo, after_id: repo.expired_owner_ids_with_live_tasks(
+                retention_seconds, after_id, chunk_size
+            ),
+            _delete_owner_tasks,
+            pause_seconds,
+        ),
+        "tasks": _move_in_chunks(
+            "tasks",
+            lambda repo, after_id: repo.expired_task_ids(
+                retention_seconds, after_id, chunk_size
+            ),
+            ArchiveRepository.archive_tasks,
+            pause_seconds,
+        ),
+        "users": _move_in_chunks(
+            "users",
+            lambda repo, after_id: repo.expired_user_ids(
+                retention_seconds, after_id, chunk_size
+            ),
+            ArchiveRepository.archive_users,
+            pause_seconds,
+        ),
+        "refresh_token_families": _delete_stale_refresh_families(
+            chunk_size, pause_seconds
+        ),
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--retention-days", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument(
+        "--pause",
+        type=float,
+        default=None,
+        help="Segundos de pausa entre lotes.",
+    )
+    args = parser.parse_args()
+
+    for table, result in purge_deleted(
+        args.retention_days, args.chunk_size, args.pause
+    ).items():
+        logger.info(
+            "Purged %s %s in %ss (%s rows/s)",
+            result["rows"],
+            table,
+            result["seconds"],
+            result["rows_per_second"],
+        )
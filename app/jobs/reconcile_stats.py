@@ -0,0 +1,34 @@
+"""
+Recalcula `stats_counters` a partir das tabelas para corrigir desvios.
+
+    python -m app.jobs.reconcile_stats
+"""
+
+import logging
+
+from app.db.database import SessionLocal
+from app.repositories.stats_repository import StatsRepository
+
+logger = logging.getLogger(__name__)
+
+
+def reconcile_stats() -> dict:
+    db = SessionLocal()
+    try:
+        before = StatsRepository(db).totals()
+        after = StatsRepository(db).rebuild()
+        db.commit()
+    finally:
+        db.close()
+
+    for name, value in after.items():
+        if before.get(name, 0) != value:
+            logger.warning(
+                "Counter %s drifted: %s -> %s", name, before.get(name, 0), value
+            )
+    return after
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    logger.info("Stats counters reconciled: %s", reconcile_stats())
@@ -0,0 +1,56 @@
+"""
+Recalcula `task_counters` a partir de `tasks`.
+
+    python -m app.jobs.repair_task_counters [--owner-id ID] [--check]
+"""
+
+import argparse
+import logging
+import sys
+from typing import Optional
+
+from app.db.database import SessionLocal
+from app.repositories.task_counter_repository import TaskCounterRepository
+
+logger = logging.getLogger(__name__)
+
+
+def repair_task_counters(owner_id: Optional[int] = None, check: bool = False) -> int:
+    db = SessionLocal()
+    try:
+        repo = TaskCounterRepository(db)
+        if check:
+            inconsistencies = repo.find_inconsistencies(owner_id)
+            for owner, status, stored, actual in inconsistencies:
+                logger.warning(
+                    "Owner %s status %s: stored %s, actual %s",
+                    owner,
+                    status,
+                    stored,
+                    actual,
+                )
+            return len(inconsistencies)
+
+        repaired = repo.rebuild(owner_id)
+        db.commit()
+        return repaired
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--owner-id", type=int, default=None)
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Só verifica; sai com código 1 se houver divergência.",
+    )
+    args = parser.parse_args()
+
+    found = repair_task_counters(args.owner_id, args.check)
+    logger.info(
+        "Task counters %s: %s", "diverging" if args.check else "repaired", found
+    )
+    sys.exit(1 if args.check and found else 0)
@@ -1,18 +1,30 @@
+import asyncio
 import os
 import sys
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, status
+from fastapi import FastAPI, Response, status
+from prometheus_client import CONTENT_TYPE_LATEST
 
+from app.core.config import settings
 from app.core.init_admin import create_default_admin
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.sql_budget import SqlBudgetMiddleware
 from app.routers import admin_router, auth_router, task_router, user_router
+from app.security.token_versions import keep_token_versions_fresh
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     if "pytest" not in sys.modules and os.getenv("TESTING") != "1":
         create_default_admin()
+
+    refresher = None
+    if settings.STATELESS_AUTH:
+        refresher = asyncio.create_task(keep_token_versions_fresh())
     yield
+    if refresher is not None:
+        refresher.cancel()
 
 
 app = FastAPI(
@@ -29,11 +41,23 @@ app.include_router(admin_router.router)
 
 
 @app.get("/health", tags=["Health"], status_code=status.HTTP_200_OK)
-def health_check():
+async def health_check():
     return {"status": "ok"}
 
 
 @app.get("/ready", tags=["Health"], status_code=status.HTTP_200_OK)
-def readiness_check():
+async def readiness_check():
     # Se quiser, no futuro, você pode plugar um check real de DB aqui.
     return {"database": "ok"}
+
+
+if settings.SQL_BUDGET_ENABLED:
+    app.add_middleware(SqlBudgetMiddleware)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Métricas no formato texto do Prometheus."""
+        return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+
+
+class RefreshTokenFamily(Base):
+    """
+    Sessão de refresh aberta por um login. Cada rotação incrementa
+    `generation` e só o refresh token da geração atual é aceito; apresentar
+    um anterior (reuso de token vazado) revoga a família inteira.
+    """
+
+    __tablename__ = "refresh_token_families"
+
+    id = Column(String(32), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    generation = Column(Integer, nullable=False, server_default="0")
+
+    rotated_at = Column(DateTime, server_default=func.now(), nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
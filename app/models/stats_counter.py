@@ -0,0 +1,18 @@
+from sqlalchemy import BigInteger, Column, Integer, String
+
+from app.db.database import Base
+
+
+class StatsCounter(Base):
+    """
+    Contador global do dashboard, mantido na mesma transação das escritas.
+
+    Cada contador é dividido em `shard`s (por dono) para que escritas
+    concorrentes não disputem a mesma linha; o total é a soma dos shards.
+    """
+
+    __tablename__ = "stats_counters"
+
+    name = Column(String(50), primary_key=True)
+    shard = Column(Integer, primary_key=True, autoincrement=False)
+    value = Column(BigInteger, nullable=False, server_default="0")
@@ -1,8 +1,53 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    DDL,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+)
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.sql import func
+from sqlalchemy.sql.functions import FunctionElement
 
 from app.db.database import Base
 
+# No SQLite o `server_default=func.now()` grava "YYYY-MM-DD HH:MM:SS"; sem um
+# formato explícito o SQLAlchemy compara contra valores com microssegundos e a
+# comparação de texto usada no keyset deixa de ser confiável.
+CreatedAt = DateTime().with_variant(
+    sqlite.DATETIME(
+        storage_format=(
+            "%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+        ),
+    ),
+    "sqlite",
+)
+
+
+class precise_now(FunctionElement):
+    """
+    `now()` com precisão abaixo do segundo também no SQLite, onde
+    CURRENT_TIMESTAMP só tem segundos. Usado em `updated_at`, base do ETag.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(precise_now)
+def _compile_precise_now(element, compiler, **kw):
+    return compiler.process(func.now(), **kw)
+
+
+@compiles(precise_now, "sqlite")
+def _compile_precise_now_sqlite(element, compiler, **kw):
+    return "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
 
 class Task(Base):
     """
@@ -12,18 +57,125 @@ class Task(Base):
     __tablename__ = "tasks"
 
     id = Column(Integer, primary_key=True, index=True)
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # Coberto pelo prefixo dos índices parciais de tarefas ativas (abaixo).
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
 
-    status = Column(String(50), nullable=False, index=True)
+    status = Column(String(50), nullable=False)
 
-    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    created_at = Column(CreatedAt, server_default=func.now(), nullable=False)
     updated_at = Column(
         DateTime,
         server_default=func.now(),
-        onupdate=func.now(),
+        onupdate=precise_now(),
         nullable=False,
     )
     deleted_at = Column(DateTime, nullable=True, index=True)
+
+    __mapper_args__ = {
+        # INSERT/UPDATE trazem os valores gerados no banco (id, created_at,
+        # updated_at) via RETURNING, dispensando o SELECT de refresh.
+        "eager_defaults": True,
+        # No Postgres a tabela é particionada por hash de owner_id (revisão
+        # a9c4e2f7b318) e a PK física é (id, owner_id). Com owner_id na
+        # identidade, o UPDATE gerado pelo flush filtra por ele e atinge uma
+        # única partição.
+        "primary_key": [id, owner_id],
+    }
+
+
+# Toda leitura por dono filtra `deleted_at IS NULL`: índices parciais só com
+# as linhas ativas, na ordem da listagem (created_at DESC, id DESC). O
+# primeiro atende listagem sem filtro, keyset e exportação; o segundo, o
+# filtro por status. `ix_tasks_deleted_at` fica para o job de expurgo.
+_LIVE_TASK = Task.deleted_at.is_(None)
+
+Index(
+    "ix_tasks_live_owner_created",
+    Task.owner_id,
+    Task.created_at.desc(),
+    Task.id.desc(),
+    postgresql_where=_LIVE_TASK,
+    sqlite_where=_LIVE_TASK,
+)
+Index(
+    "ix_tasks_live_owner_status_created",
+    Task.owner_id,
+    Task.status,
+    Task.created_at.desc(),
+    Task.id.desc(),
+    postgresql_where=_LIVE_TASK,
+    sqlite_where=_LIVE_TASK,
+)
+
+
+# Busca textual em título (peso A) e descrição (peso B), sempre junto com
+# `owner_id`. No Postgres: coluna gerada `search_vector` + GIN
+# (owner_id, search_vector) via btree_gin. No SQLite: tabela FTS5 externa
+# `tasks_fts`, mantida por triggers. A revisão e5b19c3a7d42 cria o mesmo no
+# banco migrado; aqui o DDL acompanha o `create_all`.
+SEARCH_CONFIG = "simple"
+
+_POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS btree_gin",
+    f"""
+    ALTER TABLE tasks ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX ix_tasks_owner_id_search_vector ON tasks
+    USING gin (owner_id, search_vector) WHERE deleted_at IS NULL
+    """,
+]
+
+_SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE tasks_fts USING fts5(
+        title, description, content='tasks', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_fts_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+for _statement in _POSTGRES_SEARCH_DDL:
+    event.listen(
+        Task.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
+
+for _statement in _SQLITE_SEARCH_DDL:
+    event.listen(
+        Task.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
+
+event.listen(
+    Task.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS tasks_fts").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+
+
+class TaskArchive(Base):
+    """
+    Tarefas excluídas há mais que a retenção, movidas de `tasks` pelo job
+    de expurgo. Sem FK para `users`: o dono pode ter sido arquivado também.
+    """
+
+    __tablename__ = "tasks_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    owner_id = Column(Integer, nullable=False, index=True)
+
+    title = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+
+    status = Column(String(50), nullable=False)
+
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    deleted_at = Column(DateTime, nullable=False)
+    archived_at = Column(DateTime, server_default=func.now(), nullable=False)
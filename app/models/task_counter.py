@@ -0,0 +1,21 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer, String
+
+from app.db.database import Base
+
+
+class TaskCounter(Base):
+    """
+    Quantidade de tarefas ativas por dono e status, mantida na mesma
+    transação das escritas para evitar COUNT(*) na listagem.
+    """
+
+    __tablename__ = "task_counters"
+
+    owner_id = Column(
+        Integer,
+        ForeignKey("users.id"),
+        primary_key=True,
+        autoincrement=False,
+    )
+    status = Column(String(50), primary_key=True)
+    total = Column(BigInteger, nullable=False, server_default="0")
@@ -0,0 +1,20 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer
+
+from app.db.database import Base
+
+
+class TaskListVersion(Base):
+    """
+    Versão das tarefas de um dono, incrementada a cada escrita. Identifica
+    se qualquer página da listagem mudou sem consultar as tarefas.
+    """
+
+    __tablename__ = "task_list_versions"
+
+    owner_id = Column(
+        Integer,
+        ForeignKey("users.id"),
+        primary_key=True,
+        autoincrement=False,
+    )
+    version = Column(BigInteger, nullable=False, server_default="0")
@@ -26,3 +26,8 @@ class User(Base):
         nullable=False,
     )
     deleted_at = Column(DateTime, nullable=True, index=True)
+
+    # Incrementado quando os tokens de acesso emitidos precisam deixar de
+    # valer (troca de senha ou de role, exclusão); vai no claim `ver`
+    token_version = Column(Integer, nullable=False, server_default="0")
+    tokens_revoked_at = Column(DateTime, nullable=True, index=True)
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+
+
+class UserArchive(Base):
+    """
+    Usuários excluídos há mais que a retenção e já sem tarefas, movidos de
+    `users` pelo job de expurgo. O hash da senha não é arquivado.
+    """
+
+    __tablename__ = "users_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    email = Column(String(255), nullable=False, index=True)
+
+    name = Column(String(255), nullable=True)
+    role = Column(String(50), nullable=False)
+
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    deleted_at = Column(DateTime, nullable=False)
+    archived_at = Column(DateTime, server_default=func.now(), nullable=False)
@@ -0,0 +1,138 @@
+from typing import List, Sequence
+
+from sqlalchemy import delete, exists, insert, select
+from sqlalchemy.orm import Session
+
+from app.db.functions import seconds_ago
+from app.models.refresh_token_family import RefreshTokenFamily
+from app.models.task import Task
+from app.models.task_archive import TaskArchive
+from app.models.task_counter import TaskCounter
+from app.models.task_list_version import TaskListVersion
+from app.models.user import User
+from app.models.user_archive import UserArchive
+
+TASK_COLUMNS = [
+    "id",
+    "owner_id",
+    "title",
+    "description",
+    "status",
+    "created_at",
+    "updated_at",
+    "deleted_at",
+]
+# Sem `hashed_password`: o hash de uma conta excluída não é arquivado
+USER_COLUMNS = [
+    "id",
+    "email",
+    "name",
+    "role",
+    "created_at",
+    "updated_at",
+    "deleted_at",
+]
+
+
+class ArchiveRepository:
+    """
+    Move linhas excluídas há mais que a retenção para as tabelas de arquivo.
+    Cada lote é escolhido em ordem de id (keyset) e movido com um
+    INSERT ... SELECT seguido do DELETE; o commit fica com quem chama. O
+    corte (`retention_seconds` antes do `now()` do banco) é calculado no SQL.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def expired_task_ids(
+        self, retention_seconds: float, after_id: int, limit: int
+    ) -> List[int]:
+        # SKIP LOCKED (Postgres): não espera linhas presas por outra transação;
+        # elas ficam para a próxima execução
+        return list(
+            self.db.scalars(
+                select(Task.id)
+                .where(
+                    Task.deleted_at < seconds_ago(retention_seconds),
+                    Task.id > after_id,
+                )
+                .order_by(Task.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+        )
+
+    def archive_tasks(self, task_ids: Sequence[int]) -> int:
+        if not task_ids:
+            return 0
+
+        tasks = Task.__table__
+        self.db.execute(
+            insert(TaskArchive).from_select(
+                TASK_COLUMNS,
+                select(*(tasks.c[name] for name in TASK_COLUMNS)).where(
+                    tasks.c.id.in_(task_ids)
+                ),
+            )
+        )
+        return self.db.execute(delete(tasks).where(tasks.c.id.in_(task_ids))).rowcount
+
+    def expired_owner_ids_with_live_tasks(
+        self, retention_seconds: float, after_id: int, limit: int
+    ) -> List[int]:
+        """Usuários expirados que ainda têm tarefas ativas (anteriores à cascata)."""
+        return list(
+            self.db.scalars(
+                select(User.id)
+                .where(
+                    User.deleted_at < seconds_ago(retention_seconds),
+                    User.id > after_id,
+                    exists().where(Task.owner_id == User.id, Task.deleted_at.is_(None)),
+                )
+                .order_by(User.id)
+                .limit(limit)
+            )
+        )
+
+    def expired_user_ids(
+        self, retention_seconds: float, after_id: int, limit: int
+    ) -> List[int]:
+        """Só usuários sem nenhuma tarefa (ativa ou excluída) em `tasks`."""
+        return list(
+            self.db.scalars(
+                select(User.id)
+                .where(
+                    User.deleted_at < seconds_ago(retention_seconds),
+                    User.id > after_id,
+                    ~exists().where(Task.owner_id == User.id),
+                )
+                .order_by(User.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+        )
+
+    def archive_users(self, user_ids: Sequence[int]) -> int:
+        if not user_ids:
+            return 0
+
+        # Contadores, versões e sessões de refresh (já revogadas) do dono
+        # também referenciam `users`
+        self.db.execute(delete(TaskCounter).where(TaskCounter.owner_id.in_(user_ids)))
+        self.db.execute(
+            delete(RefreshTokenFamily).where(RefreshTokenFamily.user_id.in_(user_ids))
+        )
+        self.db.execute(
+            delete(TaskListVersion).where(TaskListVersion.owner_id.in_(user_ids))
+        )
+        users = User.__table__
+        self.db.execute(
+            insert(UserArchive).from_select(
+                USER_COLUMNS,
+                select(*(users.c[name] for name in USER_COLUMNS)).where(
+                    users.c.id.in_(user_ids)
+                ),
+            )
+        )
+        return self.db.execute(delete(users).where(users.c.id.in_(user_ids))).rowcount
@@ -0,0 +1,80 @@
+import uuid
+from typing import Optional
+
+from sqlalchemy import case, delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.db.functions import seconds_ago
+from app.models.refresh_token_family import RefreshTokenFamily
+
+
+class RefreshTokenRepository:
+    """
+    Operações de persistência para as famílias de refresh tokens.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_family(self, user_id: int) -> RefreshTokenFamily:
+        family = RefreshTokenFamily(id=uuid.uuid4().hex, user_id=user_id, generation=0)
+        self.db.add(family)
+        return family
+
+    def rotate(self, family_id: str, generation: int) -> Optional[int]:
+        """
+        Avança a família para `generation + 1` se `generation` for a atual e
+        a família não estiver revogada; devolve o dono. Um único UPDATE pela
+        PK: uma geração anterior (token reutilizado) revoga a família no
+        mesmo statement.
+        """
+        family = RefreshTokenFamily
+        current = family.generation == generation
+        row = self.db.execute(
+            update(family)
+            .where(family.id == family_id)
+            .values(
+                generation=case(
+                    (current, family.generation + 1), else_=family.generation
+                ),
+                rotated_at=case((current, func.now()), else_=family.rotated_at),
+                revoked_at=case(
+                    (current, family.revoked_at),
+                    else_=func.coalesce(family.revoked_at, func.now()),
+                ),
+            )
+            .returning(family.user_id, family.generation, family.revoked_at)
+            .execution_options(synchronize_session=False)
+        ).first()
+
+        if (
+            row is None
+            or row.revoked_at is not None
+            or row.generation != generation + 1
+        ):
+            return None
+        return row.user_id
+
+    def revoke_user(self, user_id: int) -> None:
+        self.db.execute(
+            update(RefreshTokenFamily)
+            .where(
+                RefreshTokenFamily.user_id == user_id,
+                RefreshTokenFamily.revoked_at.is_(None),
+            )
+            .values(revoked_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+
+    def delete_stale(self, max_age_seconds: float, limit: int) -> int:
+        """Remove até `limit` famílias sem rotação há mais de `max_age_seconds`."""
+        stale = (
+            select(RefreshTokenFamily.id)
+            .where(RefreshTokenFamily.rotated_at < seconds_ago(max_age_seconds))
+            .limit(limit)
+        )
+        return self.db.execute(
+            delete(RefreshTokenFamily)
+            .where(RefreshTokenFamily.id.in_(stale))
+            .execution_options(synchronize_session=False)
+        ).rowcount
@@ -0,0 +1,115 @@
+from typing import Dict, Mapping
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.stats_counter import StatsCounter
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.task import TaskStatus
+
+USERS_ACTIVE = "users_active"
+TASKS_ACTIVE = "tasks_active"
+
+
+def tasks_by_status(task_status: TaskStatus) -> str:
+    return f"tasks_{TaskStatus(task_status).value}"
+
+
+def upsert(db: Session, model):
+    """`INSERT ... ON CONFLICT` do dialeto em uso (Postgres ou SQLite)."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    raise NotImplementedError(f"Upsert not supported for dialect {dialect!r}")
+
+
+class StatsRepository:
+    """
+    Operações de persistência para os contadores do dashboard.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def increment(self, deltas: Mapping[str, int], shard_key: int) -> None:
+        # Linhas sempre na mesma ordem (por nome): duas transações no mesmo
+        # shard travam os contadores na mesma sequência, sem deadlock
+        rows = [
+            {
+                "name": name,
+                "shard": shard_key % settings.STATS_COUNTER_SHARDS,
+                "value": delta,
+            }
+            for name, delta in sorted(deltas.items())
+            if delta
+        ]
+        if not rows:
+            return
+
+        stmt = upsert(self.db, StatsCounter)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StatsCounter.name, StatsCounter.shard],
+            set_={"value": StatsCounter.value + stmt.excluded.value},
+        )
+        self.db.execute(stmt, rows)
+
+    def totals(self) -> Dict[str, int]:
+        rows = self.db.execute(
+            select(StatsCounter.name, func.sum(StatsCounter.value)).group_by(
+                StatsCounter.name
+            )
+        )
+        return {name: int(total or 0) for name, total in rows}
+
+    @staticmethod
+    def _actual_counts():
+        """Contagem real de cada contador, como subconsulta escalar."""
+        live_tasks = (
+            select(func.count()).select_from(Task).where(Task.deleted_at.is_(None))
+        )
+        counts = {
+            USERS_ACTIVE: select(func.count())
+            .select_from(User)
+            .where(User.deleted_at.is_(None)),
+            TASKS_ACTIVE: live_tasks,
+        }
+        for task_status in TaskStatus:
+            counts[tasks_by_status(task_status)] = live_tasks.where(
+                Task.status == task_status
+            )
+        return {name: query.scalar_subquery() for name, query in counts.items()}
+
+    def rebuild(self) -> Dict[str, int]:
+        """
+        Corrige os contadores a partir das tabelas, sem travar as escritas.
+        As contagens reais e as somas dos contadores saem de uma única
+        consulta (mesmo snapshot); a diferença entra como incremento no
+        shard 0, então as escritas concorrentes continuam somando certo.
+        Usado pelo job de reconciliação.
+        """
+        actual = self._actual_counts()
+        names = sorted(actual)
+        row = self.db.execute(
+            select(
+                *(actual[name] for name in names),
+                *(
+                    select(func.coalesce(func.sum(StatsCounter.value), 0))
+                    .where(StatsCounter.name == name)
+                    .scalar_subquery()
+                    for name in names
+                ),
+            )
+        ).one()
+
+        totals = {name: int(total) for name, total in zip(names, row)}
+        stored = {name: int(total) for name, total in zip(names, row[len(names) :])}
+        self.increment(
+            {name: totals[name] - stored[name] for name in names}, shard_key=0
+        )
+        self.db.flush()
+        return totals
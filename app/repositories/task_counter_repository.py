@@ -0,0 +1,97 @@
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.models.task import Task
+from app.models.task_counter import TaskCounter
+from app.repositories.stats_repository import upsert
+from app.schemas.task import TaskStatus
+
+
+class TaskCounterRepository:
+    """
+    Operações de persistência para os contadores de tarefas por dono.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def increment(self, owner_id: int, deltas: Mapping[str, int]) -> None:
+        # Ordem fixa por status, como em `StatsRepository.increment`
+        rows = sorted(
+            (
+                {
+                    "owner_id": owner_id,
+                    "status": TaskStatus(task_status).value,
+                    "total": d,
+                }
+                for task_status, d in deltas.items()
+                if d
+            ),
+            key=lambda row: row["status"],
+        )
+        if not rows:
+            return
+
+        stmt = upsert(self.db, TaskCounter)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TaskCounter.owner_id, TaskCounter.status],
+            set_={"total": TaskCounter.total + stmt.excluded.total},
+        )
+        self.db.execute(stmt, rows)
+
+    def total(self, owner_id: int, status: Optional[TaskStatus] = None) -> int:
+        """Total do dono (ou de um status) lido pela chave primária."""
+        query = select(func.coalesce(func.sum(TaskCounter.total), 0)).where(
+            TaskCounter.owner_id == owner_id
+        )
+        if status:
+            query = query.where(TaskCounter.status == TaskStatus(status).value)
+        return int(self.db.scalar(query))
+
+    def _actual_counts(self, owner_id: Optional[int]) -> Dict[Tuple[int, str], int]:
+        query = (
+            select(Task.owner_id, Task.status, func.count())
+            .where(Task.deleted_at.is_(None))
+            .group_by(Task.owner_id, Task.status)
+        )
+        if owner_id is not None:
+            query = query.where(Task.owner_id == owner_id)
+        return {(o, s): total for o, s, total in self.db.execute(query)}
+
+    def _stored_counts(self, owner_id: Optional[int]) -> Dict[Tuple[int, str], int]:
+        query = select(TaskCounter.owner_id, TaskCounter.status, TaskCounter.total)
+        if owner_id is not None:
+            query = query.where(TaskCounter.owner_id == owner_id)
+        return {(o, s): total for o, s, total in self.db.execute(query)}
+
+    def find_inconsistencies(
+        self, owner_id: Optional[int] = None
+    ) -> List[Tuple[int, str, int, int]]:
+        """Retorna `(owner_id, status, armazenado, real)` para cada divergência."""
+        actual = self._actual_counts(owner_id)
+        stored = self._stored_counts(owner_id)
+        return sorted(
+            (key[0], key[1], stored.get(key, 0), actual.get(key, 0))
+            for key in actual.keys() | stored.keys()
+            if stored.get(key, 0) != actual.get(key, 0)
+        )
+
+    def rebuild(self, owner_id: Optional[int] = None) -> int:
+        """
+        Recalcula os contadores (de um dono ou de todos) a partir de `tasks`.
+        Retorna quantos contadores estavam divergentes.
+        """
+        inconsistencies = self.find_inconsistencies(owner_id)
+
+        stmt = delete(TaskCounter)
+        if owner_id is not None:
+            stmt = stmt.where(TaskCounter.owner_id == owner_id)
+        self.db.execute(stmt)
+        self.db.add_all(
+            TaskCounter(owner_id=o, status=s, total=total)
+            for (o, s), total in self._actual_counts(owner_id).items()
+        )
+        self.db.flush()
+        return len(inconsistencies)
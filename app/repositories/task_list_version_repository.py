@@ -0,0 +1,28 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.task_list_version import TaskListVersion
+from app.repositories.stats_repository import upsert
+
+
+class TaskListVersionRepository:
+    """
+    Operações de persistência para a versão das tarefas de cada dono.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, owner_id: int) -> int:
+        version = self.db.scalar(
+            select(TaskListVersion.version).where(TaskListVersion.owner_id == owner_id)
+        )
+        return version or 0
+
+    def bump(self, owner_id: int) -> None:
+        stmt = upsert(self.db, TaskListVersion).values(owner_id=owner_id, version=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TaskListVersion.owner_id],
+            set_={"version": TaskListVersion.version + 1},
+        )
+        self.db.execute(stmt)
@@ -1,9 +1,21 @@
-from typing import List, Optional, Tuple
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from sqlalchemy import func
+from sqlalchemy import (
+    Select,
+    bindparam,
+    column,
+    func,
+    insert,
+    literal_column,
+    select,
+    table,
+    tuple_,
+    update,
+)
 from sqlalchemy.orm import Session
 
-from app.models.task import Task
+from app.models.task import SEARCH_CONFIG, Task
 from app.schemas.task import TaskCreate, TaskStatus, TaskUpdate
 
 
@@ -24,21 +36,99 @@ class TaskRepository:
     def get_by_id(self, task_id: int, owner_id: int) -> Optional[Task]:
         return self._base_query(owner_id).filter(Task.id == task_id).first()
 
+    def _filtered_query(self, owner_id: int, status: Optional[TaskStatus]):
+        query = self._base_query(owner_id)
+
+        if status:
+            query = query.filter(Task.status == status)
+
+        return query
+
+    def count(self, owner_id: int, status: Optional[TaskStatus]) -> int:
+        return self._filtered_query(owner_id, status).count()
+
     def list(
         self,
         owner_id: int,
         status: Optional[TaskStatus],
         limit: int,
         offset: int,
-    ) -> Tuple[List[Task], int]:
-        query = self._base_query(owner_id)
+    ) -> List[Task]:
+        """
+        Paginação por offset. `id` desempata tarefas com o mesmo `created_at`.
+        """
+        return (
+            self._filtered_query(owner_id, status)
+            .order_by(Task.created_at.desc(), Task.id.desc())
+            .limit(limit)
+            .offset(offset)
+            .all()
+        )
 
-        if status:
-            query = query.filter(Task.status == status)
+    def list_after(
+        self,
+        owner_id: int,
+        status: Optional[TaskStatus],
+        limit: int,
+        after: Optional[Tuple[datetime, int]] = None,
+    ) -> List[Task]:
+        """
+        Paginação por keyset: retorna as tarefas estritamente depois de
+        `(created_at, id)` na ordenação decrescente, usando o índice
+        `ix_tasks_live_owner_created` em vez de descartar linhas.
+        """
+        query = self._filtered_query(owner_id, status)
 
-        total = query.count()
-        tasks = query.order_by(Task.created_at.desc()).limit(limit).offset(offset).all()
-        return tasks, total
+        if after is not None:
+            # `types` garante que o cursor é gravado no mesmo formato da coluna
+            cursor = tuple_(*after, types=[Task.created_at.type, Task.id.type])
+            query = query.filter(tuple_(Task.created_at, Task.id) < cursor)
+
+        return query.order_by(Task.created_at.desc(), Task.id.desc()).limit(limit).all()
+
+    def _search_query(self, owner_id: int, status: Optional[TaskStatus], q: str):
+        """
+        Restringe a consulta às tarefas que casam com `q` e devolve também a
+        expressão de ordenação por relevância (melhor primeiro).
+        """
+        query = self._filtered_query(owner_id, status)
+
+        if self.db.get_bind().dialect.name == "postgresql":
+            vector = literal_column("tasks.search_vector")
+            config = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+            ts_query = func.websearch_to_tsquery(config, q)
+            query = query.filter(vector.op("@@")(ts_query))
+            return query, func.ts_rank(vector, ts_query).desc()
+
+        # FTS5: cada termo vira uma frase entre aspas (E implícito), o que
+        # evita erros de sintaxe com a entrada do usuário
+        match = " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+        fts = table("tasks_fts", column("rowid"))
+        query = query.join(fts, fts.c.rowid == Task.id).filter(
+            literal_column("tasks_fts").op("MATCH")(match)
+        )
+        return query, func.bm25(literal_column("tasks_fts"), 10.0, 1.0)
+
+    def search(
+        self,
+        owner_id: int,
+        q: str,
+        status: Optional[TaskStatus],
+        limit: int,
+        offset: int,
+    ) -> List[Task]:
+        """Busca textual ordenada por relevância e, no empate, por recência."""
+        query, rank = self._search_query(owner_id, status, q)
+        return (
+            query.order_by(rank, Task.created_at.desc(), Task.id.desc())
+            .limit(limit)
+            .offset(offset)
+            .all()
+        )
+
+    def count_search(self, owner_id: int, q: str, status: Optional[TaskStatus]) -> int:
+        query, _rank = self._search_query(owner_id, status, q)
+        return query.count()
 
     def create(
         self,
@@ -65,6 +155,137 @@ class TaskRepository:
         db_task.deleted_at = func.now()
         self.db.add(db_task)
 
+    def export_query(self, owner_id: int, batch_size: int) -> Select:
+        """
+        Colunas exportáveis das tarefas ativas do dono, para leitura em
+        streaming (cursor no servidor, `batch_size` linhas por vez).
+        """
+        return (
+            select(
+                Task.id,
+                Task.title,
+                Task.description,
+                Task.status,
+                Task.created_at,
+                Task.updated_at,
+            )
+            .where(Task.owner_id == owner_id, Task.deleted_at.is_(None))
+            .order_by(Task.created_at, Task.id)
+            .execution_options(yield_per=batch_size)
+        )
+
+    def create_many(
+        self,
+        tasks_create: Sequence[TaskCreate],
+        owner_id: int,
+        status: TaskStatus,
+    ) -> List[Task]:
+        """INSERT multi-linha com RETURNING, na ordem de `tasks_create`."""
+        if not tasks_create:
+            return []
+
+        rows = [
+            {**task_create.model_dump(), "owner_id": owner_id, "status": status}
+            for task_create in tasks_create
+        ]
+        stmt = insert(Task).returning(Task, sort_by_parameter_order=True)
+        return list(self.db.scalars(stmt, rows))
+
+    def insert_many(
+        self,
+        tasks_create: Sequence[TaskCreate],
+        owner_id: int,
+        status: TaskStatus,
+    ) -> None:
+        """INSERT executemany sem RETURNING, para cargas em massa."""
+        if not tasks_create:
+            return
+
+        rows = [
+            {**task_create.model_dump(), "owner_id": owner_id, "status": status}
+            for task_create in tasks_create
+        ]
+        self.db.execute(insert(Task), rows)
+
+    def get_statuses(self, task_ids: Iterable[int], owner_id: int) -> Dict[int, str]:
+        """Status atual das tarefas ativas do dono, em uma consulta."""
+        rows = self.db.execute(
+            select(Task.id, Task.status).where(
+                Task.id.in_(list(task_ids)),
+                Task.owner_id == owner_id,
+                Task.deleted_at.is_(None),
+            )
+        )
+        return {task_id: task_status for task_id, task_status in rows}
+
+    def update_many(self, updates: Dict[int, Dict[str, Any]], owner_id: int) -> None:
+        """
+        Aplica `{task_id: campos}` com um UPDATE executemany por conjunto de
+        colunas alteradas, em vez de um UPDATE por tarefa.
+        """
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for task_id, values in updates.items():
+            columns = tuple(sorted(values))
+            params = {f"v_{column}": values[column] for column in columns}
+            groups.setdefault(columns, []).append({"task_id": task_id, **params})
+
+        for columns, params in groups.items():
+            stmt = (
+                update(Task)
+                .where(
+                    Task.id == bindparam("task_id"),
+                    Task.owner_id == owner_id,
+                    Task.deleted_at.is_(None),
+                )
+                .values(
+                    {column: bindparam(f"v_{column}") for column in columns}
+                    or {"updated_at": func.now()}
+                )
+            )
+            self.db.connection().execute(stmt, params)
+
+    def delete_many(self, task_ids: Sequence[int], owner_id: int) -> None:
+        if not task_ids:
+            return
+
+        self.db.execute(
+            update(Task)
+            .where(
+                Task.id.in_(task_ids),
+                Task.owner_id == owner_id,
+                Task.deleted_at.is_(None),
+            )
+            .values(deleted_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+
+    def delete_all(self, owner_id: int, deleted_at: Any = None) -> List[str]:
+        """
+        Soft delete de todas as tarefas ativas do dono, com `deleted_at`
+        (padrão: `now()`). Devolve o status de cada tarefa excluída.
+        """
+        return list(
+            self.db.scalars(
+                update(Task)
+                .where(Task.owner_id == owner_id, Task.deleted_at.is_(None))
+                .values(deleted_at=func.now() if deleted_at is None else deleted_at)
+                .returning(Task.status)
+                .execution_options(synchronize_session=False)
+            )
+        )
+
+    def list_by_ids(self, task_ids: Sequence[int], owner_id: int) -> List[Task]:
+        if not task_ids:
+            return []
+
+        return list(
+            self.db.scalars(
+                select(Task)
+                .where(Task.id.in_(task_ids), Task.owner_id == owner_id)
+                .execution_options(populate_existing=True)
+            )
+        )
+
     def count_all_active(self) -> int:
         return self.db.query(Task).filter(Task.deleted_at.is_(None)).count()
 
@@ -1,10 +1,11 @@
 from typing import List, Optional, Tuple
 
-from sqlalchemy import func
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
+from app.db.functions import seconds_ago
 from app.models.user import User
-from app.schemas.user import UserCreate, UserProfileUpdate
+from app.schemas.user import UserCreate, UserProfileUpdate, UserRole
 
 
 class UserRepository:
@@ -16,6 +17,7 @@ class UserRepository:
         self.db = db
 
     def get_by_email(self, email: str) -> Optional[User]:
+        """Igualdade exata, como a unicidade de `email`, via `ix_users_email`."""
         return (
             self.db.query(User)
             .filter(
@@ -53,10 +55,39 @@ class UserRepository:
         self.db.add(db_user)
         return db_user
 
+    def update_role(self, db_user: User, role: UserRole) -> User:
+        db_user.role = role
+        self.db.add(db_user)
+        return db_user
+
     def soft_delete(self, db_user: User) -> None:
         db_user.deleted_at = func.now()
         self.db.add(db_user)
 
+    def revoke_tokens(self, user_id: int) -> int:
+        """Incrementa `token_version` e devolve a nova versão."""
+        return self.db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(
+                token_version=User.token_version + 1,
+                tokens_revoked_at=func.now(),
+            )
+            .returning(User.token_version)
+            .execution_options(synchronize_session=False)
+        ).scalar_one()
+
+    def recent_token_versions(self, window_seconds: float) -> List[Tuple[int, int]]:
+        """`(id, token_version)` dos usuários revogados nos últimos segundos."""
+        return [
+            (user_id, version)
+            for user_id, version in self.db.execute(
+                select(User.id, User.token_version).where(
+                    User.tokens_revoked_at >= seconds_ago(window_seconds)
+                )
+            )
+        ]
+
     def list_all(self, limit: int, offset: int) -> Tuple[List[User], int]:
         query = self.db.query(User).filter(User.deleted_at.is_(None))
         total = query.count()
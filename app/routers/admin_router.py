@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
 
-from app.db.database import get_db_session
-from app.models.user import User
-from app.schemas.admin import AdminDashboardStats
+from app.core.response_cache import task_list_cache
+from app.core.responses import model_response
+from app.db.database import DbSession, get_db_session, run_db, sync_session
+from app.schemas.admin import AdminDashboardStats, CacheStats
+from app.schemas.user import UserPrincipal
 from app.security.auth import get_current_user
+from app.security.principal_cache import principal_cache
 from app.services.admin_service import AdminService
 
 router = APIRouter(
@@ -13,11 +15,13 @@ router = APIRouter(
 )
 
 
-def get_admin_service(db: Session = Depends(get_db_session)) -> AdminService:
-    return AdminService(db)
+async def get_admin_service(db: DbSession = Depends(get_db_session)) -> AdminService:
+    return AdminService(sync_session(db))
 
 
-def ensure_admin(current_user: User = Depends(get_current_user)) -> User:
+async def ensure_admin(
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> UserPrincipal:
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -27,9 +31,23 @@ def ensure_admin(current_user: User = Depends(get_current_user)) -> User:
 
 
 @router.get("/dashboard", response_model=AdminDashboardStats)
-def get_admin_dashboard(
-    _: User = Depends(ensure_admin),
+async def get_admin_dashboard(
+    _: UserPrincipal = Depends(ensure_admin),
+    db: DbSession = Depends(get_db_session),
     admin_service: AdminService = Depends(get_admin_service),
 ):
     """Retorna estatísticas do dashboard administrativo."""
-    return admin_service.get_dashboard_stats()
+    stats = await run_db(db, admin_service.get_dashboard_stats)
+    return model_response(AdminDashboardStats, stats)
+
+
+@router.get("/cache-stats", response_model=CacheStats)
+async def get_principal_cache_stats(_: UserPrincipal = Depends(ensure_admin)):
+    """Retorna hits/misses do cache de usuários autenticados."""
+    return principal_cache.stats()
+
+
+@router.get("/list-cache-stats", response_model=CacheStats)
+async def get_task_list_cache_stats(_: UserPrincipal = Depends(ensure_admin)):
+    """Retorna hits/misses e bytes ocupados do cache de listagem de tarefas."""
+    return task_list_cache.stats()
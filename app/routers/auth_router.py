@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
 
-from app.db.database import get_db_session
-from app.schemas.token import Token
+from app.core.sql_budget import sql_budget
+from app.db.database import DbSession, get_db_session, run_db, sync_session
+from app.schemas.token import Token, TokenRefresh
 from app.schemas.user import UserCreate, UserRead
-from app.services.user_service import UserService
+from app.security.auth import hash_password_async, verify_password_async
+from app.security.rate_limit import rate_limiter
+from app.services.user_service import UserService, incorrect_credentials
 
 router = APIRouter(
     prefix="/api/auth",
@@ -13,34 +15,72 @@ router = APIRouter(
 )
 
 
+async def limit_register(request: Request) -> None:
+    # O FastAPI já leu e decodificou o corpo (fica em cache no Request); a
+    # validação do UserCreate vem depois desta dependência
+    body = await request.json()
+    email = body.get("email") if isinstance(body, dict) else None
+    rate_limiter.check("register", request, email if isinstance(email, str) else None)
+
+
+async def limit_login(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+) -> None:
+    rate_limiter.check("login", request, form_data.username)
+
+
 @router.post(
     "/register",
     response_model=UserRead,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(limit_register)],
 )
-def register_user(
+async def register_user(
     user_create: UserCreate,
-    db: Session = Depends(get_db_session),
+    db: DbSession = Depends(get_db_session),
 ):
     """Registra um novo usuário."""
-    user_service = UserService(db)
-    return user_service.register_user(user_create)
+    user_service = UserService(sync_session(db))
+    await run_db(db, user_service.ensure_email_available, user_create.email)
+    hashed_password = await hash_password_async(user_create.password)
+    return await run_db(db, user_service.register_user, user_create, hashed_password)
 
 
 @router.post(
     "/login",
     response_model=Token,
+    dependencies=[Depends(limit_login)],
 )
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db_session),
+    db: DbSession = Depends(get_db_session),
 ):
     """
     Autentica o usuário e retorna tokens JWT.
     Usa `username` como email.
     """
-    user_service = UserService(db)
-    return user_service.login_user(
-        email=form_data.username,
-        password=form_data.password,
-    )
+    user_service = UserService(sync_session(db))
+    credentials = await run_db(db, user_service.find_credentials, form_data.username)
+    if credentials is None or not await verify_password_async(
+        form_data.password, credentials.hashed_password
+    ):
+        raise incorrect_credentials()
+    return await run_db(db, user_service.start_session, credentials)
+
+
+@router.post(
+    "/refresh",
+    response_model=Token,
+)
+@sql_budget(max_statements=1)
+async def refresh_access_token(
+    token_refresh: TokenRefresh,
+    db: DbSession = Depends(get_db_session),
+):
+    """
+    Troca um refresh token por um novo par de tokens, sem senha. O refresh
+    token usado deixa de valer; reutilizá-lo revoga a sessão inteira.
+    """
+    user_service = UserService(sync_session(db))
+    return await run_db(db, user_service.refresh_tokens, token_refresh.refresh_token)
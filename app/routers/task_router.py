@@ -1,14 +1,37 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
-from app.db.database import get_db_session
-from app.models.user import User
-from app.schemas.task import TaskCreate, TaskList, TaskRead, TaskStatus, TaskUpdate
+from app.core.config import settings
+from app.core.etags import etag_matches, task_etag, task_list_etag
+from app.core.response_cache import task_list_cache
+from app.core.responses import model_response
+from app.core.sql_budget import sql_budget
+from app.db.database import DbSession, get_db_session, run_db, sync_session
+from app.schemas.task import (
+    TaskBatchRequest,
+    TaskBatchResponse,
+    TaskCreate,
+    TaskFileFormat,
+    TaskImportResult,
+    TaskList,
+    TaskRead,
+    TaskStatus,
+    TaskUpdate,
+)
+from app.schemas.user import UserPrincipal
 from app.security.auth import get_current_user
+from app.services.task_export import MEDIA_TYPES, stream_tasks_export
+from app.services.task_import import body_too_large, import_task_rows
 from app.services.task_service import TaskService
 
+# Força o cliente a revalidar (If-None-Match) em vez de usar cópia local
+CACHE_CONTROL = "private, no-cache"
+
+# Statement extra de `get_current_user` quando o usuário não está em cache
+AUTH_LOOKUP = 1
+
 router = APIRouter(
     prefix="/api/tasks",
     tags=["Tasks"],
@@ -16,8 +39,8 @@ router = APIRouter(
 )
 
 
-def get_task_service(db: Session = Depends(get_db_session)) -> TaskService:
-    return TaskService(db)
+async def get_task_service(db: DbSession = Depends(get_db_session)) -> TaskService:
+    return TaskService(sync_session(db))
 
 
 @router.post(
@@ -25,35 +48,160 @@ def get_task_service(db: Session = Depends(get_db_session)) -> TaskService:
     response_model=TaskRead,
     status_code=status.HTTP_201_CREATED,
 )
-def create_task(
+@sql_budget(max_statements=AUTH_LOOKUP + 5)
+async def create_task(
     task_create: TaskCreate,
+    db: DbSession = Depends(get_db_session),
     task_service: TaskService = Depends(get_task_service),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """Cria uma tarefa associada ao usuário autenticado."""
-    return task_service.create_task(
+    task = await run_db(
+        db,
+        task_service.create_task,
         task_create=task_create,
         owner_id=current_user.id,
     )
+    return model_response(TaskRead, task, status_code=status.HTTP_201_CREATED)
 
 
 @router.get(
     "/",
     response_model=TaskList,
 )
-def list_tasks(
+@sql_budget(max_statements=AUTH_LOOKUP + 3)
+async def list_tasks(
+    request: Request,
     status_filter: Optional[TaskStatus] = None,
     limit: int = 25,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
+    q: Optional[str] = Query(default=None, max_length=200),
+    db: DbSession = Depends(get_db_session),
     task_service: TaskService = Depends(get_task_service),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
-    """Lista tarefas do usuário autenticado, com filtro por status e paginação."""
-    return task_service.list_tasks(
+    """
+    Lista tarefas do usuário autenticado, com filtro por status e paginação.
+    Use `next_cursor` como `cursor` para paginar por keyset (custo constante
+    em qualquer página). O total é omitido no modo cursor, a menos que
+    `include_total=true`; no modo offset use `include_total=false` para
+    dispensar o COUNT. `q` faz busca textual em título e descrição,
+    ordenada por relevância.
+
+    O ETag deriva da versão das tarefas do usuário: com `If-None-Match`
+    igual, responde 304 sem consultar a página. Páginas por offset sem
+    busca textual são servidas do cache enquanto a versão não muda.
+    """
+    version = await run_db(db, task_service.get_list_version, current_user.id)
+    etag = task_list_etag(
+        current_user.id,
+        version,
+        request.query_params.multi_items(),
+    )
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag, weak=True):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    cache_key = None
+    if cursor is None and q is None:
+        cache_key = (status_filter, limit, offset, include_total)
+        body = task_list_cache.get(current_user.id, version, cache_key)
+        if body is not None:
+            return Response(body, media_type="application/json", headers=headers)
+
+    task_list = await run_db(
+        db,
+        task_service.list_tasks,
         owner_id=current_user.id,
         status_filter=status_filter,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        include_total=include_total,
+        q=q,
+    )
+    response = model_response(TaskList, task_list, headers=headers)
+    if cache_key is not None:
+        task_list_cache.set(current_user.id, version, cache_key, response.body)
+    return response
+
+
+@router.get("/export")
+@sql_budget(max_statements=AUTH_LOOKUP + 1)
+async def export_tasks(
+    export_format: TaskFileFormat = Query(TaskFileFormat.NDJSON, alias="format"),
+    db: DbSession = Depends(get_db_session),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """
+    Exporta todas as tarefas do usuário autenticado em NDJSON ou CSV, em
+    streaming a partir de um cursor no servidor.
+    """
+    return StreamingResponse(
+        stream_tasks_export(db, current_user.id, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="tasks.{export_format.value}"'
+            ),
+        },
+    )
+
+
+@router.post(
+    "/import",
+    response_model=TaskImportResult,
+)
+@sql_budget(check_repeats=False)
+async def import_tasks(
+    request: Request,
+    import_format: TaskFileFormat = Query(TaskFileFormat.NDJSON, alias="format"),
+    db: DbSession = Depends(get_db_session),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """
+    Importa tarefas de um corpo NDJSON ou CSV (cabeçalho com `title` e,
+    opcionalmente, `description`). O corpo é lido em streaming e gravado em
+    lotes de `TASK_IMPORT_BATCH_SIZE`; linhas inválidas são reportadas sem
+    interromper a importação.
+    """
+    content_length = request.headers.get("content-length", "")
+    if (
+        content_length.isdigit()
+        and int(content_length) > settings.TASK_IMPORT_MAX_BYTES
+    ):
+        raise body_too_large()
+
+    return await import_task_rows(
+        db,
+        request.stream(),
+        owner_id=current_user.id,
+        file_format=import_format,
+    )
+
+
+@router.post(
+    "/batch",
+    response_model=TaskBatchResponse,
+)
+@sql_budget(max_statements=AUTH_LOOKUP + 9)
+async def run_task_batch(
+    batch: TaskBatchRequest,
+    db: DbSession = Depends(get_db_session),
+    task_service: TaskService = Depends(get_task_service),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """
+    Aplica várias criações/atualizações/exclusões em uma transação, com um
+    resultado por item (`status` 201/200/204/404/409).
+    """
+    return await run_db(
+        db,
+        task_service.run_batch,
+        operations=batch.operations,
+        owner_id=current_user.id,
     )
 
 
@@ -61,48 +209,80 @@ def list_tasks(
     "/{task_id}",
     response_model=TaskRead,
 )
-def get_task(
+@sql_budget(max_statements=AUTH_LOOKUP + 1)
+async def get_task(
     task_id: int,
+    request: Request,
+    db: DbSession = Depends(get_db_session),
     task_service: TaskService = Depends(get_task_service),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
-    """Obtém detalhes de uma tarefa do usuário autenticado."""
-    return task_service.get_task(
+    """
+    Obtém detalhes de uma tarefa do usuário autenticado. Responde 304 quando
+    `If-None-Match` casa com o ETag atual.
+    """
+    task = await run_db(
+        db,
+        task_service.get_task,
         task_id=task_id,
         owner_id=current_user.id,
     )
+    headers = {"ETag": task_etag(task), "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"], weak=True):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return model_response(TaskRead, task, headers=headers)
 
 
 @router.put(
     "/{task_id}",
     response_model=TaskRead,
 )
-def update_task(
+@sql_budget(max_statements=AUTH_LOOKUP + 5)
+async def update_task(
     task_id: int,
     task_update: TaskUpdate,
+    if_match: Optional[str] = Header(default=None),
+    db: DbSession = Depends(get_db_session),
     task_service: TaskService = Depends(get_task_service),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
-    """Atualiza uma tarefa do usuário autenticado."""
-    return task_service.update_task(
+    """
+    Atualiza uma tarefa do usuário autenticado. Com `If-Match`, responde 412
+    se a tarefa mudou desde o ETag informado.
+    """
+    task = await run_db(
+        db,
+        task_service.update_task,
         task_id=task_id,
         task_update=task_update,
         owner_id=current_user.id,
+        if_match=if_match,
     )
+    return model_response(TaskRead, task, headers={"ETag": task_etag(task)})
 
 
 @router.delete(
     "/{task_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-def delete_task(
+@sql_budget(max_statements=AUTH_LOOKUP + 5)
+async def delete_task(
     task_id: int,
+    if_match: Optional[str] = Header(default=None),
+    db: DbSession = Depends(get_db_session),
     task_service: TaskService = Depends(get_task_service),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
-    """Soft delete de uma tarefa do usuário autenticado."""
-    task_service.delete_task(
+    """
+    Soft delete de uma tarefa do usuário autenticado. Com `If-Match`,
+    responde 412 se a tarefa mudou desde o ETag informado.
+    """
+    await run_db(
+        db,
+        task_service.delete_task,
         task_id=task_id,
         owner_id=current_user.id,
+        if_match=if_match,
     )
     return None
@@ -1,10 +1,10 @@
 from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
 
-from app.db.database import get_db_session
-from app.models.user import User
-from app.schemas.user import UserProfileUpdate, UserRead
-from app.security.auth import get_current_user
+from app.core.config import settings
+from app.core.responses import model_response
+from app.db.database import DbSession, get_db_session, run_db, sync_session
+from app.schemas.user import UserPrincipal, UserProfileUpdate, UserRead
+from app.security.auth import get_current_user, hash_password_async
 from app.services.user_service import UserService
 
 router = APIRouter(
@@ -13,8 +13,8 @@ router = APIRouter(
 )
 
 
-def get_user_service(db: Session = Depends(get_db_session)) -> UserService:
-    return UserService(db)
+async def get_user_service(db: DbSession = Depends(get_db_session)) -> UserService:
+    return UserService(sync_session(db))
 
 
 @router.get(
@@ -22,11 +22,17 @@ def get_user_service(db: Session = Depends(get_db_session)) -> UserService:
     response_model=UserRead,
     status_code=status.HTTP_200_OK,
 )
-def get_me(
-    current_user: User = Depends(get_current_user),
+async def get_me(
+    db: DbSession = Depends(get_db_session),
+    user_service: UserService = Depends(get_user_service),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """Retorna o usuário autenticado."""
-    return current_user
+    if settings.STATELESS_AUTH:
+        # O token não traz o nome, que pode mudar sem revogar o token
+        user = await run_db(db, user_service.get_current_profile, current_user.id)
+        return model_response(UserRead, user)
+    return model_response(UserRead, current_user)
 
 
 @router.put(
@@ -34,26 +40,38 @@ def get_me(
     response_model=UserRead,
     status_code=status.HTTP_200_OK,
 )
-def update_me(
+async def update_me(
     profile_data: UserProfileUpdate,
+    db: DbSession = Depends(get_db_session),
     user_service: UserService = Depends(get_user_service),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """Atualiza o perfil do usuário autenticado."""
-    return user_service.update_own_profile(
-        current_user,
+    hashed_password = None
+    if profile_data.new_password:
+        # O bcrypt roda antes da escrita, sem transação aberta: a leitura do
+        # usuário em get_current_user devolve a conexão ao pool
+        await run_db(db, user_service.db.rollback)
+        hashed_password = await hash_password_async(profile_data.new_password)
+    user = await run_db(
+        db,
+        user_service.update_own_profile,
+        current_user.id,
         profile_data,
+        hashed_password,
     )
+    return model_response(UserRead, user)
 
 
 @router.delete(
     "/me",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-def delete_me(
+async def delete_me(
+    db: DbSession = Depends(get_db_session),
     user_service: UserService = Depends(get_user_service),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """Soft delete da conta do usuário autenticado."""
-    user_service.delete_own_account(current_user)
+    await run_db(db, user_service.delete_own_account, current_user.id)
     return None
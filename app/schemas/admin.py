@@ -6,3 +6,11 @@ class AdminDashboardStats(BaseModel):
     total_tasks: int
     total_tasks_pending: int
     total_tasks_completed: int
+
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+    hit_ratio: float
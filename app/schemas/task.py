@@ -1,7 +1,9 @@
 from enum import Enum
-from typing import List, Optional
+from typing import Annotated, List, Literal, Optional, Union
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.core.config import settings
 
 
 class TaskStatus(str, Enum):
@@ -9,6 +11,11 @@ class TaskStatus(str, Enum):
     COMPLETED = "completed"
 
 
+class TaskFileFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
 class TaskBase(BaseModel):
     title: str
     description: Optional[str] = None
@@ -23,6 +30,14 @@ class TaskUpdate(BaseModel):
     description: Optional[str] = None
     status: Optional[TaskStatus] = None
 
+    @field_validator("title", "status")
+    @classmethod
+    def reject_null(cls, value):
+        # Colunas NOT NULL: omitir mantém o valor atual; null explícito é 422
+        if value is None:
+            raise ValueError("must not be null")
+        return value
+
 
 class TaskRead(TaskBase):
     id: int
@@ -34,4 +49,55 @@ class TaskRead(TaskBase):
 
 class TaskList(BaseModel):
     items: List[TaskRead]
-    total: int
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+class TaskBatchCreate(TaskCreate):
+    op: Literal["create"]
+
+
+class TaskBatchUpdate(TaskUpdate):
+    op: Literal["update"]
+    id: int
+
+
+class TaskBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+
+TaskBatchOperation = Annotated[
+    Union[TaskBatchCreate, TaskBatchUpdate, TaskBatchDelete],
+    Field(discriminator="op"),
+]
+
+
+class TaskBatchRequest(BaseModel):
+    operations: List[TaskBatchOperation] = Field(
+        min_length=1,
+        max_length=settings.TASK_BATCH_MAX_OPERATIONS,
+    )
+
+
+class TaskBatchResult(BaseModel):
+    index: int
+    op: str
+    status: int
+    task: Optional[TaskRead] = None
+    detail: Optional[str] = None
+
+
+class TaskBatchResponse(BaseModel):
+    results: List[TaskBatchResult]
+
+
+class TaskImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class TaskImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[TaskImportError]
@@ -5,3 +5,7 @@ class Token(BaseModel):
     access_token: str
     refresh_token: str
     token_type: str = "bearer"
+
+
+class TokenRefresh(BaseModel):
+    refresh_token: str
@@ -25,6 +25,19 @@ class UserRead(UserBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UserPrincipal(BaseModel):
+    """Snapshot imutável do usuário autenticado, seguro para cache."""
+
+    id: int
+    email: str
+    name: Optional[str] = None
+    role: UserRole
+    # Comparada com o claim `ver` do token (revogação de tokens)
+    token_version: int = 0
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
 class UserProfileUpdate(BaseModel):
     name: Optional[str] = None
     new_password: Optional[str] = Field(
@@ -5,26 +5,56 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from pydantic import ValidationError
 
 from app.core.config import settings
-from app.db.database import get_db_session
-from app.models.user import User
+from app.core.metrics import PASSWORD_HASH_SECONDS
+from app.db.database import DbSession, get_db_session, run_db, sync_session
 from app.repositories.user_repository import UserRepository
+from app.schemas.user import UserPrincipal
+from app.security.hashing import hashing_executor
+from app.security.principal_cache import principal_cache
+from app.security.token_versions import token_versions
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Claim `type`: um refresh token não vale como token de acesso e vice-versa
+TOKEN_TYPE_ACCESS = "access"
+TOKEN_TYPE_REFRESH = "refresh"
+
+
+def _timed_hash(password: str) -> str:
+    with PASSWORD_HASH_SECONDS.labels("hash").time():
+        return pwd_context.hash(password)
+
+
+def _timed_verify(plain_password: str, hashed_password: str) -> bool:
+    with PASSWORD_HASH_SECONDS.labels("verify").time():
+        return pwd_context.verify(plain_password, hashed_password)
+
 
 def hash_password(password: str) -> str:
-    """Gera o hash da senha em texto puro."""
-    return pwd_context.hash(password)
+    """Gera o hash da senha em texto puro, no pool de hashing."""
+    return hashing_executor.run(_timed_hash, password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verifica se a senha em texto puro corresponde ao hash armazenado."""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verifica a senha contra o hash armazenado, no pool de hashing."""
+    return hashing_executor.run(_timed_verify, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """`hash_password` para rotas async, sem ocupar o threadpool."""
+    return await hashing_executor.run_async(_timed_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """`verify_password` para rotas async, sem ocupar o threadpool."""
+    return await hashing_executor.run_async(
+        _timed_verify, plain_password, hashed_password
+    )
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -38,7 +68,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
 
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "type": TOKEN_TYPE_ACCESS})
 
     return jwt.encode(
         to_encode,
@@ -48,13 +78,16 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 def create_refresh_token(data: dict) -> str:
-    """Cria um JWT de refresh."""
+    """
+    Cria um JWT de refresh. `data` leva a família (`fam`) e a geração
+    (`gen`) conferidas na rotação.
+    """
     expire = datetime.now(timezone.utc) + timedelta(
         days=settings.REFRESH_TOKEN_EXPIRE_DAYS
     )
 
     to_encode = data.copy()
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "type": TOKEN_TYPE_REFRESH})
 
     return jwt.encode(
         to_encode,
@@ -75,11 +108,29 @@ def decode_token(token: str) -> Optional[dict]:
         return None
 
 
-def get_current_user(
+def _principal_from_claims(user_id: int, payload: dict) -> Optional[UserPrincipal]:
+    """Usuário a partir dos claims do token; None se faltar algum."""
+    try:
+        return UserPrincipal(
+            id=user_id,
+            email=payload["email"],
+            role=payload["role"],
+            token_version=payload["ver"],
+        )
+    except (KeyError, ValidationError):
+        return None
+
+
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db_session),
-) -> User:
-    """Obtém o usuário autenticado a partir do token Bearer."""
+    db: DbSession = Depends(get_db_session),
+) -> UserPrincipal:
+    """
+    Obtém o usuário autenticado a partir do token Bearer. Com
+    STATELESS_AUTH, usa os claims do token se `ver` estiver em dia com
+    `token_versions`; senão consulta o `principal_cache` e depois o banco,
+    e o `ver` do token tem de ser igual ao `token_version` do usuário.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -87,7 +138,7 @@ def get_current_user(
     )
 
     payload = decode_token(token)
-    if payload is None:
+    if payload is None or payload.get("type") != TOKEN_TYPE_ACCESS:
         raise credentials_exception
 
     user_id_str = payload.get("sub")
@@ -99,10 +150,36 @@ def get_current_user(
     except ValueError:
         raise credentials_exception
 
-    user_repo = UserRepository(db)
-    user = user_repo.get_by_id(user_id)
-
-    if user is None:
+    version = payload.get("ver")
+    if (
+        settings.STATELESS_AUTH
+        and isinstance(version, int)
+        and token_versions.is_fresh()
+    ):
+        if not token_versions.is_current(user_id, version):
+            raise credentials_exception
+        principal = _principal_from_claims(user_id, payload)
+        if principal is not None:
+            return principal
+
+    principal = principal_cache.get(user_id)
+    if (
+        principal is not None
+        and isinstance(version, int)
+        and version > principal.token_version
+    ):
+        # Entrada anterior a uma revogação feita por outro worker: relê
+        principal = None
+
+    if principal is None:
+        user_repo = UserRepository(sync_session(db))
+        user = await run_db(db, user_repo.get_by_id, user_id)
+        if user is None:
+            raise credentials_exception
+        principal = UserPrincipal.model_validate(user)
+        principal_cache.set(principal)
+
+    # Tokens sem `ver` são anteriores à revogação por versão e expiram sozinhos
+    if isinstance(version, int) and version != principal.token_version:
         raise credentials_exception
-
-    return user
+    return principal
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from fastapi import HTTPException, status
+from sqlalchemy.util import await_only
+from sqlalchemy.util.concurrency import in_greenlet
+
+from app.core.config import settings
+from app.core.metrics import PASSWORD_HASH_QUEUE_DEPTH
+
+T = TypeVar("T")
+
+
+class HashingExecutor:
+    """
+    Executa o bcrypt em um pool de threads dedicado e limitado.
+
+    O bcrypt libera o GIL durante o hash, então as threads do pool usam CPU
+    de verdade sem travar o restante da API. Quando há mais de
+    `max_workers + max_queue` hashes pendentes, novos pedidos são
+    rejeitados imediatamente com 503 em vez de crescer a fila sem limite.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hash",
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Hashes em execução ou aguardando na fila."""
+        return self._pending
+
+    def submit(self, fn: Callable[..., T], *args: Any) -> "Future[T]":
+        if not self._slots.acquire(blocking=False):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication is busy, try again shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        with self._lock:
+            self._pending += 1
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    async def run_async(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Executa `fn` no pool e aguarda no event loop. É o caminho das rotas:
+        nenhuma thread do threadpool do Starlette fica presa esperando o
+        hash, mesmo com o pool de hashing e a fila cheios.
+        """
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Executa `fn` no pool e aguarda o resultado, para código síncrono (ex.:
+        criação do admin, seed). Dentro de `run_db` no modo async (greenlet
+        do SQLAlchemy) a espera devolve o controle ao event loop; em threads
+        comuns bloqueia a thread chamadora.
+        """
+        future = self.submit(fn, *args)
+        if in_greenlet():
+            return await_only(asyncio.wrap_future(future))
+        return future.result()
+
+
+hashing_executor = HashingExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+PASSWORD_HASH_QUEUE_DEPTH.set_function(lambda: hashing_executor.pending)
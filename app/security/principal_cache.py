@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Protocol, Tuple
+
+from app.core.config import settings
+from app.schemas.admin import CacheStats
+from app.schemas.user import UserPrincipal
+
+
+class PrincipalCacheBackend(Protocol):
+    """
+    Armazenamento do cache de usuários autenticados. Um backend compartilhado
+    (ex.: Redis) só precisa implementar estes métodos.
+    """
+
+    max_size: int
+
+    def get(self, user_id: int) -> Optional[UserPrincipal]: ...
+
+    def set(self, user_id: int, principal: UserPrincipal) -> None: ...
+
+    def delete(self, user_id: int) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def size(self) -> int: ...
+
+
+class InMemoryPrincipalCacheBackend:
+    """
+    LRU limitado por `max_size`, com expiração por `ttl_seconds`.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, Tuple[float, UserPrincipal]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[UserPrincipal]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+
+            expires_at, principal = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+
+            self._entries.move_to_end(user_id)
+            return principal
+
+    def set(self, user_id: int, principal: UserPrincipal) -> None:
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class PrincipalCache:
+    """
+    Cache dos usuários resolvidos por `get_current_user`, com contadores de
+    hit/miss para dimensionamento.
+    """
+
+    def __init__(self, backend: PrincipalCacheBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Optional[UserPrincipal]:
+        if not self.enabled:
+            return None
+
+        principal = self.backend.get(user_id)
+        if principal is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return principal
+
+    def set(self, principal: UserPrincipal) -> None:
+        if self.enabled:
+            self.backend.set(principal.id, principal)
+
+    def invalidate(self, user_id: int) -> None:
+        self.backend.delete(user_id)
+
+    def clear(self) -> None:
+        self.backend.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> CacheStats:
+        lookups = self.hits + self.misses
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            size=self.backend.size(),
+            max_size=self.backend.max_size,
+            hit_ratio=self.hits / lookups if lookups else 0.0,
+        )
+
+
+principal_cache = PrincipalCache(
+    InMemoryPrincipalCacheBackend(
+        max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+        ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    ),
+    enabled=settings.PRINCIPAL_CACHE_ENABLED,
+)
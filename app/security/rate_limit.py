@@ -0,0 +1,158 @@
+"""
+Rate limiting das rotas de autenticação (token bucket por IP e por e-mail).
+
+Cada chave tem um balde com `capacity` fichas, reabastecido continuamente
+em `capacity / per_seconds` fichas por segundo; cada requisição gasta uma.
+Sem ficha, a resposta é 429 com `Retry-After`, antes de qualquer consulta
+ao banco ou hash de senha.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Protocol, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+from app.core.metrics import RATE_LIMITED_REQUESTS
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    capacity: int
+    per_seconds: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.per_seconds
+
+
+def parse_rate_limit(value: str) -> Optional[RateLimit]:
+    """`"N/S"` (N requisições a cada S segundos); vazio desliga o limite."""
+    if not value.strip():
+        return None
+    capacity, _, per_seconds = value.partition("/")
+    limit = RateLimit(int(capacity), float(per_seconds))
+    if limit.capacity < 1 or limit.per_seconds <= 0:
+        raise ValueError(f"Invalid rate limit {value!r}")
+    return limit
+
+
+class TokenBucketBackend(Protocol):
+    """
+    Armazenamento dos baldes. A versão em memória vale por worker; um
+    backend compartilhado (ex.: Redis com um script atômico) só precisa
+    implementar estes métodos.
+    """
+
+    def take(self, key: str, limit: RateLimit) -> float: ...
+
+    def clear(self) -> None: ...
+
+
+class InMemoryTokenBucketBackend:
+    """Baldes por chave em um LRU limitado a `max_keys`."""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, limit: RateLimit) -> float:
+        """Gasta uma ficha; devolve 0 ou os segundos até a próxima ficha."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (limit.capacity, now))
+            tokens = min(
+                limit.capacity,
+                tokens + (now - updated_at) * limit.refill_per_second,
+            )
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / limit.refill_per_second
+
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+def client_ip(request: Request, forwarded_hops: int = 0) -> str:
+    """
+    IP do cliente. Atrás de `forwarded_hops` proxies confiáveis, usa a
+    entrada de X-Forwarded-For que o mais externo deles acrescentou.
+    """
+    if forwarded_hops > 0:
+        forwarded = [
+            ip.strip()
+            for ip in request.headers.get("x-forwarded-for", "").split(",")
+            if ip.strip()
+        ]
+        if len(forwarded) >= forwarded_hops:
+            return forwarded[-forwarded_hops]
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimiter:
+    """Limites por rota, cada um com um balde por IP e outro por e-mail."""
+
+    def __init__(
+        self,
+        backend: TokenBucketBackend,
+        limits: Dict[str, Dict[str, Optional[RateLimit]]],
+        enabled: bool = True,
+        forwarded_hops: int = 0,
+    ):
+        self.backend = backend
+        self.limits = limits
+        self.enabled = enabled
+        self.forwarded_hops = forwarded_hops
+
+    def check(self, route: str, request: Request, email: Optional[str] = None) -> None:
+        if not self.enabled:
+            return
+
+        keys = {"ip": client_ip(request, self.forwarded_hops)}
+        if email:
+            keys["email"] = email.strip().lower()
+
+        route_limits = self.limits.get(route, {})
+        for kind, value in keys.items():
+            limit = route_limits.get(kind)
+            if limit is None:
+                continue
+            wait = self.backend.take(f"{route}:{kind}:{value}", limit)
+            if wait > 0:
+                RATE_LIMITED_REQUESTS.labels(route, kind).inc()
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many requests, try again later",
+                    headers={"Retry-After": str(max(1, math.ceil(wait)))},
+                )
+
+
+rate_limiter = RateLimiter(
+    InMemoryTokenBucketBackend(max_keys=settings.RATE_LIMIT_MAX_KEYS),
+    limits={
+        "login": {
+            "ip": parse_rate_limit(settings.RATE_LIMIT_LOGIN_PER_IP),
+            "email": parse_rate_limit(settings.RATE_LIMIT_LOGIN_PER_EMAIL),
+        },
+        "register": {
+            "ip": parse_rate_limit(settings.RATE_LIMIT_REGISTER_PER_IP),
+            "email": parse_rate_limit(settings.RATE_LIMIT_REGISTER_PER_EMAIL),
+        },
+    },
+    enabled=settings.RATE_LIMIT_ENABLED,
+    forwarded_hops=settings.RATE_LIMIT_FORWARDED_HOPS,
+)
@@ -0,0 +1,112 @@
+"""
+Versões de token das revogações recentes, para validar tokens de acesso sem
+consultar o banco (`STATELESS_AUTH`).
+
+Um token com `ver` menor que o `token_version` do usuário foi emitido antes
+de uma revogação. Só importam as revogações mais novas que a vida de um
+token de acesso (os tokens anteriores já expiraram), então o mapa guarda
+apenas essas. Ele é recarregado a cada TOKEN_VERSION_REFRESH_SECONDS e
+recebe na hora as revogações feitas pelo próprio worker; nos demais, o
+token revogado deixa de valer na recarga seguinte.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.repositories.user_repository import UserRepository
+
+logger = logging.getLogger(__name__)
+
+# Folga para diferença de relógio entre a API e o banco
+CLOCK_SKEW_SECONDS = 60
+
+
+class TokenVersionMap:
+    """
+    `user_id -> token_version` dos usuários revogados recentemente. Sem
+    recarga há mais de `max_staleness_seconds`, o mapa deixa de ser usado e
+    a validação volta a consultar o banco.
+    """
+
+    def __init__(self, window_seconds: float, max_staleness_seconds: float):
+        self.window_seconds = window_seconds
+        self.max_staleness_seconds = max_staleness_seconds
+        # Versão e instante (monotonic) em que foi vista
+        self._versions: Dict[int, Tuple[int, float]] = {}
+        self._refreshed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def is_fresh(self) -> bool:
+        refreshed_at = self._refreshed_at
+        return (
+            refreshed_at is not None
+            and time.monotonic() - refreshed_at <= self.max_staleness_seconds
+        )
+
+    def is_current(self, user_id: int, version: int) -> bool:
+        entry = self._versions.get(user_id)
+        return entry is None or version >= entry[0]
+
+    def push(self, user_id: int, version: int) -> None:
+        """Registra uma revogação feita por este worker."""
+        with self._lock:
+            current = self._versions.get(user_id)
+            if current is None or version > current[0]:
+                self._versions[user_id] = (version, time.monotonic())
+
+    def replace(self, rows: Iterable[Tuple[int, int]], started_at: float) -> None:
+        """
+        Troca o mapa pelo resultado de uma recarga iniciada em `started_at`,
+        mantendo as versões recebidas por `push` durante a consulta.
+        """
+        versions = {user_id: (version, started_at) for user_id, version in rows}
+        with self._lock:
+            for user_id, (version, seen_at) in self._versions.items():
+                loaded = versions.get(user_id)
+                if seen_at >= started_at and (loaded is None or version > loaded[0]):
+                    versions[user_id] = (version, seen_at)
+            self._versions = versions
+            self._refreshed_at = started_at
+
+    def clear(self) -> None:
+        with self._lock:
+            self._versions = {}
+            self._refreshed_at = None
+
+    def size(self) -> int:
+        return len(self._versions)
+
+
+token_versions = TokenVersionMap(
+    window_seconds=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60 + CLOCK_SKEW_SECONDS,
+    max_staleness_seconds=2 * settings.TOKEN_VERSION_REFRESH_SECONDS,
+)
+
+
+def refresh_token_versions() -> int:
+    """Recarrega `token_versions` com uma consulta; devolve o tamanho."""
+    started_at = time.monotonic()
+    db = SessionLocal()
+    try:
+        rows = UserRepository(db).recent_token_versions(token_versions.window_seconds)
+    finally:
+        db.close()
+    token_versions.replace(rows, started_at)
+    return len(rows)
+
+
+async def keep_token_versions_fresh() -> None:
+    """Recarga periódica, iniciada no lifespan quando STATELESS_AUTH=true."""
+    while True:
+        try:
+            await run_in_threadpool(refresh_token_versions)
+        except Exception:
+            logger.exception("Token version refresh failed")
+        await asyncio.sleep(settings.TOKEN_VERSION_REFRESH_SECONDS)
@@ -0,0 +1,278 @@
+"""
+Servidor de produção: importa a app uma única vez e cria SERVER_WORKERS
+workers uvicorn por fork, todos aceitando no mesmo socket.
+
+    python -m app.server [--host HOST] [--port PORT] [--workers N]
+
+- Conexões: com DB_MAX_CONNECTIONS, o pool de cada worker é reduzido antes
+  de os engines serem criados, para que a soma caiba no teto do banco.
+- Reciclagem: um worker sai depois de SERVER_MAX_REQUESTS requisições
+  (mais um jitter, para não reciclarem todos juntos) ou acima de
+  SERVER_MAX_MEMORY_MB de RSS, e o processo principal cria outro no lugar.
+- Desligamento: no SIGTERM/SIGINT os workers param de aceitar conexões e
+  têm SERVER_GRACEFUL_TIMEOUT_SECONDS para concluir as requisições em
+  andamento; quem passar do prazo (mais a folga do lifespan) leva SIGKILL.
+"""
+
+import argparse
+import logging
+import os
+import random
+import resource
+import signal
+import socket
+import sys
+import time
+from typing import Dict, Optional
+
+import uvicorn
+
+from app.core.config import settings
+from app.db.pool import worker_pool_limits
+
+logger = logging.getLogger(__name__)
+
+# Código de saída do worker cujo startup (lifespan) falhou: recriá-lo só
+# repetiria o erro, então o servidor inteiro para
+WORKER_BOOT_ERROR = 3
+
+# Tempo extra, além do graceful timeout, para o shutdown do lifespan
+SHUTDOWN_MARGIN_SECONDS = 5.0
+
+# Worker que morre antes disso é recriado com essa espera (evita loop de fork)
+MIN_WORKER_LIFETIME_SECONDS = 1.0
+
+POLL_SECONDS = 0.2
+
+# `on_tick` roda a cada 0,1 s; a memória é medida a cada segundo
+MEMORY_CHECK_TICKS = 10
+
+
+def rss_megabytes() -> float:
+    """RSS atual do processo (Linux); nos demais sistemas, o pico."""
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss vem em bytes no macOS e em KB no Linux
+        return peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+class WorkerServer(uvicorn.Server):
+    """`uvicorn.Server` que também encerra ao passar do limite de memória."""
+
+    def __init__(self, config: uvicorn.Config, max_memory_mb: int = 0):
+        super().__init__(config)
+        self.max_memory_mb = max_memory_mb
+
+    async def on_tick(self, counter: int) -> bool:
+        if await super().on_tick(counter):
+            return True
+        if self.max_memory_mb and counter % MEMORY_CHECK_TICKS == 0:
+            rss = rss_megabytes()
+            if rss > self.max_memory_mb:
+                logger.warning(
+                    "Worker %d: RSS %.0f MB above %d MB, recycling",
+                    os.getpid(),
+                    rss,
+                    self.max_memory_mb,
+                )
+                return True
+        return False
+
+
+class Supervisor:
+    """Processo principal: mantém os workers vivos e coordena o desligamento."""
+
+    def __init__(
+        self,
+        config: uvicorn.Config,
+        workers: int,
+        max_requests: int = 0,
+        max_requests_jitter: int = 0,
+        max_memory_mb: int = 0,
+        graceful_timeout: float = 30.0,
+    ):
+        self.config = config
+        self.workers = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.max_memory_mb = max_memory_mb
+        self.graceful_timeout = graceful_timeout
+        # pid -> instante (monotonic) do fork
+        self.children: Dict[int, float] = {}
+        self.stopping = False
+        self.exit_code = 0
+
+    def run(self, sock: socket.socket) -> int:
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        logger.info("Supervisor %d starting %d workers", os.getpid(), self.workers)
+        try:
+            while not self.stopping:
+                self._reap()
+                while len(self.children) < self.workers and not self.stopping:
+                    self._spawn(sock)
+                time.sleep(POLL_SECONDS)
+        finally:
+            self._stop()
+        return self.exit_code
+
+    def _handle_stop(self, sig: int, frame) -> None:
+        self.stopping = True
+
+    def _spawn(self, sock: socket.socket) -> None:
+        limit_max_requests = None
+        if self.max_requests:
+            limit_max_requests = self.max_requests + random.randint(
+                0, self.max_requests_jitter
+            )
+
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = self._serve(sock, limit_max_requests)
+            except BaseException:
+                logger.exception("Worker %d crashed", os.getpid())
+            finally:
+                os._exit(code)
+
+        self.children[pid] = time.monotonic()
+
+    def _serve(self, sock: socket.socket, limit_max_requests: Optional[int]) -> int:
+        """Corpo do processo filho."""
+        from app.db.database import reset_engines_after_fork
+
+        # O uvicorn instala os próprios handlers e, ao restaurar estes,
+        # reenvia o sinal recebido; ignorado, o worker sai com código 0
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        reset_engines_after_fork()
+
+        self.config.limit_max_requests = limit_max_requests
+        server = WorkerServer(self.config, self.max_memory_mb)
+        server.run(sockets=[sock])
+        return 0 if server.started else WORKER_BOOT_ERROR
+
+    def _reap(self) -> None:
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.children.clear()
+                return
+            if pid == 0:
+                return
+
+            started_at = self.children.pop(pid, None)
+            if started_at is None or self.stopping:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            if code == WORKER_BOOT_ERROR:
+                logger.error("Worker %d failed to boot, shutting down", pid)
+                self.stopping = True
+                self.exit_code = 1
+                return
+            logger.info("Worker %d exited (%d), starting a new one", pid, code)
+            if time.monotonic() - started_at < MIN_WORKER_LIFETIME_SECONDS:
+                time.sleep(MIN_WORKER_LIFETIME_SECONDS)
+
+    def _stop(self) -> None:
+        for pid in self.children:
+            self._signal(pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + self.graceful_timeout + SHUTDOWN_MARGIN_SECONDS
+        while self.children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(POLL_SECONDS / 2)
+
+        for pid in list(self.children):
+            logger.warning("Worker %d did not drain in time, killing it", pid)
+            self._signal(pid, signal.SIGKILL)
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.children.clear()
+
+    @staticmethod
+    def _signal(pid: int, sig: int) -> None:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
+
+def size_worker_pools(workers: int) -> None:
+    """Ajusta `settings` para a soma dos pools caber em DB_MAX_CONNECTIONS."""
+    if not settings.DB_MAX_CONNECTIONS or settings.DB_NULL_POOL:
+        return
+
+    # Com DB_ASYNC, o worker tem um engine sync e um async em cada banco
+    engines_per_database = 2 if settings.DB_ASYNC else 1
+    pool_size, max_overflow = worker_pool_limits(
+        settings.DB_MAX_CONNECTIONS, workers, engines_per_database
+    )
+    settings.DB_POOL_SIZE = pool_size
+    settings.DB_MAX_OVERFLOW = max_overflow
+    logger.info(
+        "Pool per engine: size %d, overflow %d (%d workers, cap %d)",
+        pool_size,
+        max_overflow,
+        workers,
+        settings.DB_MAX_CONNECTIONS,
+    )
+
+
+def serve(host: str, port: int, workers: int) -> int:
+    if workers > 1:
+        logger.warning(
+            "Running %d workers: metrics, rate limits, read-your-writes and the "
+            "principal cache are per worker",
+            workers,
+        )
+    size_worker_pools(workers)
+
+    # Só depois do ajuste: os engines são criados na importação da app
+    from app.main import app
+
+    config = uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        lifespan="on",
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+    )
+    sock = config.bind_socket()
+    supervisor = Supervisor(
+        config,
+        workers=workers,
+        max_requests=settings.SERVER_MAX_REQUESTS,
+        max_requests_jitter=settings.SERVER_MAX_REQUESTS_JITTER,
+        max_memory_mb=settings.SERVER_MAX_MEMORY_MB,
+        graceful_timeout=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+    )
+    try:
+        return supervisor.run(sock)
+    finally:
+        sock.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    sys.exit(
+        serve(
+            host=args.host or settings.SERVER_HOST,
+            port=args.port or settings.SERVER_PORT,
+            workers=args.workers or settings.SERVER_WORKERS,
+        )
+    )
@@ -1,7 +1,11 @@
 from sqlalchemy.orm import Session
 
-from app.repositories.task_repository import TaskRepository
-from app.repositories.user_repository import UserRepository
+from app.repositories.stats_repository import (
+    TASKS_ACTIVE,
+    USERS_ACTIVE,
+    StatsRepository,
+    tasks_by_status,
+)
 from app.schemas.admin import AdminDashboardStats
 from app.schemas.task import TaskStatus
 
@@ -9,18 +13,15 @@ from app.schemas.task import TaskStatus
 class AdminService:
     def __init__(self, db: Session):
         self.db = db
-        self.user_repo = UserRepository(db)
-        self.task_repo = TaskRepository(db)
+        self.stats_repo = StatsRepository(db)
 
     def get_dashboard_stats(self) -> AdminDashboardStats:
-        total_users = self.user_repo.count_active()
-        total_tasks = self.task_repo.count_all_active()
-        total_tasks_pending = self.task_repo.count_by_status(TaskStatus.PENDING)
-        total_tasks_completed = self.task_repo.count_by_status(TaskStatus.COMPLETED)
+        """Lê os contadores mantidos em `stats_counters` numa única consulta."""
+        totals = self.stats_repo.totals()
 
         return AdminDashboardStats(
-            total_users=total_users,
-            total_tasks=total_tasks,
-            total_tasks_pending=total_tasks_pending,
-            total_tasks_completed=total_tasks_completed,
+            total_users=totals.get(USERS_ACTIVE, 0),
+            total_tasks=totals.get(TASKS_ACTIVE, 0),
+            total_tasks_pending=totals.get(tasks_by_status(TaskStatus.PENDING), 0),
+            total_tasks_completed=totals.get(tasks_by_status(TaskStatus.COMPLETED), 0),
         )
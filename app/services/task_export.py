@@ -0,0 +1,112 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Callable, Iterator, Sequence, Union
+
+from sqlalchemy import Row, Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import DbSession, sync_session
+from app.repositories.task_repository import TaskRepository
+from app.schemas.task import TaskFileFormat
+
+EXPORT_COLUMNS = ["id", "title", "description", "status", "created_at", "updated_at"]
+
+
+MEDIA_TYPES = {
+    TaskFileFormat.NDJSON: "application/x-ndjson",
+    TaskFileFormat.CSV: "text/csv",
+}
+
+
+def _row_values(row: Row) -> list:
+    return [
+        value.isoformat() if hasattr(value, "isoformat") else value for value in row
+    ]
+
+
+def encode_ndjson(rows: Sequence[Row]) -> str:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, _row_values(row))), ensure_ascii=False)
+        + "\n"
+        for row in rows
+    )
+
+
+def encode_csv(rows: Sequence[Row]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(_row_values(row) for row in rows)
+    return buffer.getvalue()
+
+
+def _csv_header() -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(EXPORT_COLUMNS)
+    return buffer.getvalue()
+
+
+def _sync_chunks(
+    db: Session,
+    stmt: Select,
+    encode: Callable[[Sequence[Row]], str],
+) -> Iterator[str]:
+    result = db.execute(stmt)
+    try:
+        for partition in result.partitions():
+            yield encode(partition)
+    finally:
+        result.close()
+
+
+async def _async_chunks(
+    db: AsyncSession,
+    stmt: Select,
+    encode: Callable[[Sequence[Row]], str],
+) -> AsyncIterator[str]:
+    result = await db.stream(stmt)
+    try:
+        async for partition in result.partitions():
+            yield encode(partition)
+    finally:
+        await result.close()
+
+
+def stream_tasks_export(
+    db: DbSession,
+    owner_id: int,
+    export_format: TaskFileFormat,
+) -> Union[Iterator[str], AsyncIterator[str]]:
+    """
+    Gera a exportação em blocos de `TASK_EXPORT_BATCH_SIZE` linhas lidas de
+    um cursor no servidor: a memória não cresce com o número de tarefas.
+    """
+    stmt = TaskRepository(sync_session(db)).export_query(
+        owner_id,
+        batch_size=settings.TASK_EXPORT_BATCH_SIZE,
+    )
+    encode = encode_ndjson if export_format == TaskFileFormat.NDJSON else encode_csv
+
+    if isinstance(db, AsyncSession):
+        chunks = _async_chunks(db, stmt, encode)
+        if export_format == TaskFileFormat.CSV:
+            return _async_prepend(_csv_header(), chunks)
+        return chunks
+
+    chunks = _sync_chunks(db, stmt, encode)
+    if export_format == TaskFileFormat.CSV:
+        return _sync_prepend(_csv_header(), chunks)
+    return chunks
+
+
+def _sync_prepend(first: str, chunks: Iterator[str]) -> Iterator[str]:
+    yield first
+    yield from chunks
+
+
+async def _async_prepend(first: str, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    yield first
+    async for chunk in chunks:
+        yield chunk
@@ -0,0 +1,269 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterator, List, Optional, Sequence, Tuple, Union
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.db.database import DbSession, run_db, sync_session
+from app.schemas.task import (
+    TaskCreate,
+    TaskFileFormat,
+    TaskImportError,
+    TaskImportResult,
+)
+from app.services.task_service import TaskService
+
+ParsedRow = Tuple[int, Union[TaskCreate, str]]
+
+# Linha do corpo; None quando passou de TASK_IMPORT_MAX_LINE_LENGTH
+RawLine = Optional[str]
+
+LINE_TOO_LONG = "Line too long"
+
+
+def _validation_detail(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def _validate(data: object) -> Union[TaskCreate, str]:
+    try:
+        return TaskCreate.model_validate(data)
+    except ValidationError as exc:
+        return _validation_detail(exc)
+
+
+def body_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"Import body larger than {settings.TASK_IMPORT_MAX_BYTES} bytes",
+    )
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[RawLine]:
+    """
+    Decodifica o corpo aos poucos e produz linhas completas (com `\\n`).
+    Uma linha acima de TASK_IMPORT_MAX_LINE_LENGTH vira None e é descartada
+    sem ser acumulada; acima de TASK_IMPORT_MAX_BYTES no total, 413.
+    """
+    max_length = settings.TASK_IMPORT_MAX_LINE_LENGTH
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    # Descartando o resto de uma linha longa demais
+    overflow = False
+    received = 0
+    async for chunk in chunks:
+        received += len(chunk)
+        if received > settings.TASK_IMPORT_MAX_BYTES:
+            raise body_too_large()
+
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            if overflow or len(line) >= max_length:
+                overflow = False
+                yield None
+            else:
+                yield line + "\n"
+        if len(pending) >= max_length:
+            overflow = True
+            pending = ""
+
+    pending += decoder.decode(b"", final=True)
+    if overflow or len(pending) >= max_length:
+        yield None
+    elif pending:
+        yield pending
+
+
+class _NdjsonParser:
+    """Um objeto JSON por linha."""
+
+    def __init__(self):
+        self.line_number = 0
+
+    def feed(self, lines: Sequence[RawLine]) -> List[ParsedRow]:
+        rows: List[ParsedRow] = []
+        for line in lines:
+            self.line_number += 1
+            if line is None:
+                rows.append((self.line_number, LINE_TOO_LONG))
+                continue
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError:
+                rows.append((self.line_number, "Invalid JSON"))
+                continue
+            if not isinstance(data, dict):
+                rows.append((self.line_number, "Expected a JSON object"))
+                continue
+            rows.append((self.line_number, _validate(data)))
+        return rows
+
+    def finish(self) -> List[ParsedRow]:
+        return []
+
+
+def _ends_in_quotes(line: str, in_quotes: bool) -> bool:
+    """
+    Se o registro continua dentro de um campo entre aspas ao fim de `line`.
+    Como no módulo `csv`, aspas só abrem um campo no início dele: uma aspa
+    solta no meio de um campo sem aspas não engole as linhas seguintes.
+    """
+    if not in_quotes and '"' not in line:
+        return False
+
+    field_start = not in_quotes
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if in_quotes:
+            if char == '"':
+                if line[i + 1 : i + 2] == '"':
+                    i += 2
+                    continue
+                in_quotes = False
+        elif char == '"' and field_start:
+            in_quotes = True
+        field_start = not in_quotes and char in ",\r\n"
+        i += 1
+    return in_quotes
+
+
+class _CsvParser:
+    """
+    Cabeçalho na primeira linha. Um registro só continua na linha seguinte
+    dentro de um campo entre aspas, e nunca passa de
+    TASK_IMPORT_MAX_LINE_LENGTH caracteres.
+    """
+
+    def __init__(self):
+        self.line_number = 0
+        self.header: Optional[List[str]] = None
+        self.record = ""
+        self.record_line = 0
+        self.in_quotes = False
+
+    def feed(self, lines: Sequence[RawLine]) -> List[ParsedRow]:
+        rows: List[ParsedRow] = []
+        for line in lines:
+            self.line_number += 1
+            if line is None:
+                rows.append((self.record_line or self.line_number, LINE_TOO_LONG))
+                self._reset()
+                continue
+            if not self.record:
+                if not line.strip():
+                    continue
+                self.record_line = self.line_number
+
+            self.record += line
+            self.in_quotes = _ends_in_quotes(line, self.in_quotes)
+            if len(self.record) >= settings.TASK_IMPORT_MAX_LINE_LENGTH:
+                rows.append((self.record_line, LINE_TOO_LONG))
+                self._reset()
+            elif not self.in_quotes:
+                row = self._parse_record()
+                if row is not None:
+                    rows.append(row)
+                self._reset()
+        return rows
+
+    def finish(self) -> List[ParsedRow]:
+        if self.record:
+            return [(self.record_line, "Unterminated quoted field")]
+        return []
+
+    def _reset(self) -> None:
+        self.record = ""
+        self.record_line = 0
+        self.in_quotes = False
+
+    def _parse_record(self) -> Optional[ParsedRow]:
+        try:
+            values = next(
+                csv.reader(self.record.splitlines(keepends=True), strict=True), []
+            )
+        except csv.Error:
+            return self.record_line, "Malformed quoted field"
+
+        if self.header is None:
+            self.header = [column.strip() for column in values]
+            return None
+        if len(values) != len(self.header):
+            return (
+                self.record_line,
+                f"Expected {len(self.header)} columns, got {len(values)}",
+            )
+        # CSV não representa null: campo vazio vira None
+        data = {column: value or None for column, value in zip(self.header, values)}
+        return self.record_line, _validate(data)
+
+
+async def parse_import_rows(
+    chunks: AsyncIterator[bytes],
+    file_format: TaskFileFormat,
+) -> AsyncIterator[ParsedRow]:
+    """
+    Produz `(linha, TaskCreate)` para cada linha válida e `(linha, erro)`
+    para as inválidas, conforme o corpo chega. O event loop só separa as
+    linhas; decodificação de JSON/CSV e validação rodam no threadpool, em
+    blocos de TASK_IMPORT_BATCH_SIZE linhas.
+    """
+    parser = _CsvParser() if file_format == TaskFileFormat.CSV else _NdjsonParser()
+    block: List[RawLine] = []
+    async for line in _iter_lines(chunks):
+        block.append(line)
+        if len(block) >= settings.TASK_IMPORT_BATCH_SIZE:
+            for row in await run_in_threadpool(parser.feed, block):
+                yield row
+            block = []
+
+    if block:
+        for row in await run_in_threadpool(parser.feed, block):
+            yield row
+    for row in parser.finish():
+        yield row
+
+
+async def import_task_rows(
+    db: DbSession,
+    chunks: AsyncIterator[bytes],
+    owner_id: int,
+    file_format: TaskFileFormat,
+) -> TaskImportResult:
+    """
+    Grava as linhas válidas em lotes de `TASK_IMPORT_BATCH_SIZE`, cada lote
+    em sua própria transação. Lotes já gravados não são desfeitos por erros
+    em linhas posteriores.
+    """
+    task_service = TaskService(sync_session(db))
+    batch: List[TaskCreate] = []
+    errors: List[TaskImportError] = []
+    imported = 0
+    failed = 0
+
+    async for line, parsed in parse_import_rows(chunks, file_format):
+        if isinstance(parsed, TaskCreate):
+            batch.append(parsed)
+            if len(batch) >= settings.TASK_IMPORT_BATCH_SIZE:
+                imported += await run_db(db, task_service.import_tasks, batch, owner_id)
+                batch = []
+            continue
+
+        failed += 1
+        if len(errors) < settings.TASK_IMPORT_MAX_ERRORS:
+            errors.append(TaskImportError(line=line, detail=parsed))
+
+    if batch:
+        imported += await run_db(db, task_service.import_tasks, batch, owner_id)
+
+    return TaskImportResult(imported=imported, failed=failed, errors=errors)
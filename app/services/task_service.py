@@ -1,17 +1,63 @@
-from typing import Optional
+import base64
+import binascii
+import json
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.core.etags import etag_matches, task_etag
 from app.models.task import Task
+from app.repositories.stats_repository import (
+    TASKS_ACTIVE,
+    StatsRepository,
+    tasks_by_status,
+)
+from app.repositories.task_counter_repository import TaskCounterRepository
+from app.repositories.task_list_version_repository import TaskListVersionRepository
 from app.repositories.task_repository import TaskRepository
-from app.schemas.task import TaskCreate, TaskList, TaskStatus, TaskUpdate
+from app.schemas.task import (
+    TaskBatchCreate,
+    TaskBatchDelete,
+    TaskBatchOperation,
+    TaskBatchResponse,
+    TaskBatchResult,
+    TaskCreate,
+    TaskList,
+    TaskRead,
+    TaskStatus,
+    TaskUpdate,
+)
+
+
+def encode_cursor(task: Task) -> str:
+    """Gera um cursor opaco a partir de `(created_at, id)` da tarefa."""
+    raw = json.dumps([task.created_at.isoformat(), task.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decodifica um cursor gerado por `encode_cursor`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(task_id)
+    except (binascii.Error, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
 
 
 class TaskService:
     def __init__(self, db: Session):
         self.db = db
         self.task_repo = TaskRepository(db)
+        self.stats_repo = StatsRepository(db)
+        self.task_counter_repo = TaskCounterRepository(db)
+        self.version_repo = TaskListVersionRepository(db)
 
     def _get_task_by_id_and_owner(self, task_id: int, owner_id: int) -> Task:
         task = self.task_repo.get_by_id(task_id=task_id, owner_id=owner_id)
@@ -22,50 +68,295 @@ class TaskService:
             )
         return task
 
+    def _commit_and_detach(self, task: Task) -> Task:
+        """
+        Confirma a transação devolvendo a tarefa já carregada. O flush traz
+        os valores gerados via RETURNING (`eager_defaults`) e, fora da
+        sessão, a instância não é expirada pelo commit: sem SELECT de refresh.
+        """
+        self.db.flush()
+        self.db.expunge(task)
+        self.db.commit()
+        return task
+
+    def _record_status_changes(
+        self,
+        owner_id: int,
+        changes: Iterable[Tuple[Optional[TaskStatus], Optional[TaskStatus]]],
+    ) -> None:
+        """
+        Registra escritas do dono na transação corrente: incrementa a versão
+        da listagem e atualiza os contadores globais e os do dono, com um
+        upsert para cada tabela. Em cada par `(antes, depois)`, `None`
+        significa que a tarefa não existia (criação) ou deixou de existir
+        (soft delete).
+        """
+        self.version_repo.bump(owner_id)
+        deltas: Dict[str, int] = defaultdict(int)
+        owner_deltas: Dict[str, int] = defaultdict(int)
+        for old_status, new_status in changes:
+            if old_status is not None:
+                deltas[TASKS_ACTIVE] -= 1
+                deltas[tasks_by_status(old_status)] -= 1
+                owner_deltas[TaskStatus(old_status).value] -= 1
+            if new_status is not None:
+                deltas[TASKS_ACTIVE] += 1
+                deltas[tasks_by_status(new_status)] += 1
+                owner_deltas[TaskStatus(new_status).value] += 1
+        self.stats_repo.increment(deltas, shard_key=owner_id)
+        self.task_counter_repo.increment(owner_id, owner_deltas)
+
+    def _record_status_change(
+        self,
+        owner_id: int,
+        old_status: Optional[TaskStatus],
+        new_status: Optional[TaskStatus],
+    ) -> None:
+        self._record_status_changes(owner_id, [(old_status, new_status)])
+
     def create_task(self, task_create: TaskCreate, owner_id: int) -> Task:
         new_task = self.task_repo.create(
             task_create=task_create,
             owner_id=owner_id,
             status=TaskStatus.PENDING,
         )
+        self._record_status_change(owner_id, None, TaskStatus.PENDING)
+        return self._commit_and_detach(new_task)
+
+    def import_tasks(self, tasks_create: List[TaskCreate], owner_id: int) -> int:
+        """
+        Insere um lote de tarefas importadas com um INSERT executemany e
+        atualiza contadores/versão uma vez por lote.
+        """
+        self.task_repo.insert_many(tasks_create, owner_id, TaskStatus.PENDING)
+        self._record_status_changes(
+            owner_id,
+            [(None, TaskStatus.PENDING)] * len(tasks_create),
+        )
         self.db.commit()
-        self.db.refresh(new_task)
-        return new_task
+        return len(tasks_create)
 
     def list_tasks(
         self,
         owner_id: int,
         status_filter: Optional[TaskStatus],
         limit: int,
-        offset: int,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total: Optional[bool] = None,
+        q: Optional[str] = None,
     ) -> TaskList:
-        tasks, total = self.task_repo.list(
-            owner_id=owner_id,
-            status=status_filter,
-            limit=limit,
-            offset=offset,
-        )
-        return TaskList(items=tasks, total=total)
+        """
+        Lista tarefas por offset ou, quando `cursor` é informado, por keyset.
+        Busca `limit + 1` linhas para saber se existe próxima página.
+        No modo cursor o total só é calculado se pedido explicitamente.
+        Com `q`, faz busca textual ordenada por relevância (paginação só por
+        offset e total também só sob pedido).
+        """
+        q = (q or "").strip() or None
+        if include_total is None:
+            include_total = cursor is None and q is None
+
+        if q is not None:
+            if cursor is not None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="cursor and q cannot be combined",
+                )
+            matches = self.task_repo.search(
+                owner_id=owner_id,
+                q=q,
+                status=status_filter,
+                limit=limit,
+                offset=offset,
+            )
+            total = None
+            if include_total:
+                total = self.task_repo.count_search(owner_id, q, status_filter)
+            return TaskList(items=matches, total=total)
+
+        if cursor is not None:
+            if offset:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="cursor and offset cannot be combined",
+                )
+            tasks: List[Task] = self.task_repo.list_after(
+                owner_id=owner_id,
+                status=status_filter,
+                limit=limit + 1,
+                after=decode_cursor(cursor),
+            )
+        else:
+            tasks = self.task_repo.list(
+                owner_id=owner_id,
+                status=status_filter,
+                limit=limit + 1,
+                offset=offset,
+            )
+
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = encode_cursor(tasks[-1]) if tasks else None
+
+        total = None
+        if include_total:
+            total = self.task_counter_repo.total(owner_id, status_filter)
+
+        return TaskList(items=tasks, total=total, next_cursor=next_cursor)
 
     def get_task(self, task_id: int, owner_id: int) -> Task:
         return self._get_task_by_id_and_owner(task_id, owner_id)
 
+    def get_list_version(self, owner_id: int) -> int:
+        return self.version_repo.get(owner_id)
+
+    def _check_precondition(self, task: Task, if_match: Optional[str]) -> None:
+        if if_match is not None and not etag_matches(if_match, task_etag(task)):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Task has been modified",
+            )
+
     def update_task(
         self,
         task_id: int,
         task_update: TaskUpdate,
         owner_id: int,
+        if_match: Optional[str] = None,
     ) -> Task:
         db_task = self._get_task_by_id_and_owner(task_id, owner_id)
+        self._check_precondition(db_task, if_match)
+        old_status = db_task.status
         updated_task = self.task_repo.update(
             db_task=db_task,
             task_update=task_update,
         )
-        self.db.commit()
-        self.db.refresh(updated_task)
-        return updated_task
+        self._record_status_change(owner_id, old_status, updated_task.status)
+        return self._commit_and_detach(updated_task)
 
-    def delete_task(self, task_id: int, owner_id: int) -> None:
+    def delete_task(
+        self,
+        task_id: int,
+        owner_id: int,
+        if_match: Optional[str] = None,
+    ) -> None:
         db_task = self._get_task_by_id_and_owner(task_id, owner_id)
+        self._check_precondition(db_task, if_match)
         self.task_repo.delete(db_task)
+        self._record_status_change(owner_id, db_task.status, None)
+        self.db.commit()
+
+    def delete_all_for_owner(self, owner_id: int, deleted_at: Any = None) -> int:
+        """
+        Soft delete de todas as tarefas ativas do dono na transação corrente,
+        com os contadores ajustados; o commit fica com quem chama.
+        """
+        statuses = self.task_repo.delete_all(owner_id, deleted_at)
+        if statuses:
+            self._record_status_changes(
+                owner_id, ((task_status, None) for task_status in statuses)
+            )
+        return len(statuses)
+
+    def run_batch(
+        self,
+        operations: List[TaskBatchOperation],
+        owner_id: int,
+    ) -> TaskBatchResponse:
+        """
+        Aplica criações, atualizações e exclusões em uma única transação,
+        com operações em lote no repositório, e devolve um resultado por item.
+        Um mesmo id só pode aparecer uma vez por lote (as repetições recebem
+        409).
+        """
+        results: List[Optional[TaskBatchResult]] = [None] * len(operations)
+
+        creates: List[Tuple[int, TaskBatchCreate]] = []
+        updates: Dict[int, Tuple[int, Dict]] = {}
+        deletes: Dict[int, int] = {}
+        for index, operation in enumerate(operations):
+            if isinstance(operation, TaskBatchCreate):
+                creates.append((index, operation))
+            elif operation.id in updates or operation.id in deletes:
+                results[index] = TaskBatchResult(
+                    index=index,
+                    op=operation.op,
+                    status=status.HTTP_409_CONFLICT,
+                    detail="Task already modified in this batch",
+                )
+            elif isinstance(operation, TaskBatchDelete):
+                deletes[operation.id] = index
+            else:
+                values = operation.model_dump(
+                    mode="json",
+                    exclude_unset=True,
+                    exclude={"op", "id"},
+                )
+                updates[operation.id] = (index, values)
+
+        current = self.task_repo.get_statuses(
+            list(updates) + list(deletes),
+            owner_id=owner_id,
+        )
+        missing = [
+            index
+            for task_id, index in [
+                *deletes.items(),
+                *((task_id, index) for task_id, (index, _) in updates.items()),
+            ]
+            if task_id not in current
+        ]
+        for index in missing:
+            results[index] = TaskBatchResult(
+                index=index,
+                op=operations[index].op,
+                status=status.HTTP_404_NOT_FOUND,
+                detail="Task not found",
+            )
+        updates = {k: v for k, v in updates.items() if k in current}
+        deletes = {k: v for k, v in deletes.items() if k in current}
+
+        created = self.task_repo.create_many(
+            [TaskCreate(**op.model_dump(exclude={"op"})) for _, op in creates],
+            owner_id=owner_id,
+            status=TaskStatus.PENDING,
+        )
+        self.task_repo.update_many(
+            {task_id: values for task_id, (_, values) in updates.items()},
+            owner_id=owner_id,
+        )
+        self.task_repo.delete_many(list(deletes), owner_id=owner_id)
+
+        changes = [(None, TaskStatus.PENDING)] * len(created)
+        for task_id, (_, values) in updates.items():
+            if "status" in values:
+                changes.append((current[task_id], values["status"]))
+        changes.extend((current[task_id], None) for task_id in deletes)
+        self._record_status_changes(owner_id, changes)
+
+        for (index, operation), task in zip(creates, created):
+            results[index] = TaskBatchResult(
+                index=index,
+                op=operation.op,
+                status=status.HTTP_201_CREATED,
+                task=TaskRead.model_validate(task),
+            )
+        for task in self.task_repo.list_by_ids(list(updates), owner_id=owner_id):
+            index = updates[task.id][0]
+            results[index] = TaskBatchResult(
+                index=index,
+                op="update",
+                status=status.HTTP_200_OK,
+                task=TaskRead.model_validate(task),
+            )
+        for index in deletes.values():
+            results[index] = TaskBatchResult(
+                index=index,
+                op="delete",
+                status=status.HTTP_204_NO_CONTENT,
+            )
+
         self.db.commit()
+        return TaskBatchResponse(results=results)
@@ -1,36 +1,69 @@
+from typing import NamedTuple, Optional
+
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.models.user import User
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.repositories.stats_repository import USERS_ACTIVE, StatsRepository
 from app.repositories.user_repository import UserRepository
 from app.schemas.token import Token
-from app.schemas.user import UserCreate, UserProfileUpdate
+from app.schemas.user import UserCreate, UserProfileUpdate, UserRole
 from app.security.auth import (
+    TOKEN_TYPE_REFRESH,
     create_access_token,
     create_refresh_token,
-    hash_password,
-    verify_password,
+    decode_token,
 )
+from app.security.principal_cache import principal_cache
+from app.security.token_versions import token_versions
+from app.services.task_service import TaskService
+
+# Claims de usuário copiados do refresh token para o novo par
+USER_CLAIMS = ("email", "role", "ver")
+
+
+class LoginCredentials(NamedTuple):
+    user_id: int
+    hashed_password: str
+    claims: dict
+
+
+def incorrect_credentials() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Incorrect email or password",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
 
 
 class UserService:
     def __init__(self, db: Session):
         self.db = db
         self.user_repo = UserRepository(db)
+        self.stats_repo = StatsRepository(db)
+        self.refresh_repo = RefreshTokenRepository(db)
 
-    def register_user(self, user_create: UserCreate) -> User:
-        existing_user = self.user_repo.get_by_email(user_create.email)
+    # Login, registro e troca de senha são divididos em leitura, bcrypt e
+    # escrita: a rota aguarda o hash no event loop (`hash_password_async`),
+    # sem transação aberta e sem ocupar o threadpool.
+
+    def ensure_email_available(self, email: str) -> None:
+        existing_user = self.user_repo.get_by_email(email)
+        # Encerra a transação de leitura: a conexão volta ao pool antes do hash
+        self.db.rollback()
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Email already registered",
             )
 
-        hashed_pass = hash_password(user_create.password)
-
+    def register_user(self, user_create: UserCreate, hashed_password: str) -> User:
         try:
-            new_user = self.user_repo.create(user_create, hashed_pass)
+            new_user = self.user_repo.create(user_create, hashed_password)
+            self.db.flush()
+            self.stats_repo.increment({USERS_ACTIVE: 1}, shard_key=new_user.id)
             self.db.commit()
             self.db.refresh(new_user)
             return new_user
@@ -41,25 +74,81 @@ class UserService:
                 detail="Email already registered",
             )
 
-    def login_user(self, email: str, password: str) -> Token:
+    def find_credentials(self, email: str) -> Optional[LoginCredentials]:
         user = self.user_repo.get_by_email(email)
-
-        if not user or not verify_password(password, user.hashed_password):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect email or password",
-                headers={"WWW-Authenticate": "Bearer"},
+        credentials = None
+        if user:
+            credentials = LoginCredentials(
+                user.id, user.hashed_password, self._claims(user)
             )
+        self.db.rollback()
+        return credentials
+
+    def start_session(self, credentials: LoginCredentials) -> Token:
+        """Cria a família de refresh tokens depois da senha conferida."""
+        family = self.refresh_repo.create_family(credentials.user_id)
+        self.db.commit()
+        return self._issue_tokens(credentials.claims, family.id, 0)
+
+    def refresh_tokens(self, refresh_token: str) -> Token:
+        """
+        Rotaciona o refresh token: confere a assinatura e avança a família
+        com um UPDATE pela PK. Não consulta `users` nem roda bcrypt: os
+        claims vêm do próprio refresh token, e toda revogação de tokens
+        (`_revoke_tokens`) revoga também as famílias do usuário.
+        """
+        invalid = HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+        payload = decode_token(refresh_token)
+        if payload is None or payload.get("type") != TOKEN_TYPE_REFRESH:
+            raise invalid
+        try:
+            family_id = str(payload["fam"])
+            generation = int(payload["gen"])
+        except (KeyError, TypeError, ValueError):
+            raise invalid
 
-        jwt_data = {"sub": str(user.id)}
-        access_token = create_access_token(data=jwt_data)
-        refresh_token = create_refresh_token(data=jwt_data)
+        user_id = self.refresh_repo.rotate(family_id, generation)
+        # Também grava a revogação quando o token foi reutilizado
+        self.db.commit()
+        if user_id is None:
+            raise invalid
 
+        claims = {key: payload[key] for key in USER_CLAIMS if key in payload}
+        return self._issue_tokens(
+            {**claims, "sub": str(user_id)}, family_id, generation + 1
+        )
+
+    @staticmethod
+    def _claims(user: User) -> dict:
+        """Claims do usuário nos tokens, usados pela validação sem banco."""
+        return {
+            "sub": str(user.id),
+            "email": user.email,
+            "role": user.role,
+            "ver": user.token_version,
+        }
+
+    def _issue_tokens(self, claims: dict, family_id: str, generation: int) -> Token:
         return Token(
-            access_token=access_token,
-            refresh_token=refresh_token,
+            access_token=create_access_token(data=claims),
+            refresh_token=create_refresh_token(
+                data={**claims, "fam": family_id, "gen": generation}
+            ),
         )
 
+    def _revoke_tokens(self, user_id: int) -> int:
+        """
+        Invalida os tokens de acesso (nova `token_version`) e as famílias de
+        refresh do usuário. Chamar `token_versions.push` após o commit.
+        """
+        self.refresh_repo.revoke_user(user_id)
+        return self.user_repo.revoke_tokens(user_id)
+
     def get_current_profile(self, user_id: int) -> User:
         user = self.user_repo.get_by_id(user_id)
         if not user:
@@ -71,22 +160,46 @@ class UserService:
 
     def update_own_profile(
         self,
-        user: User,
+        user_id: int,
         profile_data: UserProfileUpdate,
+        hashed_password: Optional[str] = None,
     ) -> User:
+        """`hashed_password`: hash de `profile_data.new_password`, já calculado."""
+        user = self.get_current_profile(user_id)
         updated_user = self.user_repo.update_profile(user, profile_data)
 
-        if profile_data.new_password:
-            updated_user.hashed_password = hash_password(
-                profile_data.new_password,
-            )
+        token_version = None
+        if hashed_password is not None:
+            updated_user.hashed_password = hashed_password
+            token_version = self._revoke_tokens(user_id)
 
         self.db.add(updated_user)
         self.db.commit()
         self.db.refresh(updated_user)
+        principal_cache.invalidate(user_id)
+        if token_version is not None:
+            token_versions.push(user_id, token_version)
 
         return updated_user
 
-    def delete_own_account(self, user: User) -> None:
+    def delete_own_account(self, user_id: int) -> None:
+        user = self.get_current_profile(user_id)
         self.user_repo.soft_delete(user)
+        # As tarefas saem junto: o expurgo só arquiva donos sem tarefas
+        TaskService(self.db).delete_all_for_owner(user_id)
+        token_version = self._revoke_tokens(user_id)
+        self.stats_repo.increment({USERS_ACTIVE: -1}, shard_key=user_id)
         self.db.commit()
+        principal_cache.invalidate(user_id)
+        token_versions.push(user_id, token_version)
+
+    def change_role(self, user_id: int, role: UserRole) -> User:
+        user = self.get_current_profile(user_id)
+        self.user_repo.update_role(user, role)
+        # A role vai nos tokens: os emitidos antes da troca deixam de valer
+        token_version = self._revoke_tokens(user_id)
+        self.db.commit()
+        self.db.refresh(user)
+        principal_cache.invalidate(user_id)
+        token_versions.push(user_id, token_version)
+        return user
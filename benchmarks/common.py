@@ -0,0 +1,19 @@
+"""Utilitários compartilhados pelos benchmarks."""
+
+import statistics
+from typing import Dict, List
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    if not latencies:
+        return {"count": 0}
+    ordered = sorted(latencies)
+    quantiles = (
+        statistics.quantiles(ordered, n=100) if len(ordered) > 1 else ordered * 99
+    )
+    return {
+        "count": len(ordered),
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p95_ms": round(quantiles[94] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+    }
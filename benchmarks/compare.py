@@ -0,0 +1,42 @@
+"""
+Compara dois resultados de `benchmarks.http_suite` rota a rota.
+
+    python -m benchmarks.compare antes.json depois.json
+
+Variações positivas em latência e negativas em vazão são pioras.
+"""
+
+import argparse
+import json
+from typing import Optional
+
+METRICS = ["throughput_rps", "p50_ms", "p95_ms", "p99_ms"]
+
+
+def _change(before: Optional[float], after: Optional[float]) -> str:
+    if not before or after is None:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def compare(before: dict, after: dict) -> str:
+    lines = [f"{'route':<24}" + "".join(f"{metric:>18}" for metric in METRICS)]
+    for route in sorted(set(before["routes"]) | set(after["routes"])):
+        old = before["routes"].get(route, {})
+        new = after["routes"].get(route, {})
+        lines.append(
+            f"{route:<24}"
+            + "".join(
+                f"{_change(old.get(metric), new.get(metric)):>18}" for metric in METRICS
+            )
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+    with open(args.before) as fp_before, open(args.after) as fp_after:
+        print(compare(json.load(fp_before), json.load(fp_after)))
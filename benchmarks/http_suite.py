@@ -0,0 +1,462 @@
+"""
+Benchmark HTTP de todas as rotas da API, sobre dados de `benchmarks.seed`.
+
+Cada cenário dispara `--requests` requisições com `--concurrency` clientes
+simultâneos, in-process pelo ASGI (`--target asgi`) ou contra um worker
+uvicorn real (`--target uvicorn`). O resultado é um JSON com vazão e
+p50/p95/p99 por rota, pensado para ser comparado entre commits com
+`python -m benchmarks.compare`.
+
+    TESTING=true python -m benchmarks.http_suite --scale 100k \\
+        --target uvicorn --concurrency 32 --output bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.db.database import engine
+from app.main import app
+from app.security.auth import create_access_token
+from app.security.rate_limit import rate_limiter
+from benchmarks.common import summarize
+from benchmarks.seed import PASSWORD, SCALES, bench_email, seed
+
+# Usuários de benchmark que recebem token; as leituras se espalham entre eles
+TOKEN_SAMPLE = 100
+
+
+@dataclass
+class Context:
+    run_id: str
+    users: int
+    headers: List[dict]
+    admin_headers: dict
+    created: List[Tuple[int, int]] = field(default_factory=list)
+    registered: List[int] = field(default_factory=list)
+    cursors: Dict[int, str] = field(default_factory=dict)
+
+    def user(self, i: int) -> Tuple[int, dict]:
+        index = i % len(self.headers)
+        return index, self.headers[index]
+
+    def created_task(self, i: int) -> dict:
+        """URL e cabeçalhos de uma tarefa criada no cenário `tasks.create`."""
+        user_index, task_id = self.created[i % len(self.created)]
+        return {"url": f"/api/tasks/{task_id}", "headers": self.headers[user_index]}
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    build: Callable[[Context, int], dict]
+    expected: Tuple[int, ...] = (200,)
+    after: Optional[Callable[[Context, int, httpx.Response], None]] = None
+    # Rotas com bcrypt usam `--hash-requests`, bem menor que `--requests`
+    hashing: bool = False
+    # Limita as requisições aos recursos disponíveis (ex.: contas a excluir)
+    available: Optional[Callable[[Context], int]] = None
+
+
+def bearer(user_id: int) -> dict:
+    token = create_access_token(data={"sub": str(user_id)})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _remember_created(ctx: Context, i: int, resp: httpx.Response) -> None:
+    ctx.created.append((i % len(ctx.headers), resp.json()["id"]))
+
+
+def _remember_registered(ctx: Context, i: int, resp: httpx.Response) -> None:
+    ctx.registered.append(resp.json()["id"])
+
+
+def _remember_cursor(ctx: Context, i: int, resp: httpx.Response) -> None:
+    cursor = resp.json().get("next_cursor")
+    if cursor:
+        ctx.cursors[i % len(ctx.headers)] = cursor
+
+
+def _cursor_page(ctx: Context, i: int) -> dict:
+    index, headers = ctx.user(i)
+    params = {"limit": 25}
+    if index in ctx.cursors:
+        params["cursor"] = ctx.cursors[index]
+    return {"url": "/api/tasks/", "headers": headers, "params": params}
+
+
+def _import_body(i: int) -> str:
+    return "".join(
+        json.dumps({"title": f"Imported {i}-{n}"}) + "\n" for n in range(100)
+    )
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("health", "GET", lambda ctx, i: {"url": "/health"}),
+    Scenario("ready", "GET", lambda ctx, i: {"url": "/ready"}),
+    Scenario(
+        "auth.register",
+        "POST",
+        lambda ctx, i: {
+            "url": "/api/auth/register",
+            "json": {
+                "email": f"bench-reg-{ctx.run_id}-{i}@bench.example.com",
+                "password": PASSWORD,
+            },
+        },
+        expected=(201,),
+        after=_remember_registered,
+        hashing=True,
+    ),
+    Scenario(
+        "auth.login",
+        "POST",
+        lambda ctx, i: {
+            "url": "/api/auth/login",
+            "data": {"username": bench_email(i % ctx.users), "password": PASSWORD},
+        },
+        hashing=True,
+    ),
+    Scenario(
+        "tasks.create",
+        "POST",
+        lambda ctx, i: {
+            "url": "/api/tasks/",
+            "headers": ctx.user(i)[1],
+            "json": {"title": f"Created {i}", "description": "benchmark"},
+        },
+        expected=(201,),
+        after=_remember_created,
+    ),
+    Scenario(
+        "tasks.list",
+        "GET",
+        lambda ctx, i: {
+            "url": "/api/tasks/",
+            "headers": ctx.user(i)[1],
+            "params": {"limit": 25},
+        },
+        after=_remember_cursor,
+    ),
+    Scenario(
+        "tasks.list_by_status",
+        "GET",
+        lambda ctx, i: {
+            "url": "/api/tasks/",
+            "headers": ctx.user(i)[1],
+            "params": {"status_filter": "completed", "limit": 25},
+        },
+    ),
+    Scenario("tasks.list_cursor", "GET", _cursor_page),
+    Scenario(
+        "tasks.search",
+        "GET",
+        lambda ctx, i: {
+            "url": "/api/tasks/",
+            "headers": ctx.user(i)[1],
+            "params": {"q": "relatório", "limit": 25},
+        },
+    ),
+    Scenario(
+        "tasks.get",
+        "GET",
+        lambda ctx, i: ctx.created_task(i),
+        available=lambda ctx: len(ctx.created),
+    ),
+    Scenario(
+        "tasks.update",
+        "PUT",
+        lambda ctx, i: {
+            **ctx.created_task(i),
+            "json": {"title": f"Updated {i}"},
+        },
+        available=lambda ctx: len(ctx.created),
+    ),
+    Scenario(
+        "tasks.batch",
+        "POST",
+        lambda ctx, i: {
+            "url": "/api/tasks/batch",
+            "headers": ctx.user(i)[1],
+            "json": {
+                "operations": [
+                    {"op": "create", "title": f"Batch {i}-{n}"} for n in range(10)
+                ]
+            },
+        },
+    ),
+    Scenario(
+        "tasks.export",
+        "GET",
+        lambda ctx, i: {
+            "url": "/api/tasks/export",
+            "headers": ctx.user(i)[1],
+            "params": {"format": "ndjson"},
+        },
+    ),
+    Scenario(
+        "tasks.import",
+        "POST",
+        lambda ctx, i: {
+            "url": "/api/tasks/import",
+            "headers": ctx.user(i)[1],
+            "content": _import_body(i),
+        },
+    ),
+    Scenario(
+        "tasks.delete",
+        "DELETE",
+        lambda ctx, i: ctx.created_task(i),
+        expected=(204,),
+        available=lambda ctx: len(ctx.created),
+    ),
+    Scenario(
+        "users.me",
+        "GET",
+        lambda ctx, i: {"url": "/api/users/me", "headers": ctx.user(i)[1]},
+    ),
+    Scenario(
+        "users.update_me",
+        "PUT",
+        lambda ctx, i: {
+            "url": "/api/users/me",
+            "headers": ctx.user(i)[1],
+            "json": {"name": f"Bench {i}"},
+        },
+    ),
+    Scenario(
+        "users.delete_me",
+        "DELETE",
+        lambda ctx, i: {
+            "url": "/api/users/me",
+            "headers": bearer(ctx.registered[i]),
+        },
+        expected=(204,),
+        available=lambda ctx: len(ctx.registered),
+    ),
+    Scenario(
+        "admin.dashboard",
+        "GET",
+        lambda ctx, i: {"url": "/api/admin/dashboard", "headers": ctx.admin_headers},
+    ),
+    Scenario(
+        "admin.cache_stats",
+        "GET",
+        lambda ctx, i: {"url": "/api/admin/cache-stats", "headers": ctx.admin_headers},
+    ),
+]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    ctx: Context,
+    requests: int,
+    concurrency: int,
+) -> dict:
+    if scenario.available is not None:
+        requests = min(requests, scenario.available(ctx))
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    indexes = iter(range(requests))
+
+    async def worker():
+        for i in indexes:
+            kwargs = scenario.build(ctx, i)
+            started = time.perf_counter()
+            resp = await client.request(scenario.method, **kwargs)
+            await resp.aread()
+            latencies.append(time.perf_counter() - started)
+            statuses[resp.status_code] += 1
+            if scenario.after is not None and resp.status_code in scenario.expected:
+                scenario.after(ctx, i, resp)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        **summarize(latencies),
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else 0.0,
+        "errors": sum(
+            count for code, count in statuses.items() if code not in scenario.expected
+        ),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+async def _wait_until_up(client: httpx.AsyncClient, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            if time.perf_counter() > deadline:
+                raise
+        await asyncio.sleep(0.2)
+
+
+@asynccontextmanager
+async def open_client(
+    target: str,
+    concurrency: int,
+    port: int,
+    workers: int,
+) -> AsyncIterator[httpx.AsyncClient]:
+    # Todas as requisições saem do mesmo IP: sem rate limit, para medir o
+    # custo das rotas de autenticação e não o 429
+    if target == "asgi":
+        rate_limiter.enabled = False
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            yield client
+        return
+
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--no-access-log",
+        ],
+        env={**os.environ, "RATE_LIMIT_ENABLED": "false"},
+    )
+    limits = httpx.Limits(max_connections=concurrency)
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60
+        ) as client:
+            await _wait_until_up(client, timeout=30)
+            yield client
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_suite(
+    tasks: int,
+    target: str = "asgi",
+    concurrency: int = 16,
+    requests: int = 200,
+    hash_requests: int = 20,
+    tasks_per_user: int = 100,
+    port: int = 8765,
+    workers: int = 1,
+    only: Optional[List[str]] = None,
+) -> dict:
+    seeded = seed(tasks, tasks_per_user=tasks_per_user)
+    ctx = Context(
+        run_id=uuid.uuid4().hex[:8],
+        users=len(seeded.user_ids),
+        headers=[bearer(user_id) for user_id in seeded.user_ids[:TOKEN_SAMPLE]],
+        admin_headers=bearer(seeded.admin_id),
+    )
+
+    routes = {}
+    async with open_client(target, concurrency, port, workers) as client:
+        for scenario in SCENARIOS:
+            if only and scenario.name not in only:
+                continue
+            routes[scenario.name] = await run_scenario(
+                client,
+                scenario,
+                ctx,
+                hash_requests if scenario.hashing else requests,
+                concurrency,
+            )
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "target": target,
+            "workers": workers if target == "uvicorn" else None,
+            "tasks": tasks,
+            "users": ctx.users,
+            "concurrency": concurrency,
+            "requests": requests,
+            "hash_requests": hash_requests,
+            "database": engine.dialect.name,
+            "db_async": settings.DB_ASYNC,
+            "seed_seconds": round(seeded.seconds, 2),
+        },
+        "routes": routes,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1k")
+    parser.add_argument("--tasks-per-user", type=int, default=100)
+    parser.add_argument("--target", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--hash-requests", type=int, default=20)
+    parser.add_argument(
+        "--only",
+        nargs="*",
+        help="Roda só os cenários indicados (ex.: tasks.list tasks.get)",
+    )
+    parser.add_argument("--output", help="Grava o JSON neste arquivo")
+    args = parser.parse_args()
+
+    result = asyncio.run(
+        run_suite(
+            SCALES[args.scale],
+            target=args.target,
+            concurrency=args.concurrency,
+            requests=args.requests,
+            hash_requests=args.hash_requests,
+            tasks_per_user=args.tasks_per_user,
+            port=args.port,
+            workers=args.workers,
+            only=args.only,
+        )
+    )
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as fp:
+            fp.write(output + "\n")
+    else:
+        print(output)
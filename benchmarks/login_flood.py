@@ -0,0 +1,115 @@
+"""
+Mede a latência de GET /api/tasks/ sozinho e durante uma rajada de logins.
+
+Com o bcrypt no pool dedicado (`PASSWORD_HASH_WORKERS`), a latência das
+rotas de tarefas deve ficar estável enquanto os logins excedentes recebem
+503. Usa o banco de `settings.DATABASE_URL` (defina TESTING=true para usar
+o banco de teste).
+
+    python -m benchmarks.login_flood --duration 10 --login-concurrency 64
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from typing import Dict, List
+
+import httpx
+
+from app.db.database import Base, engine
+from app.main import app
+from benchmarks.common import summarize
+
+PASSWORD = "password123"
+
+
+async def setup_user(client: httpx.AsyncClient, email: str) -> dict:
+    await client.post("/api/auth/register", json={"email": email, "password": PASSWORD})
+    login = await client.post(
+        "/api/auth/login", data={"username": email, "password": PASSWORD}
+    )
+    login.raise_for_status()
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    for i in range(25):
+        await client.post("/api/tasks/", headers=headers, json={"title": f"Bench {i}"})
+    return headers
+
+
+async def measure_tasks(
+    client: httpx.AsyncClient,
+    headers: dict,
+    duration: float,
+    concurrency: int,
+) -> List[float]:
+    latencies: List[float] = []
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            resp = await client.get("/api/tasks/", headers=headers)
+            resp.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def flood_logins(
+    client: httpx.AsyncClient,
+    email: str,
+    stop: asyncio.Event,
+    concurrency: int,
+) -> Dict[int, int]:
+    statuses: Dict[int, int] = {}
+
+    async def worker():
+        while not stop.is_set():
+            resp = await client.post(
+                "/api/auth/login", data={"username": email, "password": PASSWORD}
+            )
+            statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return statuses
+
+
+async def main(args: argparse.Namespace) -> dict:
+    Base.metadata.create_all(bind=engine)
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        headers = await setup_user(client, email)
+
+        baseline = await measure_tasks(
+            client, headers, args.duration, args.task_concurrency
+        )
+
+        stop = asyncio.Event()
+        flood = asyncio.create_task(
+            flood_logins(client, email, stop, args.login_concurrency)
+        )
+        under_flood = await measure_tasks(
+            client, headers, args.duration, args.task_concurrency
+        )
+        stop.set()
+        login_statuses = await flood
+
+    return {
+        "tasks_baseline": summarize(baseline),
+        "tasks_during_login_flood": summarize(under_flood),
+        "login_statuses": login_statuses,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--task-concurrency", type=int, default=8)
+    parser.add_argument("--login-concurrency", type=int, default=64)
+    print(json.dumps(asyncio.run(main(parser.parse_args())), indent=2))
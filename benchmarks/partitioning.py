@@ -0,0 +1,200 @@
+"""
+Compara listagem e inserção de tarefas com `tasks` comum e particionada por
+HASH (owner_id), no mesmo Postgres e com o mesmo volume.
+
+Cada layout fica num schema próprio (`bench_plain`, `bench_partitioned`),
+com o DDL da migração a9c4e2f7b318, e é populado no servidor com
+`generate_series`. As medições usam as consultas reais de `TaskRepository`
+(listagem da primeira página e INSERT ... RETURNING com commit) para donos
+aleatórios. Só Postgres; a carga de 50M linhas leva vários minutos.
+
+    python -m benchmarks.partitioning --rows 50000000 --partitions 16
+"""
+
+import argparse
+import importlib.util
+import json
+import random
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.repositories.task_repository import TaskRepository
+from app.schemas.task import TaskCreate, TaskStatus
+from benchmarks.common import summarize
+
+MIGRATION = (
+    Path(__file__).resolve().parent.parent
+    / "alembic"
+    / "versions"
+    / "a9c4e2f7b318_partition_tasks_by_owner.py"
+)
+SCHEMAS = {"plain": "bench_plain", "partitioned": "bench_partitioned"}
+
+
+def _migration():
+    spec = importlib.util.spec_from_file_location("partition_migration", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def layout_ddl(layout: str, partitions: int) -> List[str]:
+    """DDL de `users` + `tasks` no layout pedido, no schema corrente."""
+    migration = _migration()
+    statements = [
+        "CREATE TABLE users (id integer PRIMARY KEY)",
+        "CREATE SEQUENCE tasks_id_seq",
+    ]
+    if layout == "partitioned":
+        statements.append(
+            f"CREATE TABLE tasks ({migration.COLUMN_DEFINITIONS},\n"
+            "    PRIMARY KEY (id, owner_id)\n"
+            ") PARTITION BY HASH (owner_id)"
+        )
+        statements.extend(
+            f"CREATE TABLE tasks_p{remainder:03d} PARTITION OF tasks "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+            for remainder in range(partitions)
+        )
+    else:
+        statements.append(
+            f"CREATE TABLE tasks ({migration.COLUMN_DEFINITIONS},\n"
+            "    PRIMARY KEY (id)\n"
+            ")"
+        )
+    return statements + [" ".join(s.split()) for s in migration.INDEXES]
+
+
+def _use_schema(engine: Engine, schema: str) -> None:
+    @event.listens_for(engine, "connect")
+    def set_search_path(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"SET search_path TO {schema}, public")
+        cursor.close()
+
+
+def build(
+    engine: Engine, layout: str, rows: int, owners: int, partitions: int
+) -> float:
+    """Recria o schema do layout e o popula. Devolve os segundos gastos."""
+    schema = SCHEMAS[layout]
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS btree_gin")
+        conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        conn.exec_driver_sql(f"CREATE SCHEMA {schema}")
+        conn.exec_driver_sql(f"SET LOCAL search_path TO {schema}, public")
+        for statement in layout_ddl(layout, partitions):
+            conn.exec_driver_sql(statement)
+        conn.execute(
+            text("INSERT INTO users (id) SELECT generate_series(1, :owners)"),
+            {"owners": owners},
+        )
+        # ~20% concluídas e ~5% excluídas, como no seed dos benchmarks HTTP
+        conn.execute(
+            text(
+                """
+                INSERT INTO tasks (owner_id, title, description, status,
+                                   created_at, deleted_at)
+                SELECT 1 + n % :owners,
+                       'Bench task ' || n,
+                       CASE WHEN n % 10 = 0 THEN 'relatório semanal' END,
+                       CASE WHEN n % 5 = 0 THEN 'completed' ELSE 'pending' END,
+                       now() - make_interval(secs => n),
+                       CASE WHEN n % 20 = 0 THEN now() END
+                FROM generate_series(1, :rows) AS n
+                """
+            ),
+            {"owners": owners, "rows": rows},
+        )
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql(f"VACUUM ANALYZE {schema}.tasks")
+    return time.perf_counter() - started
+
+
+def measure(
+    engine: Engine,
+    owners: int,
+    samples: int,
+    operation: Callable[[Session, int], object],
+) -> Dict[str, float]:
+    latencies = []
+    with Session(engine) as db:
+        for _ in range(samples):
+            owner_id = random.randint(1, owners)
+            started = time.perf_counter()
+            operation(db, owner_id)
+            latencies.append(time.perf_counter() - started)
+            db.expunge_all()
+    return summarize(latencies)
+
+
+def _list_page(db: Session, owner_id: int) -> object:
+    result = TaskRepository(db).list(owner_id, None, limit=26, offset=0)
+    db.rollback()
+    return result
+
+
+def _insert(db: Session, owner_id: int) -> object:
+    task = TaskRepository(db).create(
+        TaskCreate(title="Nova tarefa"), owner_id, TaskStatus.PENDING
+    )
+    db.commit()
+    return task
+
+
+def run(rows: int, owners: int, partitions: int, samples: int) -> dict:
+    if not settings.DATABASE_URL.startswith("postgresql"):
+        raise SystemExit("benchmarks.partitioning requires PostgreSQL")
+
+    result: dict = {
+        "meta": {
+            "rows": rows,
+            "owners": owners,
+            "partitions": partitions,
+            "samples": samples,
+        },
+        "layouts": {},
+    }
+    for layout, schema in SCHEMAS.items():
+        engine = create_engine(settings.DATABASE_URL)
+        seconds = build(engine, layout, rows, owners, partitions)
+        engine.dispose()
+
+        engine = create_engine(settings.DATABASE_URL)
+        _use_schema(engine, schema)
+        # Aquece cache e pool antes de medir
+        measure(engine, owners, min(samples, 200), _list_page)
+        result["layouts"][layout] = {
+            "build_seconds": round(seconds, 1),
+            "list": measure(engine, owners, samples, _list_page),
+            "insert": measure(engine, owners, samples, _insert),
+        }
+        engine.dispose()
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000_000)
+    parser.add_argument("--owners", type=int, default=None)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--keep", action="store_true", help="não remove os schemas")
+    args = parser.parse_args()
+
+    owners = args.owners or max(args.rows // 100, 1)
+    output = run(args.rows, owners, args.partitions, args.samples)
+    if not args.keep:
+        cleanup = create_engine(settings.DATABASE_URL)
+        with cleanup.begin() as conn:
+            for schema in SCHEMAS.values():
+                conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        cleanup.dispose()
+    print(json.dumps(output, indent=2))
@@ -0,0 +1,162 @@
+"""
+Popula o banco com usuários e tarefas de benchmark em escala configurável.
+
+Os usuários `bench-<n>@bench.example.com` (e `bench-admin@bench.example.com`, admin)
+compartilham a senha `PASSWORD`, com hash calculado uma única vez. As tarefas
+entram por INSERT executemany em blocos e os contadores são recalculados no
+fim. Rodar de novo com a mesma escala não duplica dados.
+
+    TESTING=true python -m benchmarks.seed --scale 100k
+"""
+
+import argparse
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, List
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.db.database import Base, SessionLocal, engine
+from app.models.task import Task
+from app.models.user import User
+from app.repositories.stats_repository import StatsRepository
+from app.repositories.task_counter_repository import TaskCounterRepository
+from app.schemas.task import TaskStatus
+from app.security.auth import hash_password
+
+PASSWORD = "password123"
+ADMIN_EMAIL = "bench-admin@bench.example.com"
+SCALES = {"1k": 1_000, "100k": 100_000, "1M": 1_000_000}
+CHUNK_SIZE = 10_000
+
+
+def bench_email(index: int) -> str:
+    return f"bench-{index}@bench.example.com"
+
+
+@dataclass
+class SeedResult:
+    user_ids: List[int]
+    admin_id: int
+    tasks: int
+    seconds: float
+
+
+def _bench_user_ids(db: Session, emails: List[str]) -> Dict[str, int]:
+    ids: Dict[str, int] = {}
+    for start in range(0, len(emails), CHUNK_SIZE):
+        rows = db.execute(
+            select(User.email, User.id).where(
+                User.email.in_(emails[start : start + CHUNK_SIZE])
+            )
+        )
+        ids.update(dict(rows.all()))
+    return ids
+
+
+def _ensure_users(db: Session, users: int, hashed_password: str) -> List[int]:
+    emails = [bench_email(i) for i in range(users)]
+    existing = _bench_user_ids(db, emails)
+    rows = [
+        {"email": email, "hashed_password": hashed_password}
+        for email in emails
+        if email not in existing
+    ]
+    for start in range(0, len(rows), CHUNK_SIZE):
+        db.execute(insert(User), rows[start : start + CHUNK_SIZE])
+    if rows:
+        existing = _bench_user_ids(db, emails)
+    return [existing[email] for email in emails]
+
+
+def _ensure_admin(db: Session, hashed_password: str) -> int:
+    admin_id = db.scalar(select(User.id).where(User.email == ADMIN_EMAIL))
+    if admin_id is None:
+        admin = User(email=ADMIN_EMAIL, hashed_password=hashed_password, role="admin")
+        db.add(admin)
+        db.flush()
+        admin_id = admin.id
+    return admin_id
+
+
+def _seed_tasks(db: Session, user_ids: List[int], tasks: int) -> None:
+    per_user, remainder = divmod(tasks, len(user_ids))
+    current = {}
+    for start in range(0, len(user_ids), CHUNK_SIZE):
+        rows = db.execute(
+            select(Task.owner_id, func.count())
+            .where(
+                Task.owner_id.in_(user_ids[start : start + CHUNK_SIZE]),
+                Task.deleted_at.is_(None),
+            )
+            .group_by(Task.owner_id)
+        )
+        current.update(dict(rows.all()))
+
+    rows = []
+    for position, owner_id in enumerate(user_ids):
+        wanted = per_user + (1 if position < remainder else 0)
+        for n in range(current.get(owner_id, 0), wanted):
+            rows.append(
+                {
+                    "owner_id": owner_id,
+                    "title": f"Bench task {n}",
+                    "description": "relatório semanal" if n % 10 == 0 else None,
+                    # ~20% concluídas, para o filtro por status ter seletividade
+                    "status": (
+                        TaskStatus.COMPLETED if n % 5 == 0 else TaskStatus.PENDING
+                    ),
+                }
+            )
+            if len(rows) >= CHUNK_SIZE:
+                db.execute(insert(Task), rows)
+                rows = []
+    if rows:
+        db.execute(insert(Task), rows)
+
+
+def seed(tasks: int, tasks_per_user: int = 100) -> SeedResult:
+    """Garante `tasks` tarefas ativas distribuídas entre os usuários de benchmark."""
+    started = time.perf_counter()
+    Base.metadata.create_all(bind=engine)
+    users = max(tasks // tasks_per_user, 1)
+    hashed_password = hash_password(PASSWORD)
+
+    db = SessionLocal()
+    try:
+        user_ids = _ensure_users(db, users, hashed_password)
+        admin_id = _ensure_admin(db, hashed_password)
+        _seed_tasks(db, user_ids, tasks)
+        db.commit()
+
+        StatsRepository(db).rebuild()
+        TaskCounterRepository(db).rebuild()
+        db.commit()
+    finally:
+        db.close()
+
+    return SeedResult(
+        user_ids=user_ids,
+        admin_id=admin_id,
+        tasks=tasks,
+        seconds=time.perf_counter() - started,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1k")
+    parser.add_argument("--tasks-per-user", type=int, default=100)
+    args = parser.parse_args()
+    result = seed(SCALES[args.scale], tasks_per_user=args.tasks_per_user)
+    print(
+        json.dumps(
+            {
+                "users": len(result.user_ids),
+                "tasks": result.tasks,
+                "seconds": round(result.seconds, 2),
+            }
+        )
+    )
@@ -11,4 +11,9 @@ else
   echo "Skipping migrations (MIGRATE_ON_START=false)."
 fi
 
+# Sem comando, sobe o servidor de produção (workers, reciclagem e drenagem)
+if [ "$#" -eq 0 ]; then
+  set -- python -m app.server
+fi
+
 exec "$@"
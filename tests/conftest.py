@@ -1,19 +1,28 @@
 import os
-from typing import Generator
+from typing import Callable, Generator, NamedTuple
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 os.environ["TESTING"] = "true"
 
+from app.core import sql_budget  # noqa: E402
 from app.core.config import settings  # noqa: E402
+from app.core.response_cache import task_list_cache  # noqa: E402
 from app.db.database import Base, get_db_session  # noqa: E402
 from app.main import app  # noqa: E402
+from app.repositories.task_counter_repository import (  # noqa: E402
+    TaskCounterRepository,
+)
+from app.security.principal_cache import principal_cache  # noqa: E402
+from app.security.rate_limit import rate_limiter  # noqa: E402
 
 engine = create_engine(settings.DATABASE_URL)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+sql_budget.track_engine(engine)
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -30,6 +39,45 @@ def create_test_database():
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_task_list_cache():
+    task_list_cache.clear()
+    yield
+    task_list_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def disable_rate_limiter():
+    """Os testes fazem muitos logins do mesmo IP; quem testa o limite o liga."""
+    rate_limiter.enabled = False
+    rate_limiter.backend.clear()
+    yield
+    rate_limiter.enabled = settings.RATE_LIMIT_ENABLED
+
+
+@pytest.fixture(autouse=True)
+def sql_budget_violations():
+    """Falha o teste se alguma rota estourar o orçamento de SQL."""
+    violations = []
+    sql_budget.violation_handlers.append(violations.append)
+    yield violations
+    sql_budget.violation_handlers.remove(violations.append)
+    assert not violations, "\n".join(str(v) for v in violations)
+
+
+@pytest.fixture(scope="function")
+def count_queries():
+    """`with count_queries() as log:` registra os statements do bloco."""
+    return lambda: sql_budget.capture_queries(engine)
+
+
 @pytest.fixture(scope="function")
 def db_session() -> Generator[Session, None, None]:
     db = TestingSessionLocal()
@@ -40,6 +88,17 @@ def db_session() -> Generator[Session, None, None]:
         db.close()
 
 
+@pytest.fixture(autouse=True)
+def check_task_counters():
+    """Falha o teste se `task_counters` divergir de `tasks` ao final."""
+    yield
+    db = TestingSessionLocal()
+    try:
+        assert TaskCounterRepository(db).find_inconsistencies() == []
+    finally:
+        db.close()
+
+
 @pytest.fixture(scope="function")
 def client(db_session: Session) -> Generator[TestClient, None, None]:
     def override_get_db_session():
@@ -51,3 +110,53 @@ def client(db_session: Session) -> Generator[TestClient, None, None]:
         yield c
 
     app.dependency_overrides.pop(get_db_session, None)
+
+
+@pytest.fixture(scope="function")
+def async_client() -> Generator[TestClient, None, None]:
+    """Cliente com as rotas servidas por `AsyncSession` (aiosqlite/asyncpg)."""
+    async_engine = create_async_engine(settings.ASYNC_DATABASE_URL)
+    sql_budget.track_engine(async_engine.sync_engine)
+    AsyncTestingSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+    async def override_get_db_session():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db_session] = override_get_db_session
+
+    with TestClient(app) as c:
+        yield c
+        c.portal.call(async_engine.dispose)
+
+    app.dependency_overrides.pop(get_db_session, None)
+
+
+class TestUser(NamedTuple):
+    headers: dict
+    id: int
+
+
+@pytest.fixture
+def create_user() -> Callable[[TestClient, str], TestUser]:
+    """Registra e autentica um usuário; devolve o header Bearer e o id."""
+
+    def _create_user(client: TestClient, email: str) -> TestUser:
+        reg = client.post(
+            "/api/auth/register",
+            json={"email": email, "password": "password123"},
+        )
+        login = client.post(
+            "/api/auth/login",
+            data={"username": email, "password": "password123"},
+        )
+        return TestUser(
+            headers={"Authorization": f"Bearer {login.json()['access_token']}"},
+            id=reg.json()["id"],
+        )
+
+    return _create_user
@@ -0,0 +1,67 @@
+from fastapi.testclient import TestClient
+
+
+def register_and_login(client: TestClient, email: str) -> dict:
+    reg = client.post(
+        "/api/auth/register",
+        json={"email": email, "password": "password123"},
+    )
+    assert reg.status_code == 201
+
+    login = client.post(
+        "/api/auth/login",
+        data={"username": email, "password": "password123"},
+    )
+    assert login.status_code == 200
+
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def test_async_task_crud(async_client: TestClient):
+    headers = register_and_login(async_client, "async_tasks@example.com")
+
+    created = async_client.post(
+        "/api/tasks/",
+        headers=headers,
+        json={"title": "Async", "description": "via AsyncSession"},
+    )
+    assert created.status_code == 201
+    task_id = created.json()["id"]
+
+    listed = async_client.get("/api/tasks/", headers=headers)
+    assert listed.status_code == 200
+    assert listed.json()["total"] == 1
+    assert listed.json()["items"][0]["id"] == task_id
+
+    updated = async_client.put(
+        f"/api/tasks/{task_id}",
+        headers=headers,
+        json={"status": "completed"},
+    )
+    assert updated.status_code == 200
+    assert updated.json()["status"] == "completed"
+
+    deleted = async_client.delete(f"/api/tasks/{task_id}", headers=headers)
+    assert deleted.status_code == 204
+
+    missing = async_client.get(f"/api/tasks/{task_id}", headers=headers)
+    assert missing.status_code == 404
+
+
+def test_async_profile(async_client: TestClient):
+    headers = register_and_login(async_client, "async_me@example.com")
+
+    resp = async_client.put(
+        "/api/users/me",
+        headers=headers,
+        json={"name": "Async User"},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["name"] == "Async User"
+
+    me = async_client.get("/api/users/me", headers=headers)
+    assert me.status_code == 200
+    assert me.json()["name"] == "Async User"
+
+    assert async_client.delete("/api/users/me", headers=headers).status_code == 204
+    assert async_client.get("/api/users/me", headers=headers).status_code == 401
@@ -1,5 +1,18 @@
+import asyncio
+import threading
+
+import anyio
+import httpx
+import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 
+from app.db.database import get_db_session
+from app.main import app
+from app.security import auth
+from app.security.hashing import HashingExecutor
+from tests.conftest import TestingSessionLocal
+
 
 def test_register_user_success(client: TestClient):
     resp = client.post(
@@ -61,3 +74,196 @@ def test_login_wrong_password(client: TestClient):
 
     assert resp.status_code == 401
     assert resp.json() == {"detail": "Incorrect email or password"}
+
+
+def test_hashing_executor_rejects_when_full():
+    release = threading.Event()
+    executor = HashingExecutor(max_workers=1, max_queue=1)
+
+    running = executor.submit(release.wait)
+    queued = executor.submit(release.wait)
+    with pytest.raises(HTTPException) as exc_info:
+        executor.submit(release.wait)
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers == {"Retry-After": "1"}
+    assert executor.pending == 2
+
+    release.set()
+    running.result(timeout=5)
+    queued.result(timeout=5)
+    assert executor.run(len, "abc") == 3
+
+
+def test_login_returns_503_when_hashing_is_saturated(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    client.post(
+        "/api/auth/register",
+        json={"email": "busy@example.com", "password": "password123"},
+    )
+
+    release = threading.Event()
+    saturated = HashingExecutor(max_workers=1, max_queue=0)
+    saturated.submit(release.wait)
+    monkeypatch.setattr(auth, "hashing_executor", saturated)
+
+    try:
+        resp = client.post(
+            "/api/auth/login",
+            data={"username": "busy@example.com", "password": "password123"},
+        )
+    finally:
+        release.set()
+
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
+
+
+def test_pending_hashes_do_not_hold_threadpool(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    client.post(
+        "/api/auth/register",
+        json={"email": "flood@example.com", "password": "password123"},
+    )
+    tokens = client.post(
+        "/api/auth/login",
+        data={"username": "flood@example.com", "password": "password123"},
+    ).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    release = threading.Event()
+    blocked = HashingExecutor(max_workers=1, max_queue=10)
+    blocked.submit(release.wait)
+    monkeypatch.setattr(auth, "hashing_executor", blocked)
+
+    # Requisições concorrentes: uma sessão por requisição
+    def session_per_request():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    monkeypatch.setitem(app.dependency_overrides, get_db_session, session_per_request)
+
+    async def flood():
+        anyio.to_thread.current_default_thread_limiter().total_tokens = 2
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as ac:
+            logins = [
+                asyncio.create_task(
+                    ac.post(
+                        "/api/auth/login",
+                        data={
+                            "username": "flood@example.com",
+                            "password": "password123",
+                        },
+                    )
+                )
+                for _ in range(5)
+            ]
+            await asyncio.sleep(0.3)
+            assert blocked.pending == 6
+
+            # Com 5 hashes na fila e 2 threads, a listagem ainda é atendida
+            try:
+                tasks = await asyncio.wait_for(
+                    ac.get("/api/tasks/", headers=headers), 10
+                )
+            finally:
+                release.set()
+            return tasks, await asyncio.gather(*logins)
+
+    tasks, logins = asyncio.run(flood())
+    assert tasks.status_code == 200
+    assert [resp.status_code for resp in logins] == [200] * 5
+
+
+def login(client: TestClient, email: str) -> dict:
+    client.post(
+        "/api/auth/register",
+        json={"email": email, "password": "password123"},
+    )
+    return client.post(
+        "/api/auth/login",
+        data={"username": email, "password": "password123"},
+    ).json()
+
+
+def refresh(client: TestClient, refresh_token: str):
+    return client.post("/api/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def test_refresh_rotates_without_password_hash(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+    count_queries,
+):
+    tokens = login(client, "refresh@example.com")
+
+    # Com o pool de hashing saturado, só um caminho sem bcrypt responde 200
+    release = threading.Event()
+    saturated = HashingExecutor(max_workers=1, max_queue=0)
+    saturated.submit(release.wait)
+    monkeypatch.setattr(auth, "hashing_executor", saturated)
+    try:
+        with count_queries() as log:
+            resp = refresh(client, tokens["refresh_token"])
+    finally:
+        release.set()
+
+    assert resp.status_code == 200
+    rotated = resp.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert log.count == 1
+    assert log.statements[0].startswith("UPDATE refresh_token_families")
+
+    me = client.get(
+        "/api/users/me",
+        headers={"Authorization": f"Bearer {rotated['access_token']}"},
+    )
+    assert me.status_code == 200
+    assert refresh(client, rotated["refresh_token"]).status_code == 200
+
+
+def test_refresh_token_reuse_revokes_family(client: TestClient):
+    tokens = login(client, "reuse@example.com")
+    rotated = refresh(client, tokens["refresh_token"]).json()
+
+    reused = refresh(client, tokens["refresh_token"])
+    assert reused.status_code == 401
+    assert reused.json() == {"detail": "Invalid refresh token"}
+    # O token legítimo da família também deixa de valer
+    assert refresh(client, rotated["refresh_token"]).status_code == 401
+
+    # Outro login abre uma família nova
+    assert (
+        refresh(client, login(client, "reuse@example.com")["refresh_token"]).status_code
+        == 200
+    )
+
+
+def test_token_types_are_not_interchangeable(client: TestClient):
+    tokens = login(client, "types@example.com")
+
+    as_access = client.get(
+        "/api/users/me",
+        headers={"Authorization": f"Bearer {tokens['refresh_token']}"},
+    )
+    assert as_access.status_code == 401
+    assert refresh(client, tokens["access_token"]).status_code == 401
+    assert refresh(client, "not-a-jwt").status_code == 401
+
+
+def test_deleting_account_revokes_refresh_tokens(client: TestClient):
+    tokens = login(client, "refresh_deleted@example.com")
+    client.delete(
+        "/api/users/me",
+        headers={"Authorization": f"Bearer {tokens['access_token']}"},
+    )
+
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
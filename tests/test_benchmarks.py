@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from benchmarks.common import summarize
+from benchmarks.compare import compare
+from benchmarks.http_suite import SCENARIOS, run_suite
+from benchmarks.partitioning import layout_ddl
+from benchmarks.partitioning import run as run_partitioning
+from benchmarks.serialization import default_path, fast_path, make_tasks
+from benchmarks.serialization import run as run_serialization
+
+
+def test_summarize_percentiles():
+    result = summarize([i / 1000 for i in range(1, 101)])
+    assert result["count"] == 100
+    assert result["p50_ms"] == 50.5
+    assert result["p99_ms"] > result["p95_ms"] > result["p50_ms"]
+
+
+def test_http_suite_smoke_covers_every_scenario():
+    result = asyncio.run(
+        run_suite(
+            tasks=40,
+            tasks_per_user=20,
+            concurrency=2,
+            requests=2,
+            hash_requests=1,
+        )
+    )
+
+    assert set(result["routes"]) == {scenario.name for scenario in SCENARIOS}
+    for name, route in result["routes"].items():
+        assert route["errors"] == 0, (name, route["statuses"])
+        assert route["count"] > 0
+        assert route["throughput_rps"] > 0
+    assert result["meta"]["users"] == 2
+    assert "tasks.list" in compare(result, result)
+
+
+def test_serialization_fast_path_matches_default():
+    tasks = make_tasks(3)
+    assert fast_path(tasks) == default_path(tasks)
+
+    [result] = run_serialization([2])
+    assert result["page_size"] == 2
+    assert result["speedup"] > 0
+
+
+def test_partitioning_benchmark_layouts():
+    partitioned = layout_ddl("partitioned", partitions=4)
+    assert sum("PARTITION OF tasks" in s for s in partitioned) == 4
+    assert any("PARTITION BY HASH (owner_id)" in s for s in partitioned)
+    assert not any("PARTITION" in s for s in layout_ddl("plain", partitions=4))
+
+    # Só roda contra Postgres
+    with pytest.raises(SystemExit):
+        run_partitioning(rows=10, owners=1, partitions=2, samples=1)
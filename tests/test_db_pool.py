@@ -0,0 +1,127 @@
+import logging
+import threading
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.db.pool import (
+    InstrumentedQueuePool,
+    configure_engine_pool,
+    ping_idle_connections,
+    pool_options,
+)
+
+
+@pytest.fixture
+def url(tmp_path) -> str:
+    return f"sqlite:///{tmp_path / 'pool.db'}"
+
+
+def counting_ping(engine, alive: bool = True) -> list:
+    """Troca o `do_ping` do dialeto por um que registra as chamadas."""
+    calls = []
+
+    def do_ping(dbapi_connection):
+        calls.append(dbapi_connection)
+        return alive
+
+    engine.dialect.do_ping = do_ping
+    return calls
+
+
+def test_pool_options_from_settings(url, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 3)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(settings, "DB_POOL_RECYCLE", 600)
+    monkeypatch.setattr(settings, "DB_PRE_PING", "idle")
+
+    options = pool_options(url, "test")
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_pre_ping"] is False
+    assert (options["pool_size"], options["max_overflow"]) == (3, 0)
+    assert options["pool_recycle"] == 600
+
+    engine = create_engine(url, **options)
+    assert engine.pool.size() == 3
+    engine.dispose()
+
+    monkeypatch.setattr(settings, "DB_PRE_PING", "always")
+    assert pool_options(url, "test")["pool_pre_ping"] is True
+
+
+def test_null_pool_for_external_pooler(url, monkeypatch):
+    monkeypatch.setattr(settings, "DB_NULL_POOL", True)
+
+    options = pool_options(url, "test")
+    assert options["poolclass"] is NullPool
+    assert "pool_size" not in options
+
+    engine = create_engine(url, **options)
+    configure_engine_pool(engine)
+    with engine.connect() as conn:
+        assert conn.scalar(text("SELECT 1")) == 1
+    assert not engine.pool.dispatch.checkout
+    engine.dispose()
+
+
+def test_idle_ping_only_after_idle_threshold(url):
+    engine = create_engine(url, poolclass=InstrumentedQueuePool, pool_size=1)
+    pings = counting_ping(engine)
+    ping_idle_connections(engine, idle_seconds=60)
+
+    for _ in range(3):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    assert pings == []
+
+    ping_engine = create_engine(url, poolclass=InstrumentedQueuePool, pool_size=1)
+    ping_pings = counting_ping(ping_engine)
+    ping_idle_connections(ping_engine, idle_seconds=0)
+    for _ in range(3):
+        with ping_engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    # A primeira conexão é nova; as duas seguintes voltam do pool
+    assert len(ping_pings) == 2
+
+    engine.dispose()
+    ping_engine.dispose()
+
+
+def test_idle_ping_replaces_dead_connection(url):
+    engine = create_engine(url, poolclass=InstrumentedQueuePool, pool_size=1)
+    ping_idle_connections(engine, idle_seconds=0)
+    connects = []
+    event.listen(engine, "connect", lambda *args: connects.append(1))
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    counting_ping(engine, alive=False)
+    with engine.connect() as conn:
+        assert conn.scalar(text("SELECT 1")) == 1
+
+    assert len(connects) == 2
+    engine.dispose()
+
+
+def test_slow_checkout_is_logged(url, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "DB_POOL_SLOW_CHECKOUT_SECONDS", 0.05)
+    engine = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_logging_name="slow",
+    )
+    holder = engine.connect()
+    release = threading.Timer(0.1, holder.close)
+    release.start()
+
+    with caplog.at_level(logging.WARNING, logger="app.db.pool"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    release.join()
+    assert "Pool slow: checkout waited" in caplog.text
+    engine.dispose()
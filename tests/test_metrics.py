@@ -0,0 +1,131 @@
+from typing import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.database import engine as app_engine
+from app.db.pool import InstrumentedQueuePool
+
+
+def sample(name: str, **labels) -> float:
+    return metrics.registry.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def instrumented_test_engine(db_session: Session) -> Generator[None, None, None]:
+    # Os testes usam um engine próprio (conftest), não o `engine` da app
+    bind = db_session.get_bind()
+    metrics.instrument_engine(bind, "test")
+    yield
+    metrics.uninstrument_engine(bind)
+
+
+def test_metrics_endpoint_reports_routes_by_template(client: TestClient, create_user):
+    headers = create_user(client, "metrics@example.com").headers
+    task_id = client.post("/api/tasks/", headers=headers, json={"title": "M"}).json()[
+        "id"
+    ]
+    before = sample(
+        "http_requests_total", method="GET", route="/api/tasks/{task_id}", status="200"
+    )
+
+    client.get(f"/api/tasks/{task_id}", headers=headers)
+    client.get("/api/nao-existe")
+
+    assert (
+        sample(
+            "http_requests_total",
+            method="GET",
+            route="/api/tasks/{task_id}",
+            status="200",
+        )
+        == before + 1
+    )
+    assert sample(
+        "http_requests_total", method="GET", route=metrics.UNMATCHED_ROUTE, status="404"
+    )
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert 'http_request_duration_seconds_bucket{le="0.005",method="GET"' in body
+    assert "threadpool_limit_threads" in body
+    assert "password_hash_queue_depth" in body
+    assert 'db_pool_checked_out{pool="primary"}' in body
+
+
+def test_db_statements_are_counted_per_request(
+    client: TestClient,
+    instrumented_test_engine,
+    create_user,
+):
+    headers = create_user(client, "metrics_db@example.com").headers
+    before_requests = sample("http_request_db_statements_count", route="/api/tasks/")
+    before_statements = sample("http_request_db_statements_sum", route="/api/tasks/")
+    before_total = sample("db_statements_total", engine="test")
+
+    client.post("/api/tasks/", headers=headers, json={"title": "Contada"})
+
+    statements = (
+        sample("http_request_db_statements_sum", route="/api/tasks/")
+        - before_statements
+    )
+    assert (
+        sample("http_request_db_statements_count", route="/api/tasks/")
+        == before_requests + 1
+    )
+    assert statements > 0
+    assert sample("db_statements_total", engine="test") - before_total >= statements
+    assert sample("http_request_db_seconds_sum", route="/api/tasks/") > 0
+
+
+def test_password_hash_time_is_recorded(client: TestClient):
+    before = sample("password_hash_duration_seconds_count", operation="hash")
+    client.post(
+        "/api/auth/register",
+        json={"email": "metrics_hash@example.com", "password": "password123"},
+    )
+    assert (
+        sample("password_hash_duration_seconds_count", operation="hash") == before + 1
+    )
+
+
+def test_pool_checkout_wait_is_observed():
+    assert isinstance(app_engine.pool, InstrumentedQueuePool)
+    before = sample("db_pool_checkout_wait_seconds_count", pool="primary")
+    with app_engine.connect():
+        assert sample("db_pool_waiting", pool="primary") == 0
+    assert sample("db_pool_checkout_wait_seconds_count", pool="primary") == before + 1
+
+
+def test_low_overhead_mode_skips_statement_events(db_session: Session, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_LOW_OVERHEAD", True)
+    bind = db_session.get_bind()
+    metrics.instrument_engine(bind, "low")
+    try:
+        assert bind not in metrics._listeners
+        assert "low" in metrics._engines
+    finally:
+        metrics.uninstrument_engine(bind)
+
+
+def test_failed_statements_leave_no_state(
+    db_session: Session, instrumented_test_engine
+):
+    before = sample("db_statements_total", engine="test")
+    connection = db_session.connection()
+    for _ in range(3):
+        with pytest.raises(OperationalError):
+            connection.execute(text("SELECT * FROM tabela_inexistente"))
+        db_session.rollback()
+        connection = db_session.connection()
+
+    assert "metrics_started" not in connection.info
+    db_session.execute(text("SELECT 1"))
+    assert sample("db_statements_total", engine="test") == before + 1
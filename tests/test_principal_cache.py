@@ -0,0 +1,98 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.schemas.user import UserRole
+from app.security.principal_cache import principal_cache
+from app.services.user_service import UserService
+
+
+def register_and_login(client: TestClient, email: str):
+    reg = client.post(
+        "/api/auth/register",
+        json={"email": email, "password": "password123"},
+    )
+    assert reg.status_code == 201
+
+    login = client.post(
+        "/api/auth/login",
+        data={"username": email, "password": "password123"},
+    )
+    assert login.status_code == 200
+
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    return headers, reg.json()["id"]
+
+
+def count_user_selects(db_session: Session, fn) -> int:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if (
+            statement.lstrip().upper().startswith("SELECT")
+            and "FROM users" in statement
+        ):
+            statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return len(statements)
+
+
+def test_second_request_skips_user_select(client: TestClient, db_session: Session):
+    headers, _ = register_and_login(client, "cache_hit@example.com")
+
+    first = count_user_selects(
+        db_session, lambda: client.get("/api/users/me", headers=headers)
+    )
+    second = count_user_selects(
+        db_session, lambda: client.get("/api/users/me", headers=headers)
+    )
+
+    assert first == 1
+    assert second == 0
+    assert principal_cache.hits == 1
+    assert principal_cache.misses == 1
+
+
+def test_profile_update_invalidates_cache(client: TestClient):
+    headers, _ = register_and_login(client, "cache_profile@example.com")
+    assert client.get("/api/users/me", headers=headers).json()["name"] is None
+
+    client.put("/api/users/me", headers=headers, json={"name": "Novo Nome"})
+
+    assert client.get("/api/users/me", headers=headers).json()["name"] == "Novo Nome"
+
+
+def test_delete_account_invalidates_cache(client: TestClient):
+    headers, _ = register_and_login(client, "cache_delete@example.com")
+    assert client.get("/api/users/me", headers=headers).status_code == 200
+
+    assert client.delete("/api/users/me", headers=headers).status_code == 204
+
+    assert client.get("/api/users/me", headers=headers).status_code == 401
+
+
+def test_role_change_invalidates_cache(client: TestClient, db_session: Session):
+    headers, user_id = register_and_login(client, "cache_role@example.com")
+    assert client.get("/api/admin/cache-stats", headers=headers).status_code == 403
+
+    UserService(db_session).change_role(user_id, UserRole.ADMIN)
+
+    # A troca de role revoga o token antigo; o novo já vê a role nova
+    assert client.get("/api/admin/cache-stats", headers=headers).status_code == 401
+    login = client.post(
+        "/api/auth/login",
+        data={"username": "cache_role@example.com", "password": "password123"},
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    resp = client.get("/api/admin/cache-stats", headers=headers)
+    assert resp.status_code == 200
+    stats = resp.json()
+    assert stats["size"] == 1
+    assert stats["hits"] + stats["misses"] >= 2
@@ -0,0 +1,189 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.jobs import purge_deleted as purge_job
+from app.models.refresh_token_family import RefreshTokenFamily
+from app.models.task import Task
+from app.models.task_archive import TaskArchive
+from app.models.task_counter import TaskCounter
+from app.models.user import User
+from app.models.user_archive import UserArchive
+from app.repositories.stats_repository import USERS_ACTIVE, StatsRepository
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def purge(monkeypatch):
+    monkeypatch.setattr(purge_job, "SessionLocal", TestingSessionLocal)
+    return lambda **kwargs: purge_job.purge_deleted(
+        retention_days=30, pause_seconds=0, **kwargs
+    )
+
+
+def age_deleted_at(db: Session, model, ids, days: int) -> None:
+    """Recua `deleted_at` como se a exclusão tivesse `days` dias."""
+    db.execute(
+        update(model)
+        .where(model.id.in_(ids))
+        .values(
+            deleted_at=datetime.now(timezone.utc).replace(tzinfo=None)
+            - timedelta(days=days)
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def test_purge_moves_only_expired_tasks(
+    client: TestClient, db_session: Session, purge, create_user
+):
+    headers, _ = create_user(client, "purge_tasks@example.com")
+    ids = [
+        client.post("/api/tasks/", headers=headers, json={"title": f"T{i}"}).json()[
+            "id"
+        ]
+        for i in range(6)
+    ]
+    for task_id in ids[:5]:
+        client.delete(f"/api/tasks/{task_id}", headers=headers)
+    expired, recent, live = ids[:4], ids[4], ids[5]
+    age_deleted_at(db_session, Task, expired, days=31)
+
+    result = purge(chunk_size=3)
+
+    assert result["tasks"]["rows"] == 4
+    assert result["tasks"]["rows_per_second"] > 0
+    db_session.expire_all()
+    remaining = db_session.scalars(select(Task.id).where(Task.id.in_(ids))).all()
+    assert sorted(remaining) == [recent, live]
+    archived = db_session.scalars(
+        select(TaskArchive).where(TaskArchive.id.in_(ids))
+    ).all()
+    assert sorted(a.id for a in archived) == expired
+    assert {a.title for a in archived} == {"T0", "T1", "T2", "T3"}
+
+    # A listagem e o total não mudam
+    listing = client.get("/api/tasks/", headers=headers).json()
+    assert [t["id"] for t in listing["items"]] == [live]
+    assert listing["total"] == 1
+
+    assert purge()["tasks"]["rows"] == 0
+
+
+def test_purge_archives_users_without_tasks(
+    client: TestClient, db_session: Session, purge, create_user
+):
+    headers, gone_id = create_user(client, "purge_gone@example.com")
+    task_id = client.post("/api/tasks/", headers=headers, json={"title": "T"}).json()[
+        "id"
+    ]
+    client.delete(f"/api/tasks/{task_id}", headers=headers)
+    client.delete("/api/users/me", headers=headers)
+
+    headers, keeps_id = create_user(client, "purge_keeps@example.com")
+    client.post("/api/tasks/", headers=headers, json={"title": "Still live"})
+    client.delete("/api/users/me", headers=headers)
+
+    age_deleted_at(db_session, Task, [task_id], days=40)
+    age_deleted_at(db_session, User, [gone_id, keeps_id], days=40)
+
+    result = purge()
+
+    assert result["users"]["rows"] == 1
+    db_session.expire_all()
+    assert db_session.get(User, gone_id) is None
+    assert db_session.get(UserArchive, gone_id).email == "purge_gone@example.com"
+    assert (
+        db_session.scalars(
+            select(TaskCounter).where(TaskCounter.owner_id == gone_id)
+        ).all()
+        == []
+    )
+    # A tarefa saiu junto com a conta, mas ainda está em `tasks` (excluída
+    # há pouco): o usuário continua na tabela quente
+    assert db_session.get(User, keeps_id) is not None
+    assert db_session.get(UserArchive, keeps_id) is None
+
+    assert not hasattr(UserArchive, "hashed_password")
+
+    # O e-mail arquivado pode ser usado num novo cadastro
+    reg = client.post(
+        "/api/auth/register",
+        json={"email": "purge_gone@example.com", "password": "password123"},
+    )
+    assert reg.status_code == 201
+
+
+def test_account_deletion_cascades_to_tasks(
+    client: TestClient, db_session: Session, create_user
+):
+    headers, user_id = create_user(client, "purge_cascade@example.com")
+    for i in range(3):
+        client.post("/api/tasks/", headers=headers, json={"title": f"T{i}"})
+
+    assert client.delete("/api/users/me", headers=headers).status_code == 204
+
+    deleted_at = db_session.scalars(
+        select(Task.deleted_at).where(Task.owner_id == user_id)
+    ).all()
+    assert len(deleted_at) == 3 and None not in deleted_at
+    assert db_session.scalars(
+        select(TaskCounter.total).where(TaskCounter.owner_id == user_id)
+    ).all() == [0]
+
+
+def test_purge_archives_users_deleted_with_live_tasks(
+    client: TestClient, db_session: Session, purge, create_user
+):
+    headers, user_id = create_user(client, "purge_legacy@example.com")
+    task_ids = [
+        client.post("/api/tasks/", headers=headers, json={"title": f"T{i}"}).json()[
+            "id"
+        ]
+        for i in range(2)
+    ]
+    # Exclusão anterior à cascata: as tarefas continuaram ativas
+    StatsRepository(db_session).increment({USERS_ACTIVE: -1}, shard_key=user_id)
+    age_deleted_at(db_session, User, [user_id], days=40)
+
+    result = purge()
+
+    assert result["owner_tasks"]["rows"] == 2
+    assert result["tasks"]["rows"] == 2
+    assert result["users"]["rows"] == 1
+    db_session.expire_all()
+    assert db_session.get(User, user_id) is None
+    assert db_session.get(UserArchive, user_id) is not None
+    archived = db_session.scalars(
+        select(TaskArchive).where(TaskArchive.id.in_(task_ids))
+    ).all()
+    assert len(archived) == 2
+
+
+def test_purge_deletes_stale_refresh_families(
+    client: TestClient, db_session: Session, purge, create_user
+):
+    _, user_id = create_user(client, "purge_refresh@example.com")
+    client.post(
+        "/api/auth/login",
+        data={"username": "purge_refresh@example.com", "password": "password123"},
+    )
+    stale, fresh = db_session.scalars(
+        select(RefreshTokenFamily.id).where(RefreshTokenFamily.user_id == user_id)
+    ).all()
+    db_session.execute(
+        update(RefreshTokenFamily)
+        .where(RefreshTokenFamily.id == stale)
+        .values(rotated_at=datetime(2000, 1, 1))
+        .execution_options(synchronize_session=False)
+    )
+    db_session.commit()
+
+    assert purge()["refresh_token_families"]["rows"] == 1
+    db_session.expire_all()
+    assert db_session.get(RefreshTokenFamily, stale) is None
+    assert db_session.get(RefreshTokenFamily, fresh) is not None
@@ -0,0 +1,253 @@
+import re
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.repositories.stats_repository import USERS_ACTIVE, StatsRepository
+from app.repositories.task_counter_repository import TaskCounterRepository
+from app.repositories.task_list_version_repository import TaskListVersionRepository
+from app.repositories.task_repository import TaskRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.task import TaskCreate, TaskStatus, TaskUpdate
+from app.services.task_service import TaskService
+
+OWNERS = 3
+TASKS_PER_OWNER = 300
+
+# Consultas por requisição que precisam de índice. Agregações globais
+# (dashboard, reconciliação, listagem admin) varrem a tabela por definição.
+QUERIES: Dict[str, Callable[[Session, dict], object]] = {
+    "task_get_by_id": lambda db, ctx: TaskRepository(db).get_by_id(
+        ctx["task_ids"][0], ctx["owner_id"]
+    ),
+    "task_list": lambda db, ctx: TaskRepository(db).list(
+        ctx["owner_id"], None, limit=25, offset=50
+    ),
+    "task_list_by_status": lambda db, ctx: TaskRepository(db).list(
+        ctx["owner_id"], TaskStatus.COMPLETED, limit=25, offset=0
+    ),
+    "task_list_after": lambda db, ctx: TaskRepository(db).list_after(
+        ctx["owner_id"], None, limit=25, after=(datetime(2100, 1, 1), 0)
+    ),
+    "task_list_after_by_status": lambda db, ctx: TaskRepository(db).list_after(
+        ctx["owner_id"], TaskStatus.PENDING, limit=25, after=(datetime(2100, 1, 1), 0)
+    ),
+    "task_count": lambda db, ctx: TaskRepository(db).count(
+        ctx["owner_id"], TaskStatus.PENDING
+    ),
+    "task_search": lambda db, ctx: TaskRepository(db).search(
+        ctx["owner_id"], "relatório", None, limit=25, offset=0
+    ),
+    "task_export": lambda db, ctx: db.execute(
+        TaskRepository(db).export_query(ctx["owner_id"], batch_size=100)
+    ).all(),
+    "task_get_statuses": lambda db, ctx: TaskRepository(db).get_statuses(
+        ctx["task_ids"][:10], ctx["owner_id"]
+    ),
+    "task_list_by_ids": lambda db, ctx: TaskRepository(db).list_by_ids(
+        ctx["task_ids"][:10], ctx["owner_id"]
+    ),
+    "task_counter_total": lambda db, ctx: TaskCounterRepository(db).total(
+        ctx["owner_id"], TaskStatus.PENDING
+    ),
+    "task_list_version": lambda db, ctx: TaskListVersionRepository(db).get(
+        ctx["owner_id"]
+    ),
+    "user_get_by_email": lambda db, ctx: UserRepository(db).get_by_email(ctx["email"]),
+    "user_get_by_id": lambda db, ctx: UserRepository(db).get_by_id(ctx["owner_id"]),
+}
+
+
+def _flush_update(db: Session, ctx: dict) -> None:
+    repo = TaskRepository(db)
+    task = repo.get_by_id(ctx["task_ids"][0], ctx["owner_id"])
+    repo.update(task, TaskUpdate(title="Renomeada"))
+    repo.delete(task)
+    db.flush()
+
+
+# Escritas por tarefa (sem commit). Com `tasks` particionada por owner_id,
+# toda leitura e escrita por requisição deve atingir uma única partição.
+TASK_WRITES: Dict[str, Callable[[Session, dict], object]] = {
+    "task_flush_update": _flush_update,
+    "task_update_many": lambda db, ctx: TaskRepository(db).update_many(
+        {ctx["task_ids"][1]: {"status": TaskStatus.COMPLETED}}, ctx["owner_id"]
+    ),
+    "task_delete_many": lambda db, ctx: TaskRepository(db).delete_many(
+        ctx["task_ids"][2:4], ctx["owner_id"]
+    ),
+}
+
+TASKS_TABLE = re.compile(r"\b(?:FROM|UPDATE|JOIN)\s+tasks\b", re.IGNORECASE)
+
+
+@pytest.fixture(scope="module")
+def seeded() -> dict:
+    """Popula alguns donos com tarefas ativas, concluídas e excluídas."""
+    from tests.conftest import TestingSessionLocal
+
+    db = TestingSessionLocal()
+    try:
+        owners = [
+            User(email=f"plans{i}@example.com", hashed_password="x")
+            for i in range(OWNERS)
+        ]
+        db.add_all(owners)
+        db.flush()
+        StatsRepository(db).increment({USERS_ACTIVE: OWNERS}, shard_key=0)
+        db.commit()
+
+        service = TaskService(db)
+        for owner in owners:
+            service.import_tasks(
+                [
+                    TaskCreate(title=f"Tarefa {i}", description="relatório semanal")
+                    for i in range(TASKS_PER_OWNER)
+                ],
+                owner.id,
+            )
+
+        owner_id = owners[0].id
+        task_ids = [task.id for task in TaskRepository(db).list(owner_id, None, 50, 0)]
+        for task_id in task_ids[:10]:
+            service.delete_task(task_id, owner_id)
+        db.connection().exec_driver_sql("ANALYZE")
+        db.commit()
+
+        return {
+            "owner_id": owner_id,
+            "email": owners[0].email,
+            "task_ids": task_ids[10:],
+        }
+    finally:
+        db.close()
+
+
+def capture_selects(
+    db: Session,
+    run: Callable[[], object],
+    kinds: tuple = ("SELECT",),
+) -> List[tuple]:
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(kinds):
+            if executemany:
+                parameters = parameters[0]
+            statements.append((statement, parameters))
+
+    bind = db.get_bind()
+    event.listen(bind, "before_cursor_execute", before_execute)
+    try:
+        run()
+    finally:
+        event.remove(bind, "before_cursor_execute", before_execute)
+    return statements
+
+
+def _postgres_seq_scans(node: dict) -> List[str]:
+    found = []
+    if node.get("Node Type") == "Seq Scan":
+        found.append(node["Relation Name"])
+    for child in node.get("Plans", []):
+        found.extend(_postgres_seq_scans(child))
+    return found
+
+
+def _postgres_relations(node: dict) -> List[str]:
+    found = [node["Relation Name"]] if "Relation Name" in node else []
+    for child in node.get("Plans", []):
+        found.extend(_postgres_relations(child))
+    return found
+
+
+def task_partitions(db: Session, statement: str, parameters) -> Optional[Set[str]]:
+    """
+    Partições de `tasks` no plano de `statement`, ou None quando a tabela
+    não é particionada (SQLite, ou Postgres criado por `create_all`).
+    """
+    conn = db.connection()
+    if conn.dialect.name != "postgresql":
+        return None
+    partitioned = conn.exec_driver_sql(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'tasks'::regclass"
+    ).scalar()
+    if not partitioned:
+        return None
+    plan = conn.exec_driver_sql(
+        "EXPLAIN (FORMAT JSON) " + statement, parameters
+    ).scalar()
+    return {
+        name
+        for name in _postgres_relations(plan[0]["Plan"])
+        if name.startswith("tasks_p")
+    }
+
+
+def seq_scans(db: Session, statement: str, parameters) -> List[str]:
+    """
+    Tabelas lidas por varredura completa no plano de `statement`. No
+    Postgres o seq scan é desestimulado (`enable_seqscan = off`): se ainda
+    aparece, nenhum índice serve à consulta.
+    """
+    conn = db.connection()
+    if conn.dialect.name == "postgresql":
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        plan = conn.exec_driver_sql(
+            "EXPLAIN (FORMAT JSON) " + statement, parameters
+        ).scalar()
+        return _postgres_seq_scans(plan[0]["Plan"])
+
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+    return [
+        row[3]
+        for row in rows
+        if row[3].startswith("SCAN ") and "VIRTUAL TABLE" not in row[3]
+    ]
+
+
+@pytest.mark.parametrize("name", sorted(QUERIES))
+def test_repository_query_uses_index(name: str, seeded: dict, db_session: Session):
+    statements = capture_selects(db_session, lambda: QUERIES[name](db_session, seeded))
+    assert statements
+
+    for statement, parameters in statements:
+        assert seq_scans(db_session, statement, parameters) == [], statement
+    db_session.rollback()
+
+
+def test_plan_check_detects_seq_scan(seeded: dict, db_session: Session):
+    statements = capture_selects(
+        db_session,
+        lambda: db_session.query(User).filter(User.name == "x").all(),
+    )
+    assert seq_scans(db_session, *statements[0])
+    db_session.rollback()
+
+
+@pytest.mark.parametrize("name", sorted({**QUERIES, **TASK_WRITES}))
+def test_task_statements_prune_to_owner_partition(
+    name: str, seeded: dict, db_session: Session
+):
+    run = {**QUERIES, **TASK_WRITES}[name]
+    statements = [
+        (statement, parameters)
+        for statement, parameters in capture_selects(
+            db_session, lambda: run(db_session, seeded), kinds=("SELECT", "UPDATE")
+        )
+        if TASKS_TABLE.search(statement)
+    ]
+    if not statements:
+        pytest.skip("não lê nem escreve em tasks")
+
+    for statement, parameters in statements:
+        # Sem owner_id no WHERE o Postgres não consegue podar partições
+        assert "tasks.owner_id =" in statement, statement
+        partitions = task_partitions(db_session, statement, parameters)
+        if partitions is not None:
+            assert len(partitions) == 1, (statement, partitions)
+    db_session.rollback()
@@ -0,0 +1,136 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.security import auth
+from app.security.rate_limit import (
+    InMemoryTokenBucketBackend,
+    RateLimit,
+    RateLimiter,
+    client_ip,
+    parse_rate_limit,
+    rate_limiter,
+)
+
+
+class SharedBucketsFake:
+    """Backend compartilhado de mentira: os baldes de vários limiters num dict."""
+
+    def __init__(self):
+        self.store = InMemoryTokenBucketBackend(max_keys=1000)
+        self.calls = []
+
+    def take(self, key: str, limit: RateLimit) -> float:
+        self.calls.append(key)
+        return self.store.take(key, limit)
+
+    def clear(self) -> None:
+        self.store.clear()
+
+
+def make_request(client_host: str = "10.0.0.1", forwarded_for: str = None) -> Request:
+    headers = []
+    if forwarded_for is not None:
+        headers.append((b"x-forwarded-for", forwarded_for.encode()))
+    return Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "headers": headers,
+            "client": (client_host, 1234),
+        }
+    )
+
+
+@pytest.fixture
+def limited(monkeypatch):
+    """Limiter global ligado, com limites pequenos para o teste."""
+    monkeypatch.setattr(
+        rate_limiter,
+        "limits",
+        {
+            "login": {"ip": RateLimit(5, 60), "email": RateLimit(2, 60)},
+            "register": {"ip": RateLimit(2, 60), "email": None},
+        },
+    )
+    rate_limiter.enabled = True
+    return rate_limiter
+
+
+def test_login_rejected_before_db_and_hashing(
+    client: TestClient, limited, monkeypatch, count_queries
+):
+    client.post(
+        "/api/auth/register",
+        json={"email": "limited@example.com", "password": "password123"},
+    )
+    form = {"username": "limited@example.com", "password": "wrong"}
+    assert client.post("/api/auth/login", data=form).status_code == 401
+    assert client.post("/api/auth/login", data=form).status_code == 401
+
+    def fail(*args):
+        raise AssertionError("bcrypt called for a rate-limited request")
+
+    monkeypatch.setattr(auth, "_timed_verify", fail)
+    with count_queries() as log:
+        resp = client.post("/api/auth/login", data=form)
+    assert resp.status_code == 429
+    assert log.count == 0
+    assert int(resp.headers["Retry-After"]) >= 1
+    # O e-mail vale sem diferenciar maiúsculas
+    form["username"] = "LIMITED@example.com"
+    assert client.post("/api/auth/login", data=form).status_code == 429
+
+
+def test_ip_limit_spans_emails(client: TestClient, limited):
+    statuses = [
+        client.post(
+            "/api/auth/register",
+            json={"email": f"limited_ip{i}@example.com", "password": "password123"},
+        ).status_code
+        for i in range(3)
+    ]
+    assert statuses == [201, 201, 429]
+
+
+def test_token_bucket_refills():
+    backend = InMemoryTokenBucketBackend(max_keys=10)
+    limit = RateLimit(capacity=2, per_seconds=0.1)
+
+    assert backend.take("k", limit) == 0
+    assert backend.take("k", limit) == 0
+    wait = backend.take("k", limit)
+    assert 0 < wait <= 0.05
+
+    time.sleep(wait + 0.01)
+    assert backend.take("k", limit) == 0
+
+
+def test_shared_backend_is_shared_between_limiters():
+    shared = SharedBucketsFake()
+    limits = {"login": {"ip": RateLimit(2, 60), "email": None}}
+    worker_a = RateLimiter(shared, limits)
+    worker_b = RateLimiter(shared, limits)
+
+    worker_a.check("login", make_request(), "a@example.com")
+    worker_b.check("login", make_request(), "a@example.com")
+    with pytest.raises(HTTPException) as exc_info:
+        worker_a.check("login", make_request(), "a@example.com")
+
+    assert exc_info.value.status_code == 429
+    assert shared.calls == ["login:ip:10.0.0.1"] * 3
+
+
+def test_client_ip_and_parse():
+    assert client_ip(make_request("10.0.0.1", "1.2.3.4, 5.6.7.8")) == "10.0.0.1"
+    assert client_ip(make_request("10.0.0.1", "1.2.3.4, 5.6.7.8"), 1) == "5.6.7.8"
+    assert client_ip(make_request("10.0.0.1", "1.2.3.4, 5.6.7.8"), 2) == "1.2.3.4"
+    assert client_ip(make_request("10.0.0.1"), 1) == "10.0.0.1"
+
+    assert parse_rate_limit("10/60") == RateLimit(10, 60.0)
+    assert parse_rate_limit("") is None
+    with pytest.raises(ValueError):
+        parse_rate_limit("0/60")
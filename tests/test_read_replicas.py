@@ -0,0 +1,147 @@
+import time
+from typing import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from app.db import database
+from app.db.database import Base
+from app.db.routing import InMemoryRecentWritesBackend, SessionRouter, request_subject
+from app.main import app
+from app.models.user import User
+from app.security.auth import create_access_token
+from tests.conftest import TestingSessionLocal
+from tests.conftest import engine as primary_engine
+
+
+def make_request(method: str, token: str = None) -> Request:
+    headers = []
+    if token is not None:
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    return Request({"type": "http", "method": method, "headers": headers})
+
+
+@pytest.fixture
+def replica_engine(tmp_path):
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(bind=replica)
+    yield replica
+    replica.dispose()
+
+
+@pytest.fixture
+def replica_router(replica_engine, monkeypatch) -> SessionRouter:
+    """Banco de teste como primário e `replica_engine` como réplica."""
+    router = SessionRouter(
+        TestingSessionLocal,
+        [sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)],
+        window_seconds=60,
+        recent_writes=InMemoryRecentWritesBackend(max_size=100),
+    )
+    monkeypatch.setattr(database, "session_router", router)
+    return router
+
+
+@pytest.fixture
+def replica_client(replica_router) -> Generator[TestClient, None, None]:
+    """App real, sem override de `get_db_session`."""
+    with TestClient(app) as client:
+        yield client
+
+
+def replicate_user(replica_engine, email: str) -> None:
+    """Copia o usuário do primário, como a replicação faria."""
+    with primary_engine.connect() as primary:
+        row = primary.execute(select(User.__table__).where(User.email == email)).one()
+    with replica_engine.begin() as replica:
+        replica.execute(insert(User.__table__), [dict(row._mapping)])
+
+
+def register(client: TestClient, email: str) -> dict:
+    client.post(
+        "/api/auth/register",
+        json={"email": email, "password": "password123"},
+    )
+    login = client.post(
+        "/api/auth/login",
+        data={"username": email, "password": "password123"},
+    )
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def test_reads_follow_writes_then_move_to_replica(
+    replica_client, replica_router, replica_engine
+):
+    headers = register(replica_client, "replica_rw@example.com")
+    replicate_user(replica_engine, "replica_rw@example.com")
+
+    task_id = replica_client.post(
+        "/api/tasks/", headers=headers, json={"title": "Only on primary"}
+    ).json()["id"]
+
+    # Dentro da janela: lê do primário e enxerga a própria escrita
+    assert (
+        replica_client.get(f"/api/tasks/{task_id}", headers=headers).status_code == 200
+    )
+    titles = [
+        t["title"]
+        for t in replica_client.get("/api/tasks/", headers=headers).json()["items"]
+    ]
+    assert titles == ["Only on primary"]
+
+    # Fora da janela: lê da réplica, que ainda não recebeu a tarefa
+    replica_router.recent_writes.clear()
+    assert (
+        replica_client.get(f"/api/tasks/{task_id}", headers=headers).status_code == 404
+    )
+    assert replica_client.get("/api/tasks/", headers=headers).json()["items"] == []
+
+
+def test_session_router_choice():
+    primary, replica_a, replica_b = object(), object(), object()
+    router = SessionRouter(
+        primary,
+        [replica_a, replica_b],
+        window_seconds=0.05,
+        recent_writes=InMemoryRecentWritesBackend(max_size=10),
+    )
+    token = create_access_token({"sub": "42"})
+
+    assert router.session_factory(make_request("GET")) is replica_a
+    assert router.session_factory(make_request("GET", token)) is replica_b
+    assert router.session_factory(make_request("PUT", token)) is primary
+    assert router.session_factory(make_request("GET", token)) is primary
+    # Outro usuário não é afetado pela escrita
+    other = create_access_token({"sub": "43"})
+    assert router.session_factory(make_request("GET", other)) is replica_a
+
+    time.sleep(0.06)
+    assert router.session_factory(make_request("GET", token)) is replica_b
+
+
+def test_without_replicas_everything_goes_to_primary():
+    primary = object()
+    router = SessionRouter(
+        primary, [], window_seconds=5, recent_writes=InMemoryRecentWritesBackend(10)
+    )
+    assert router.session_factory(make_request("GET")) is primary
+
+
+def test_request_subject_and_recent_writes_limit():
+    assert (
+        request_subject(make_request("GET", create_access_token({"sub": "7"}))) == "7"
+    )
+    assert request_subject(make_request("GET", "not-a-jwt")) is None
+    assert request_subject(make_request("GET")) is None
+
+    backend = InMemoryRecentWritesBackend(max_size=2)
+    for subject in ("1", "2", "3"):
+        backend.mark(subject, 60)
+    assert not backend.is_recent("1")
+    assert backend.is_recent("2") and backend.is_recent("3")
+
+    backend.mark("4", 0)
+    assert not backend.is_recent("4")
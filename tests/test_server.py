@@ -0,0 +1,109 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import pytest
+from sqlalchemy import create_engine
+
+from app.core.config import settings
+from app.db.database import Base
+from app.db.pool import worker_pool_limits
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(url: str, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.TransportError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def test_worker_pool_limits_fit_connection_cap(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 5)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 10)
+
+    # Teto folgado: mantém o configurado
+    assert worker_pool_limits(100, workers=4) == (5, 10)
+    assert worker_pool_limits(40, workers=4) == (5, 5)
+    assert worker_pool_limits(16, workers=4, engines_per_database=2) == (2, 0)
+
+    with pytest.raises(ValueError):
+        worker_pool_limits(3, workers=4)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_server_recycles_workers_and_drains_on_sigterm(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'server.db'}"
+    Base.metadata.create_all(bind=create_engine(db_url))
+
+    port = free_port()
+    env = {
+        **os.environ,
+        "TEST_DATABASE_URL": db_url,
+        "SERVER_MAX_REQUESTS": "3",
+        "SERVER_GRACEFUL_TIMEOUT_SECONDS": "5",
+        "DB_MAX_CONNECTIONS": "4",
+    }
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "app.server",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            "2",
+        ],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        url = f"http://127.0.0.1:{port}/health"
+        wait_until_up(url)
+
+        # Cada worker é reciclado depois de 3 requisições, sem derrubar nenhuma
+        statuses = [httpx.get(url, timeout=5.0).status_code for _ in range(12)]
+        assert statuses == [200] * 12
+
+        # Requisição em andamento: cabeçalhos e metade do corpo enviados
+        body = b'{"email": "drain@example.com", "password": "password123"}'
+        half = len(body) // 2
+        with socket.create_connection(("127.0.0.1", port), timeout=10) as conn:
+            conn.sendall(
+                b"POST /api/auth/register HTTP/1.1\r\nHost: test\r\n"
+                b"Content-Type: application/json\r\n"
+                b"Content-Length: %d\r\n\r\n" % len(body) + body[:half]
+            )
+            time.sleep(0.5)
+
+            process.send_signal(signal.SIGTERM)
+            time.sleep(1.0)
+            assert process.poll() is None
+
+            # O worker espera a requisição terminar antes de sair
+            conn.sendall(body[half:])
+            response = conn.recv(4096)
+        assert response.startswith(b"HTTP/1.1 201")
+
+        assert process.wait(timeout=15) == 0
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
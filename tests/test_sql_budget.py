@@ -0,0 +1,115 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+
+from app.core.sql_budget import (
+    QueryLog,
+    SqlBudget,
+    SqlBudgetMiddleware,
+    check_budget,
+    sql_budget,
+    statement_shape,
+)
+from app.models.task import Task
+from tests.conftest import engine
+
+
+def budget_app() -> FastAPI:
+    """App mínima com uma rota N+1 e outra com orçamento declarado."""
+    app = FastAPI()
+    app.add_middleware(SqlBudgetMiddleware)
+
+    @app.get("/n-plus-one")
+    def n_plus_one():
+        with engine.connect() as conn:
+            for task_id in range(5):
+                conn.execute(select(Task.id).where(Task.id == task_id))
+        return {}
+
+    @app.get("/budgeted")
+    @sql_budget(max_statements=1)
+    def budgeted():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        return {}
+
+    return app
+
+
+def test_statement_shape_collapses_in_lists():
+    assert statement_shape(
+        "SELECT id FROM tasks\n WHERE id IN (?, ?, ?) AND owner_id = ?"
+    ) == statement_shape("SELECT id FROM tasks WHERE id IN (?, ?) AND owner_id = ?")
+    assert statement_shape("WHERE id IN (%(id_1)s, %(id_2)s)") == "WHERE id IN (?)"
+
+
+def test_check_budget():
+    log = QueryLog()
+    for _ in range(4):
+        log.record("SELECT 1")
+
+    assert (
+        check_budget(log, SqlBudget(max_statements=4, max_repeats=4), "GET", "/x")
+        is None
+    )
+
+    violation = check_budget(
+        log, SqlBudget(max_statements=3, max_repeats=5), "GET", "/x"
+    )
+    assert violation.repeated == {}
+    assert "4 statements (budget 3)" in str(violation)
+
+    violation = check_budget(log, SqlBudget(max_repeats=3), "GET", "/x")
+    assert violation.repeated == {"SELECT 1": 4}
+
+    assert check_budget(log, SqlBudget(check_repeats=False), "GET", "/x") is None
+
+
+def test_repeated_statement_is_reported(sql_budget_violations, caplog):
+    with TestClient(budget_app()) as client, caplog.at_level(logging.WARNING):
+        assert client.get("/n-plus-one").status_code == 200
+
+    assert len(sql_budget_violations) == 1
+    violation = sql_budget_violations.pop()
+    assert violation.route == "/n-plus-one"
+    assert list(violation.repeated.values()) == [5]
+    assert "SQL budget exceeded on GET /n-plus-one" in caplog.text
+
+
+def test_route_budget_is_enforced(sql_budget_violations):
+    with TestClient(budget_app()) as client:
+        assert client.get("/budgeted").status_code == 200
+
+    violation = sql_budget_violations.pop()
+    assert (violation.statements, violation.max_statements) == (2, 1)
+    assert sql_budget_violations == []
+
+
+def test_update_task_skips_refresh_select(
+    client: TestClient, count_queries, create_user
+):
+    headers = create_user(client, "budget_update@example.com").headers
+    task_id = client.post("/api/tasks/", headers=headers, json={"title": "T"}).json()[
+        "id"
+    ]
+
+    with count_queries() as log:
+        response = client.put(
+            f"/api/tasks/{task_id}",
+            headers=headers,
+            json={"title": "U", "status": "completed"},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["title"] == "U"
+    assert response.json()["status"] == "completed"
+    # Depois do UPDATE ... RETURNING não há SELECT de refresh na tarefa
+    update_at = next(
+        i for i, s in enumerate(log.statements) if s.startswith("UPDATE tasks")
+    )
+    assert not any(
+        s.startswith("SELECT") and "FROM tasks" in s for s in log.statements[update_at:]
+    )
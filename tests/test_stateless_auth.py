@@ -0,0 +1,141 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.repositories.user_repository import UserRepository
+from app.schemas.user import UserRole
+from app.security.principal_cache import principal_cache
+from app.security.token_versions import refresh_token_versions, token_versions
+from app.services.user_service import UserService
+
+
+def login(client: TestClient, email: str, password: str = "password123") -> dict:
+    resp = client.post(
+        "/api/auth/login",
+        data={"username": email, "password": password},
+    )
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+def register_and_login(client: TestClient, email: str):
+    reg = client.post(
+        "/api/auth/register",
+        json={"email": email, "password": "password123"},
+    )
+    return login(client, email), reg.json()["id"]
+
+
+@pytest.fixture
+def stateless(monkeypatch):
+    monkeypatch.setattr(settings, "STATELESS_AUTH", True)
+    token_versions.clear()
+    refresh_token_versions()
+    yield token_versions
+    token_versions.clear()
+
+
+def user_selects(log) -> list:
+    return [s for s in log.statements if "FROM users" in s]
+
+
+def test_task_routes_authenticate_without_queries(
+    client: TestClient, stateless, count_queries
+):
+    headers, _ = register_and_login(client, "stateless@example.com")
+    task_id = client.post("/api/tasks/", headers=headers, json={"title": "T"}).json()[
+        "id"
+    ]
+    principal_cache.clear()
+
+    with count_queries() as log:
+        assert client.get(f"/api/tasks/{task_id}", headers=headers).status_code == 200
+
+    assert user_selects(log) == []
+    assert log.count == 1
+    assert principal_cache.misses == 0
+
+
+def test_password_change_revokes_old_tokens(client: TestClient, stateless):
+    headers, _ = register_and_login(client, "stateless_pw@example.com")
+
+    resp = client.put(
+        "/api/users/me", headers=headers, json={"new_password": "newpassword456"}
+    )
+    assert resp.status_code == 200
+
+    # Revogação feita por este worker vale na hora
+    assert client.get("/api/tasks/", headers=headers).status_code == 401
+    new_headers = login(client, "stateless_pw@example.com", "newpassword456")
+    assert client.get("/api/tasks/", headers=new_headers).status_code == 200
+
+
+def test_revocation_by_other_worker_applies_on_refresh(
+    client: TestClient, db_session: Session, stateless
+):
+    headers, user_id = register_and_login(client, "stateless_other@example.com")
+
+    # Outro worker revogou: este só fica sabendo na próxima recarga
+    UserRepository(db_session).revoke_tokens(user_id)
+    db_session.commit()
+    assert client.get("/api/tasks/", headers=headers).status_code == 200
+
+    assert refresh_token_versions() >= 1
+    assert client.get("/api/tasks/", headers=headers).status_code == 401
+
+
+def test_deleted_account_and_role_change_revoke_tokens(
+    client: TestClient, db_session: Session, stateless
+):
+    headers, _ = register_and_login(client, "stateless_delete@example.com")
+    assert client.delete("/api/users/me", headers=headers).status_code == 204
+    assert client.get("/api/tasks/", headers=headers).status_code == 401
+
+    headers, user_id = register_and_login(client, "stateless_role@example.com")
+    UserService(db_session).change_role(user_id, UserRole.ADMIN)
+    assert client.get("/api/admin/cache-stats", headers=headers).status_code == 401
+
+    headers = login(client, "stateless_role@example.com")
+    assert client.get("/api/admin/cache-stats", headers=headers).status_code == 200
+
+
+def test_stale_map_falls_back_to_database(client: TestClient, stateless, count_queries):
+    headers, _ = register_and_login(client, "stateless_stale@example.com")
+    stateless.replace([], started_at=time.monotonic() - 60)
+    assert not stateless.is_fresh()
+
+    with count_queries() as log:
+        assert client.get("/api/tasks/", headers=headers).status_code == 200
+    assert len(user_selects(log)) == 1
+
+
+def test_get_me_reads_name_from_database(client: TestClient, stateless):
+    headers, _ = register_and_login(client, "stateless_me@example.com")
+    client.put("/api/users/me", headers=headers, json={"name": "Novo Nome"})
+
+    me = client.get("/api/users/me", headers=headers).json()
+    assert me["name"] == "Novo Nome"
+
+
+def test_stale_map_still_rejects_revoked_tokens(client: TestClient, stateless):
+    headers, _ = register_and_login(client, "stateless_stale_revoked@example.com")
+    client.put(
+        "/api/users/me", headers=headers, json={"new_password": "newpassword456"}
+    )
+
+    stateless.replace([], started_at=time.monotonic() - 60)
+    assert client.get("/api/tasks/", headers=headers).status_code == 401
+
+
+def test_database_path_checks_token_version(client: TestClient, db_session: Session):
+    headers, user_id = register_and_login(client, "version_db@example.com")
+    assert client.get("/api/tasks/", headers=headers).status_code == 200
+
+    # Revogação por outro worker: o principal em cache ainda tem a versão antiga
+    UserRepository(db_session).revoke_tokens(user_id)
+    db_session.commit()
+    new_headers = login(client, "version_db@example.com")
+    assert client.get("/api/tasks/", headers=new_headers).status_code == 200
+    assert client.get("/api/tasks/", headers=headers).status_code == 401
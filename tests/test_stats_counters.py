@@ -0,0 +1,67 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.stats_counter import StatsCounter
+from app.repositories.stats_repository import (
+    TASKS_ACTIVE,
+    USERS_ACTIVE,
+    StatsRepository,
+    tasks_by_status,
+)
+from app.repositories.task_repository import TaskRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.task import TaskStatus
+
+PENDING = tasks_by_status(TaskStatus.PENDING)
+COMPLETED = tasks_by_status(TaskStatus.COMPLETED)
+
+
+def register_and_login(client: TestClient, email: str) -> dict:
+    client.post(
+        "/api/auth/register",
+        json={"email": email, "password": "password123"},
+    )
+    login = client.post(
+        "/api/auth/login",
+        data={"username": email, "password": "password123"},
+    )
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def expected_totals(db_session: Session) -> dict:
+    task_repo = TaskRepository(db_session)
+    return {
+        USERS_ACTIVE: UserRepository(db_session).count_active(),
+        TASKS_ACTIVE: task_repo.count_all_active(),
+        PENDING: task_repo.count_by_status(TaskStatus.PENDING),
+        COMPLETED: task_repo.count_by_status(TaskStatus.COMPLETED),
+    }
+
+
+def test_counters_follow_task_lifecycle(client: TestClient, db_session: Session):
+    headers = register_and_login(client, "counters@example.com")
+    before = StatsRepository(db_session).totals()
+
+    created = client.post("/api/tasks/", headers=headers, json={"title": "T"})
+    task_id = created.json()["id"]
+    client.put(f"/api/tasks/{task_id}", headers=headers, json={"status": "completed"})
+    client.post("/api/tasks/", headers=headers, json={"title": "U"})
+    client.delete(f"/api/tasks/{task_id}", headers=headers)
+
+    after = StatsRepository(db_session).totals()
+    assert after[TASKS_ACTIVE] - before.get(TASKS_ACTIVE, 0) == 1
+    assert after[PENDING] - before.get(PENDING, 0) == 1
+    assert after.get(COMPLETED, 0) == before.get(COMPLETED, 0)
+    assert after == {**before, **expected_totals(db_session)}
+
+
+def test_rebuild_fixes_drift(client: TestClient, db_session: Session):
+    register_and_login(client, "drift@example.com")
+    db_session.add(StatsCounter(name=TASKS_ACTIVE, shard=999, value=42))
+    db_session.commit()
+
+    rebuilt = StatsRepository(db_session).rebuild()
+    db_session.commit()
+
+    assert rebuilt == expected_totals(db_session)
+    assert StatsRepository(db_session).totals() == rebuilt
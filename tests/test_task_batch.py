@@ -0,0 +1,112 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+def test_batch_mixed_operations(client: TestClient, create_user):
+    headers = create_user(client, "batch@example.com").headers
+    other = create_user(client, "batch_other@example.com").headers
+
+    existing = [
+        client.post("/api/tasks/", headers=headers, json={"title": f"T{i}"}).json()
+        for i in range(3)
+    ]
+    foreign = client.post("/api/tasks/", headers=other, json={"title": "X"}).json()
+
+    resp = client.post(
+        "/api/tasks/batch",
+        headers=headers,
+        json={
+            "operations": [
+                {"op": "create", "title": "Nova"},
+                {"op": "update", "id": existing[0]["id"], "status": "completed"},
+                {"op": "update", "id": existing[1]["id"], "title": "Renomeada"},
+                {"op": "delete", "id": existing[2]["id"]},
+                {"op": "delete", "id": foreign["id"]},
+                {"op": "update", "id": existing[0]["id"], "title": "De novo"},
+            ]
+        },
+    )
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+
+    assert [r["status"] for r in results] == [201, 200, 200, 204, 404, 409]
+    assert results[0]["task"]["title"] == "Nova"
+    assert results[0]["task"]["status"] == "pending"
+    assert results[1]["task"]["status"] == "completed"
+    assert results[2]["task"]["title"] == "Renomeada"
+
+    listed = client.get("/api/tasks/", headers=headers).json()
+    assert listed["total"] == 3
+    assert {t["title"] for t in listed["items"]} == {"Nova", "T0", "Renomeada"}
+    assert client.get(f"/api/tasks/{foreign['id']}", headers=other).status_code == 200
+
+
+def test_batch_uses_set_based_statements(
+    client: TestClient, db_session: Session, create_user
+):
+    headers = create_user(client, "batch_bulk@example.com").headers
+    created = client.post(
+        "/api/tasks/batch",
+        headers=headers,
+        json={"operations": [{"op": "create", "title": f"T{i}"} for i in range(50)]},
+    ).json()["results"]
+    ids = [r["task"]["id"] for r in created]
+
+    operations = [
+        {"op": "update", "id": task_id, "title": f"Editada {task_id}"}
+        for task_id in ids[:25]
+    ] + [{"op": "delete", "id": task_id} for task_id in ids[25:]]
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        resp = client.post(
+            "/api/tasks/batch",
+            headers=headers,
+            json={"operations": operations},
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert resp.status_code == 200
+    assert all(r["status"] in (200, 204) for r in resp.json()["results"])
+    assert len(statements) <= 8
+
+
+def test_batch_rejects_too_many_operations(client: TestClient, create_user):
+    headers = create_user(client, "batch_limit@example.com").headers
+    resp = client.post(
+        "/api/tasks/batch",
+        headers=headers,
+        json={"operations": [{"op": "create", "title": "T"}] * 501},
+    )
+    assert resp.status_code == 422
+
+
+def test_batch_rejects_null_required_fields(client: TestClient, create_user):
+    headers = create_user(client, "batch_null@example.com").headers
+    task_id = client.post("/api/tasks/", headers=headers, json={"title": "T"}).json()[
+        "id"
+    ]
+
+    for field in ("title", "status"):
+        resp = client.post(
+            "/api/tasks/batch",
+            headers=headers,
+            json={"operations": [{"op": "update", "id": task_id, field: None}]},
+        )
+        assert resp.status_code == 422
+
+    # `description` aceita null
+    resp = client.post(
+        "/api/tasks/batch",
+        headers=headers,
+        json={"operations": [{"op": "update", "id": task_id, "description": None}]},
+    )
+    assert resp.json()["results"][0]["status"] == 200
@@ -0,0 +1,62 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.task_counter import TaskCounter
+from app.repositories.task_counter_repository import TaskCounterRepository
+
+
+def test_list_total_comes_from_counters(
+    client: TestClient, db_session: Session, create_user
+):
+    headers, _ = create_user(client, "owner_counters@example.com")
+    ids = [
+        client.post("/api/tasks/", headers=headers, json={"title": f"T{i}"}).json()[
+            "id"
+        ]
+        for i in range(3)
+    ]
+    client.put(f"/api/tasks/{ids[0]}", headers=headers, json={"status": "completed"})
+    client.delete(f"/api/tasks/{ids[1]}", headers=headers)
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        all_tasks = client.get("/api/tasks/", headers=headers).json()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert all_tasks["total"] == 2
+    assert not any("count(" in s.lower() for s in statements)
+
+    pending = client.get("/api/tasks/?status_filter=pending", headers=headers).json()
+    completed = client.get(
+        "/api/tasks/?status_filter=completed", headers=headers
+    ).json()
+    assert pending["total"] == 1
+    assert completed["total"] == 1
+
+
+def test_rebuild_repairs_owner_counters(
+    client: TestClient, db_session: Session, create_user
+):
+    headers, user_id = create_user(client, "repair@example.com")
+    client.post("/api/tasks/", headers=headers, json={"title": "T"})
+
+    counter = db_session.get(TaskCounter, (user_id, "pending"))
+    counter.total = 10
+    db_session.commit()
+
+    repo = TaskCounterRepository(db_session)
+    assert repo.find_inconsistencies(user_id) == [(user_id, "pending", 10, 1)]
+
+    assert repo.rebuild(user_id) == 1
+    db_session.commit()
+
+    assert repo.find_inconsistencies() == []
+    assert client.get("/api/tasks/", headers=headers).json()["total"] == 1
@@ -0,0 +1,101 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+def test_get_task_if_none_match(client: TestClient, create_user):
+    headers = create_user(client, "etag_task@example.com").headers
+    task_id = client.post("/api/tasks/", headers=headers, json={"title": "T"}).json()[
+        "id"
+    ]
+
+    first = client.get(f"/api/tasks/{task_id}", headers=headers)
+    etag = first.headers["ETag"]
+
+    cached = client.get(
+        f"/api/tasks/{task_id}",
+        headers={**headers, "If-None-Match": etag},
+    )
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+    updated = client.put(f"/api/tasks/{task_id}", headers=headers, json={"title": "U"})
+    assert updated.headers["ETag"] != etag
+
+    fresh = client.get(
+        f"/api/tasks/{task_id}",
+        headers={**headers, "If-None-Match": etag},
+    )
+    assert fresh.status_code == 200
+    assert fresh.json()["title"] == "U"
+
+
+def test_list_if_none_match_skips_page_query(
+    client: TestClient, db_session: Session, create_user
+):
+    headers = create_user(client, "etag_list@example.com").headers
+    client.post("/api/tasks/", headers=headers, json={"title": "T"})
+
+    first = client.get("/api/tasks/?limit=10", headers=headers)
+    etag = first.headers["ETag"]
+    assert client.get("/api/tasks/?limit=5", headers=headers).headers["ETag"] != etag
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        cached = client.get(
+            "/api/tasks/?limit=10",
+            headers={**headers, "If-None-Match": etag},
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert cached.status_code == 304
+    assert not any("FROM tasks" in s for s in statements)
+
+    client.post("/api/tasks/", headers=headers, json={"title": "Nova"})
+    changed = client.get(
+        "/api/tasks/?limit=10",
+        headers={**headers, "If-None-Match": etag},
+    )
+    assert changed.status_code == 200
+    assert changed.json()["total"] == 2
+
+
+def test_if_match_on_update_and_delete(client: TestClient, create_user):
+    headers = create_user(client, "etag_match@example.com").headers
+    created = client.post("/api/tasks/", headers=headers, json={"title": "T"})
+    task_id = created.json()["id"]
+    etag = client.get(f"/api/tasks/{task_id}", headers=headers).headers["ETag"]
+
+    ok = client.put(
+        f"/api/tasks/{task_id}",
+        headers={**headers, "If-Match": etag},
+        json={"title": "U"},
+    )
+    assert ok.status_code == 200
+
+    stale = client.put(
+        f"/api/tasks/{task_id}",
+        headers={**headers, "If-Match": etag},
+        json={"title": "V"},
+    )
+    assert stale.status_code == 412
+
+    stale_delete = client.delete(
+        f"/api/tasks/{task_id}",
+        headers={**headers, "If-Match": etag},
+    )
+    assert stale_delete.status_code == 412
+
+    deleted = client.delete(
+        f"/api/tasks/{task_id}",
+        headers={**headers, "If-Match": ok.headers["ETag"]},
+    )
+    assert deleted.status_code == 204
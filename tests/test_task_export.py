@@ -0,0 +1,60 @@
+import csv
+import io
+import json
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+def seed_tasks(client: TestClient, headers: dict, count: int) -> list:
+    return [
+        client.post(
+            "/api/tasks/",
+            headers=headers,
+            json={"title": f"Tarefa {i}", "description": "linha, com vírgula"},
+        ).json()["id"]
+        for i in range(count)
+    ]
+
+
+def test_export_ndjson_streams_all_active_tasks(
+    client: TestClient, monkeypatch, create_user
+):
+    monkeypatch.setattr(settings, "TASK_EXPORT_BATCH_SIZE", 2)
+    headers = create_user(client, "export@example.com").headers
+    other = create_user(client, "export_other@example.com").headers
+    ids = seed_tasks(client, headers, 5)
+    seed_tasks(client, other, 1)
+    client.delete(f"/api/tasks/{ids[0]}", headers=headers)
+
+    resp = client.get("/api/tasks/export?format=ndjson", headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [row["id"] for row in rows] == ids[1:]
+    assert rows[0]["title"] == "Tarefa 1"
+    assert rows[0]["status"] == "pending"
+
+
+def test_export_csv(client: TestClient, create_user):
+    headers = create_user(client, "export_csv@example.com").headers
+    ids = seed_tasks(client, headers, 3)
+
+    resp = client.get("/api/tasks/export?format=csv", headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [int(row["id"]) for row in rows] == ids
+    assert rows[0]["description"] == "linha, com vírgula"
+
+
+def test_export_async_mode(async_client: TestClient, create_user):
+    headers = create_user(async_client, "export_async@example.com").headers
+    ids = seed_tasks(async_client, headers, 3)
+
+    resp = async_client.get("/api/tasks/export", headers=headers)
+    assert resp.status_code == 200
+    assert [json.loads(line)["id"] for line in resp.text.splitlines()] == ids
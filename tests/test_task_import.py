@@ -0,0 +1,141 @@
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.config import settings
+
+
+def test_import_ndjson_reports_invalid_lines(client: TestClient, create_user):
+    headers = create_user(client, "import@example.com").headers
+    body = "\n".join(
+        [
+            json.dumps({"title": "Primeira", "description": "a"}),
+            "{quebrado",
+            "",
+            json.dumps({"description": "sem título"}),
+            json.dumps(["lista"]),
+            json.dumps({"title": "Segunda"}),
+        ]
+    )
+
+    resp = client.post("/api/tasks/import", headers=headers, content=body)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["imported"] == 2
+    assert data["failed"] == 3
+    assert [error["line"] for error in data["errors"]] == [2, 4, 5]
+    assert data["errors"][0]["detail"] == "Invalid JSON"
+    assert data["errors"][1]["detail"].startswith("title:")
+
+    listing = client.get("/api/tasks/", headers=headers).json()
+    assert listing["total"] == 2
+    assert {task["title"] for task in listing["items"]} == {"Primeira", "Segunda"}
+
+
+def test_import_csv_with_multiline_field(client: TestClient, create_user):
+    headers = create_user(client, "import_csv@example.com").headers
+    body = 'title,description\nUma,"linha 1\nlinha 2"\nDuas,\nsó,uma,coluna a mais\n'
+
+    resp = client.post(
+        "/api/tasks/import?format=csv",
+        headers=headers,
+        content=body.encode(),
+    )
+    data = resp.json()
+    assert data["imported"] == 2
+    assert data["errors"] == [{"line": 5, "detail": "Expected 2 columns, got 3"}]
+
+    items = client.get("/api/tasks/", headers=headers).json()["items"]
+    descriptions = {task["title"]: task["description"] for task in items}
+    assert descriptions == {"Uma": "linha 1\nlinha 2", "Duas": None}
+
+
+def test_import_inserts_in_batches(
+    client: TestClient, db_session, monkeypatch, create_user
+):
+    monkeypatch.setattr(settings, "TASK_IMPORT_BATCH_SIZE", 50)
+    headers = create_user(client, "import_batch@example.com").headers
+    body = "".join(json.dumps({"title": f"T{i}"}) + "\n" for i in range(120))
+
+    inserts = []
+
+    def count_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO tasks"):
+            inserts.append(executemany)
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", count_inserts)
+    try:
+        resp = client.post("/api/tasks/import", headers=headers, content=body)
+    finally:
+        event.remove(bind, "before_cursor_execute", count_inserts)
+
+    assert resp.json()["imported"] == 120
+    assert len(inserts) == 3
+    assert client.get("/api/tasks/", headers=headers).json()["total"] == 120
+
+
+def test_export_then_import_roundtrip(client: TestClient, create_user):
+    source = create_user(client, "roundtrip_src@example.com").headers
+    target = create_user(client, "roundtrip_dst@example.com").headers
+    for i in range(3):
+        client.post("/api/tasks/", headers=source, json={"title": f"R{i}"})
+
+    exported = client.get("/api/tasks/export?format=csv", headers=source).content
+    resp = client.post("/api/tasks/import?format=csv", headers=target, content=exported)
+    assert resp.json() == {"imported": 3, "failed": 0, "errors": []}
+
+
+def test_import_csv_stray_quote_stays_on_its_line(client: TestClient, create_user):
+    headers = create_user(client, "import_quote@example.com").headers
+    body = (
+        'title,description\nPolegada,tela de 15" apenas\n"Fechada"x,depois\nÚltima,ok\n'
+    )
+
+    resp = client.post(
+        "/api/tasks/import?format=csv",
+        headers=headers,
+        content=body.encode(),
+    )
+    data = resp.json()
+    assert data["imported"] == 2
+    assert data["errors"] == [{"line": 3, "detail": "Malformed quoted field"}]
+
+    items = client.get("/api/tasks/", headers=headers).json()["items"]
+    assert {task["title"] for task in items} == {"Polegada", "Última"}
+
+
+def test_import_rejects_long_lines_and_large_bodies(
+    client: TestClient, monkeypatch, create_user
+):
+    monkeypatch.setattr(settings, "TASK_IMPORT_MAX_LINE_LENGTH", 100)
+    headers = create_user(client, "import_limits@example.com").headers
+    body = "\n".join(
+        [
+            json.dumps({"title": "Curta"}),
+            json.dumps({"title": "x" * 200}),
+            json.dumps({"title": "Depois"}),
+        ]
+    )
+
+    data = client.post("/api/tasks/import", headers=headers, content=body).json()
+    assert data["imported"] == 2
+    assert data["errors"] == [{"line": 2, "detail": "Line too long"}]
+
+    # CSV: um campo entre aspas nunca fechado não engole o resto do arquivo
+    body = 'title\n"aberta\n' + "continua\n" * 20 + "Última\n"
+    data = client.post(
+        "/api/tasks/import?format=csv", headers=headers, content=body
+    ).json()
+    assert data["errors"] == [{"line": 2, "detail": "Line too long"}]
+
+    monkeypatch.setattr(settings, "TASK_IMPORT_MAX_BYTES", 50)
+    resp = client.post("/api/tasks/import", headers=headers, content=body)
+    assert resp.status_code == 413
+
+    def chunked():
+        yield b'{"title": "a"}\n' * 10
+
+    resp = client.post("/api/tasks/import", headers=headers, content=chunked())
+    assert resp.status_code == 413
@@ -0,0 +1,99 @@
+from fastapi.testclient import TestClient
+
+from app.core.response_cache import VersionedResponseCache, task_list_cache
+
+
+def register_and_login(client: TestClient, email: str) -> dict:
+    client.post(
+        "/api/auth/register",
+        json={"email": email, "password": "password123"},
+    )
+    resp = client.post(
+        "/api/auth/login",
+        data={"username": email, "password": "password123"},
+    )
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+def page_selects(log) -> list:
+    return [s for s in log.statements if "FROM tasks" in s]
+
+
+def test_repeated_page_skips_page_queries(client: TestClient, count_queries):
+    headers = register_and_login(client, "list_cache_hit@example.com")
+    client.post("/api/tasks/", headers=headers, json={"title": "T1"})
+
+    first = client.get("/api/tasks/?limit=10", headers=headers)
+    with count_queries() as log:
+        second = client.get("/api/tasks/?limit=10", headers=headers)
+
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    assert page_selects(log) == []
+    assert task_list_cache.hits == 1
+
+
+def test_write_invalidates_owner_pages(client: TestClient):
+    headers = register_and_login(client, "list_cache_write@example.com")
+    task_id = client.post("/api/tasks/", headers=headers, json={"title": "T1"}).json()[
+        "id"
+    ]
+    assert client.get("/api/tasks/", headers=headers).json()["total"] == 1
+
+    client.put(f"/api/tasks/{task_id}", headers=headers, json={"status": "completed"})
+    items = client.get("/api/tasks/", headers=headers).json()["items"]
+    assert items[0]["status"] == "completed"
+
+    client.post("/api/tasks/", headers=headers, json={"title": "T2"})
+    assert client.get("/api/tasks/", headers=headers).json()["total"] == 2
+    assert task_list_cache.hits == 0
+
+
+def test_pages_are_cached_per_owner_and_params(client: TestClient):
+    alice = register_and_login(client, "list_cache_alice@example.com")
+    bob = register_and_login(client, "list_cache_bob@example.com")
+    client.post("/api/tasks/", headers=alice, json={"title": "Da Alice"})
+
+    assert client.get("/api/tasks/", headers=alice).json()["total"] == 1
+    assert client.get("/api/tasks/", headers=bob).json()["total"] == 0
+    assert client.get("/api/tasks/?offset=1", headers=alice).json()["items"] == []
+    assert len(client.get("/api/tasks/?q=Alice", headers=alice).json()["items"]) == 1
+    assert task_list_cache.hits == 0
+
+
+def test_cache_evicts_least_recently_used_by_bytes():
+    cache = VersionedResponseCache(max_bytes=10)
+    cache.set(1, 1, "a", b"aaaa")
+    cache.set(2, 1, "a", b"bbbb")
+    assert cache.get(1, 1, "a") == b"aaaa"
+
+    cache.set(3, 1, "a", b"cccc")
+    assert cache.get(2, 1, "a") is None
+    assert cache.get(1, 1, "a") == b"aaaa"
+    assert cache.stats().size == 8
+
+    # Maior que o limite inteiro: não entra
+    cache.set(4, 1, "a", b"x" * 11)
+    assert cache.get(4, 1, "a") is None
+
+
+def test_cache_never_serves_other_versions():
+    cache = VersionedResponseCache(max_bytes=100)
+    cache.set(1, 2, "a", b"v2")
+    assert cache.get(1, 1, "a") is None
+    assert cache.get(1, 3, "a") is None
+
+    # Uma resposta atrasada de versão anterior não sobrescreve a nova
+    cache.set(1, 1, "a", b"v1")
+    assert cache.get(1, 2, "a") == b"v2"
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (1, 2)
+    assert abs(stats.hit_ratio - 1 / 3) < 1e-9
+
+
+def test_list_cache_stats_require_admin(client: TestClient):
+    headers = register_and_login(client, "list_cache_user@example.com")
+    resp = client.get("/api/admin/list-cache-stats", headers=headers)
+    assert resp.status_code == 403
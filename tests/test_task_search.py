@@ -0,0 +1,85 @@
+from fastapi.testclient import TestClient
+
+
+def create_task(client: TestClient, headers: dict, title: str, description=None):
+    return client.post(
+        "/api/tasks/",
+        headers=headers,
+        json={"title": title, "description": description},
+    ).json()["id"]
+
+
+def test_search_ranks_title_matches_first(client: TestClient, create_user):
+    headers = create_user(client, "search@example.com").headers
+    in_description = create_task(client, headers, "Mercado", "comprar relatório")
+    in_title = create_task(client, headers, "Relatório mensal", "enviar ao time")
+    create_task(client, headers, "Academia", "treino")
+
+    resp = client.get("/api/tasks/?q=relatório", headers=headers)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [task["id"] for task in data["items"]] == [in_title, in_description]
+    assert data["total"] is None
+    assert data["next_cursor"] is None
+
+
+def test_search_is_scoped_by_owner_and_live_rows(client: TestClient, create_user):
+    headers = create_user(client, "search_owner@example.com").headers
+    other = create_user(client, "search_other@example.com").headers
+    kept = create_task(client, headers, "Pagar boleto")
+    deleted = create_task(client, headers, "Pagar aluguel")
+    create_task(client, other, "Pagar boleto do outro")
+    client.delete(f"/api/tasks/{deleted}", headers=headers)
+
+    data = client.get(
+        "/api/tasks/?q=pagar&include_total=true",
+        headers=headers,
+    ).json()
+    assert [task["id"] for task in data["items"]] == [kept]
+    assert data["total"] == 1
+
+
+def test_search_follows_updates_and_status_filter(client: TestClient, create_user):
+    headers = create_user(client, "search_update@example.com").headers
+    task_id = create_task(client, headers, "Rascunho")
+    client.put(
+        f"/api/tasks/{task_id}",
+        headers=headers,
+        json={"title": "Proposta final", "status": "completed"},
+    )
+
+    assert client.get("/api/tasks/?q=rascunho", headers=headers).json()["items"] == []
+    found = client.get(
+        "/api/tasks/?q=proposta&status_filter=completed",
+        headers=headers,
+    ).json()["items"]
+    assert [task["id"] for task in found] == [task_id]
+    pending = client.get(
+        "/api/tasks/?q=proposta&status_filter=pending",
+        headers=headers,
+    ).json()["items"]
+    assert pending == []
+
+
+def test_search_rejects_cursor_and_tolerates_syntax(client: TestClient, create_user):
+    headers = create_user(client, "search_syntax@example.com").headers
+    create_task(client, headers, 'Ler "Dom Casmurro"')
+
+    resp = client.get('/api/tasks/?q="casmurro AND (', headers=headers)
+    assert resp.status_code == 200
+
+    resp = client.get("/api/tasks/?q=ler&cursor=abc", headers=headers)
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "cursor and q cannot be combined"
+
+
+def test_blank_search_lists_normally(client: TestClient, create_user):
+    headers = create_user(client, "search_blank@example.com").headers
+    create_task(client, headers, "Primeira")
+    create_task(client, headers, "Segunda")
+
+    resp = client.get("/api/tasks/", headers=headers, params={"q": "   "})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert len(data["items"]) == 2
+    assert data["total"] == 2
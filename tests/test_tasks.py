@@ -99,3 +99,54 @@ def test_get_task_not_found_or_not_owner(client: TestClient):
 
     resp_missing = client.get("/api/tasks/9999", headers=headers_C)
     assert resp_missing.status_code == 404
+
+
+def test_list_tasks_cursor_pagination(client: TestClient):
+    token, _ = create_user_and_get_token(client, "cursor@example.com")
+    headers = get_auth_headers(token)
+
+    for i in range(5):
+        client.post("/api/tasks/", headers=headers, json={"title": f"Tarefa {i}"})
+
+    first = client.get("/api/tasks/?limit=2&include_total=false", headers=headers)
+    assert first.status_code == 200
+    first_data = first.json()
+    assert first_data["total"] is None
+    assert [t["title"] for t in first_data["items"]] == ["Tarefa 4", "Tarefa 3"]
+    assert first_data["next_cursor"]
+
+    titles = [t["title"] for t in first_data["items"]]
+    cursor = first_data["next_cursor"]
+    for _ in range(10):
+        resp = client.get(
+            "/api/tasks/",
+            headers=headers,
+            params={"limit": 2, "cursor": cursor},
+        )
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["total"] is None
+        titles.extend(t["title"] for t in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    assert cursor is None, "cursor pagination did not terminate"
+
+    assert titles == [f"Tarefa {i}" for i in range(4, -1, -1)]
+
+    with_total = client.get(
+        "/api/tasks/",
+        headers=headers,
+        params={"limit": 2, "cursor": first_data["next_cursor"], "include_total": True},
+    )
+    assert with_total.status_code == 200
+    assert with_total.json()["total"] == 5
+
+
+def test_list_tasks_invalid_cursor(client: TestClient):
+    token, _ = create_user_and_get_token(client, "badcursor@example.com")
+    headers = get_auth_headers(token)
+
+    resp = client.get("/api/tasks/?cursor=not-a-cursor", headers=headers)
+    assert resp.status_code == 400
+    assert resp.json() == {"detail": "Invalid cursor"}